@@ -0,0 +1,121 @@
+import argparse
+import contextlib
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+cur_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(cur_dir)
+
+from run import load_day_module, solve_tasks
+
+# the day module of this worker process, imported once by init_worker
+worker_module = None
+
+
+def collect_inputs(patterns):
+    # files, directories (all files in it) and glob patterns -> sorted list of input paths without duplicates
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = [os.path.join(pattern, name) for name in sorted(os.listdir(pattern))]
+        else:
+            matches = sorted(glob.glob(pattern, recursive=True))
+        if not matches:
+            print(f"Warning: No input files for {pattern}", file=sys.stderr)
+        paths += [os.path.abspath(path) for path in matches if os.path.isfile(path)]
+    return list(dict.fromkeys(paths))
+
+
+def init_worker(day, constants, warmup_path, parts):
+    global worker_module
+    from util.gen import set_constants
+
+    worker_module = load_day_module(day)
+    set_constants(worker_module, constants)
+    if warmup_path is not None:
+        # one untimed solve fills the caches of the interpreter (specialized bytecode, imports inside the
+        # functions, ...), so the first input of a worker is not slower than the others. The example input would
+        # be cheaper, but it does not fit the constants of every day (e.g. the map size of day 18).
+        try:
+            solve_input(warmup_path, parts)
+        except (Exception, SystemExit):  # noqa: BLE001, S110
+            # the same input is solved again by run_input, which reports the error
+            pass
+
+
+def solve_input(input_path, parts):
+    from util.general_util import load_input
+
+    module = worker_module
+    raw_input = load_input(input_path)
+    preprocess = getattr(module, "preprocess_input", None)
+    day_input, time_preprocess = preprocess(raw_input) if preprocess is not None else (raw_input, 0.0)
+    report = solve_tasks(module, day_input, parts)
+    report["preprocess"] = time_preprocess
+    return report
+
+
+def run_input(input_path, parts):
+    report = {"input": input_path, "status": "ok", "pid": os.getpid()}
+    start_time = time.perf_counter()
+    try:
+        report.update(solve_input(input_path, parts))
+    except (Exception, SystemExit) as e:  # noqa: BLE001
+        # one broken input must not stop the batch (load_input exits on a missing file)
+        report["status"] = f"error: {e!r}"
+    report["wall"] = time.perf_counter() - start_time
+    return report
+
+
+def run_batch(day, input_paths, parts=(1, 2), workers=None, constants=None, warmup=True):
+    """
+    Solves every input with the solution of day, yields the reports in the order they finish. Every worker
+    process imports the day module once (and with warmup solves the first input once untimed), so an input
+    only costs its preprocessing and the tasks.
+    """
+    warmup_path = input_paths[0] if warmup and input_paths else None
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=init_worker, initargs=(day, constants or {}, warmup_path, parts)
+    ) as executor:
+        futures = [executor.submit(run_input, path, parts) for path in input_paths]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def main(args):
+    input_paths = collect_inputs(args.inputs)
+    if not input_paths:
+        print(f"Error: No input files found ({', '.join(args.inputs)})")
+        sys.exit(1)
+    constants = json.loads(args.constants) if args.constants else {}
+    parts = (args.part,) if args.part else (1, 2)
+
+    start_time = time.perf_counter()
+    errors = 0
+    with open(args.output, "w") if args.output else contextlib.nullcontext(sys.stdout) as output:
+        for report in run_batch(args.day, input_paths, parts, args.workers, constants, bool(args.warmup)):
+            report["day"] = args.day
+            errors += report["status"] != "ok"
+            # one JSON object per line as soon as an input is solved, answers of any type fall back to str
+            output.write(json.dumps(report, default=str) + "\n")
+            output.flush()
+    total_time = time.perf_counter() - start_time
+    print(f"Day {args.day}: {len(input_paths)} inputs in {total_time:.3f} seconds, {errors} errors", file=sys.stderr)
+    if errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve many inputs of one day, results as JSON lines")
+    parser.add_argument("day", type=int, help="Day of the solution")
+    parser.add_argument("inputs", type=str, nargs="+", help="Input files, directories or glob patterns")
+    parser.add_argument("--part", type=int, help="Part to solve (1 or 2). Default: both", default=0)
+    parser.add_argument("--workers", type=int, help="Number of worker processes. Default: cpu count", default=None)
+    parser.add_argument("--constants", type=str, help="JSON of module constants, e.g. '{\"WIDTH\": 71}'", default="")
+    parser.add_argument("--warmup", type=int, help="Solve the first input once per worker first (untimed)", default=1)
+    parser.add_argument("--output", type=str, help="Write the JSON lines to this file. Default: stdout", default="")
+    main(parser.parse_args())
@@ -0,0 +1,282 @@
+import argparse
+import json
+import os
+import pickle
+import socket
+import socketserver
+import sys
+import time
+
+cur_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(cur_dir)
+
+from run import discover_days, get_input_path, load_day_module, parse_days, solve_tasks
+
+root_dir = os.path.dirname(cur_dir)
+SOCKET_PATH = os.path.join(root_dir, ".cache", "solver.sock")
+
+# Protocol: one JSON object per line in both directions, a connection can send any number of requests.
+# {"cmd": "run", "day": 1, "parts": [1, 2], "input": path or null (real input), "example": false, "repeat": 1}
+# {"cmd": "status"} and {"cmd": "stop"}
+# Every reply has a "status" ("ok" or "error: ..."), run replies have the answers and the times of every repeat.
+
+
+class SolverDaemon:
+    """
+    Keeps the day modules imported and their preprocessed inputs in memory, so a run only costs the solve time.
+    A module is imported again when its solution.py changed (the parsed inputs of that day are dropped), changes
+    to util are only picked up by restarting the daemon. The parsed inputs are kept pickled and every run gets
+    a fresh copy, tasks may modify their input.
+    """
+
+    def __init__(self):
+        self.modules = {}  # day -> (module, mtime of solution.py)
+        self.inputs = {}  # (day, input path) -> ((mtime, size), pickled input)
+        self.started = time.time()
+        self.requests = 0
+
+    def get_module(self, day):
+        script_path = os.path.join(cur_dir, f"day_{day:02d}", "solution.py")
+        mtime = os.stat(script_path).st_mtime_ns
+        cached = self.modules.get(day)
+        if cached is not None and cached[1] == mtime:
+            return cached[0], False
+        self.modules[day] = (load_day_module(day, script_path), mtime)
+        self.inputs = {key: value for key, value in self.inputs.items() if key[0] != day}
+        return self.modules[day][0], True
+
+    def get_input(self, day, module, input_path):
+        # (pickled input, preprocess seconds, cache hit), 0 seconds if the input was already parsed
+        from util.general_util import load_input
+
+        stat = os.stat(input_path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = self.inputs.get((day, input_path))
+        if cached is not None and cached[0] == version:
+            return cached[1], 0.0, True
+
+        raw_input = load_input(input_path)
+        preprocess = getattr(module, "preprocess_input", None)
+        day_input, time_preprocess = preprocess(raw_input) if preprocess is not None else (raw_input, 0.0)
+        pickled = pickle.dumps(day_input, protocol=5)
+        self.inputs[(day, input_path)] = (version, pickled)
+        return pickled, time_preprocess, False
+
+    def run(self, day, parts=(1, 2), input_path=None, example=False, repeat=1):
+        start_time = time.perf_counter()
+        if input_path is None:
+            input_path = get_input_path(day, example)
+        input_path = os.path.abspath(input_path)
+        module, reloaded = self.get_module(day)
+        pickled, time_preprocess, cached_input = self.get_input(day, module, input_path)
+
+        tasks = {f"task{part}": {"answer": None, "times": []} for part in parts}
+        for _ in range(repeat):
+            for task, result in solve_tasks(module, pickle.loads(pickled), parts).items():
+                tasks[task]["answer"] = result["answer"]
+                tasks[task]["times"].append(result["time"])
+        return {
+            "status": "ok",
+            "day": day,
+            "input": input_path,
+            "tasks": tasks,
+            "preprocess": time_preprocess,
+            "cached_input": cached_input,
+            "reloaded": reloaded,
+            "wall": time.perf_counter() - start_time,
+        }
+
+    def status(self):
+        days = {}
+        for day, input_path in self.inputs:
+            days.setdefault(day, []).append(input_path)
+        return {
+            "status": "ok",
+            "pid": os.getpid(),
+            "uptime": time.time() - self.started,
+            "requests": self.requests,
+            "modules": sorted(self.modules),
+            "inputs": days,
+        }
+
+    def handle(self, request):
+        self.requests += 1
+        cmd = request.get("cmd")
+        if cmd == "run":
+            return self.run(
+                int(request["day"]),
+                tuple(request.get("parts") or (1, 2)),
+                request.get("input"),
+                bool(request.get("example", False)),
+                max(int(request.get("repeat", 1)), 1),
+            )
+        if cmd == "status":
+            return self.status()
+        return {"status": f"error: unknown command {cmd!r}"}
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                if request.get("cmd") == "stop":
+                    self.server.stopping = True
+                    reply = {"status": "ok"}
+                else:
+                    reply = self.server.solver.handle(request)
+            except (Exception, SystemExit) as e:  # noqa: BLE001
+                # a broken day (or sys.exit of a missing input) must not take the daemon down
+                reply = {"status": f"error: {e!r}"}
+            # answers can be of any type (int, str, numpy ints), so fall back to str
+            self.wfile.write(json.dumps(reply, default=str).encode() + b"\n")
+            self.wfile.flush()
+
+
+def is_running(socket_path):
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(socket_path)
+        return True
+    except OSError:
+        return False
+
+
+def serve(socket_path=SOCKET_PATH, days=None, example=False):
+    if os.path.exists(socket_path):
+        if is_running(socket_path):
+            print(f"Error: A solver daemon is already running on {socket_path}")
+            sys.exit(1)
+        # left over from a daemon that did not shut down cleanly
+        os.remove(socket_path)
+    os.makedirs(os.path.dirname(socket_path), exist_ok=True)
+
+    daemon = SolverDaemon()
+    # preload the days and their inputs, so even the first request only pays the solve time
+    for day in discover_days(days):
+        try:
+            module, _ = daemon.get_module(day)
+            input_path = get_input_path(day, example)
+            if os.path.isfile(input_path):
+                daemon.get_input(day, module, input_path)
+        except (Exception, SystemExit) as e:  # noqa: BLE001
+            print(f"Warning: Could not preload day {day}: {e!r}")
+    print(f"Solver daemon (pid {os.getpid()}) listening on {socket_path}, {len(daemon.modules)} day(s) loaded")
+
+    # requests are handled one after another, so runs never compete for the CPU
+    with socketserver.UnixStreamServer(socket_path, RequestHandler) as server:
+        server.solver = daemon
+        server.stopping = False
+        try:
+            while not server.stopping:
+                server.handle_request()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.remove(socket_path)
+
+
+def send_requests(requests, socket_path=SOCKET_PATH):
+    # one request at a time over one connection, returns the replies in order
+    replies = []
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(socket_path)
+            with sock.makefile("rwb") as file:
+                for request in requests:
+                    file.write(json.dumps(request).encode() + b"\n")
+                    file.flush()
+                    replies.append(json.loads(file.readline()))
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(f"Error: No solver daemon running on {socket_path}, start one with 'src/daemon.py serve'")
+        sys.exit(1)
+    return replies
+
+
+def print_replies(replies):
+    from rich.console import Console
+    from rich.table import Table
+
+    table = Table(title="Solver daemon")
+    for column in ("Day", "Input", "Task", "Answer", "Median (s)", "Runs", "Preprocess (s)", "Status"):
+        table.add_column(column)
+    for reply in replies:
+        if reply["status"] != "ok":
+            table.add_row(str(reply.get("day", "-")), "-", "-", "-", "-", "-", "-", reply["status"])
+            continue
+        preprocess = "cached" if reply["cached_input"] else f"{reply['preprocess']:.6f}"
+        for task, result in reply["tasks"].items():
+            times = sorted(result["times"])
+            table.add_row(
+                str(reply["day"]),
+                os.path.relpath(reply["input"]),
+                task,
+                str(result["answer"]),
+                f"{times[len(times) // 2]:.6f}",
+                str(len(times)),
+                preprocess,
+                "ok (reloaded)" if reply["reloaded"] else "ok",
+            )
+    Console().print(table)
+
+
+def cmd_serve(args):
+    serve(args.socket, parse_days(args.days), args.example)
+
+
+def cmd_run(args):
+    days = sorted(parse_days(args.days) or discover_days())
+    parts = [args.part] if args.part else [1, 2]
+    inputs = args.input or [None]
+    requests = [
+        {"cmd": "run", "day": day, "parts": parts, "input": path, "example": bool(args.example), "repeat": args.repeat}
+        for day in days
+        for path in inputs
+    ]
+    replies = send_requests(requests, args.socket)
+    for request, reply in zip(requests, replies):
+        reply.setdefault("day", request["day"])
+    if args.json:
+        print(json.dumps(replies, indent=2))
+    else:
+        print_replies(replies)
+    if any(reply["status"] != "ok" for reply in replies):
+        sys.exit(1)
+
+
+def cmd_status(args):
+    print(json.dumps(send_requests([{"cmd": "status"}], args.socket)[0], indent=2))
+
+
+def cmd_stop(args):
+    send_requests([{"cmd": "stop"}], args.socket)
+    print("Solver daemon stopped")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Long-lived solver with the days imported and the inputs parsed")
+    parser.add_argument("--socket", type=str, help="Path of the Unix socket", default=SOCKET_PATH)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    parser_serve = subparsers.add_parser("serve", help="Start the daemon (in the foreground)")
+    parser_serve.add_argument("--days", type=str, help="Days to preload, e.g. '1-5,7'. Default: all", default="")
+    parser_serve.add_argument("--example", type=int, help="Preload the example inputs", default=0)
+    parser_serve.set_defaults(func=cmd_serve)
+
+    parser_run = subparsers.add_parser("run", help="Solve days with the running daemon")
+    parser_run.add_argument("--days", type=str, help="Days to run, e.g. '1-5,7'. Default: all", default="")
+    parser_run.add_argument("--part", type=int, help="Part to run (1 or 2). Default: both", default=0)
+    parser_run.add_argument("--input", type=str, nargs="*", help="Input file(s). Default: the day's input")
+    parser_run.add_argument("--example", type=int, help="Use the example input", default=0)
+    parser_run.add_argument("--repeat", type=int, help="Runs per task (fresh copy of the input each)", default=1)
+    parser_run.add_argument("--json", type=int, help="Print the replies as JSON", default=0)
+    parser_run.set_defaults(func=cmd_run)
+
+    parser_status = subparsers.add_parser("status", help="Show the loaded days and inputs")
+    parser_status.set_defaults(func=cmd_status)
+
+    parser_stop = subparsers.add_parser("stop", help="Stop the daemon")
+    parser_stop.set_defaults(func=cmd_stop)
+
+    args = parser.parse_args()
+    args.func(args)
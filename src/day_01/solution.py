@@ -1,34 +1,48 @@
-import math
+import argparse
 import os
 import re
 import sys
-from collections import Counter, OrderedDict, defaultdict, deque, namedtuple
-from datetime import datetime
-from functools import lru_cache, reduce
-from itertools import chain, combinations, permutations, product
+import time
+from collections import Counter
 
 import numpy as np
-from tqdm import tqdm
 
 cur_dir = os.path.dirname(os.path.abspath(__file__))
 par_dir = os.path.dirname(cur_dir)
 sys.path.append(par_dir)
 
-from util.general_util import average_time, load_input, timer, write_times_to_readme
+from util.bench import bench
+from util.general_util import load_input, map_input, preprocess_cached, timer
+from util.history import save_bench_results
+from util.memory import enable_memory_tracking, print_memory_report
+from util.parse import extract_records
+from util.profiling import enable_profiling
 
 last_dir = str(os.path.basename(os.path.normpath(cur_dir)))
 cur_day = re.findall(r"\d+", last_dir)
-cur_day = int(cur_day[0]) if len(cur_day) > 0 else datetime.today().day
+cur_day = int(cur_day[0]) if len(cur_day) > 0 else time.localtime().tm_mday
 images_path = os.path.join(par_dir, "images")
 
 
-def split_in_two_list(day_input):
-    # iter for all elements in the list and find the first and second number (with re) (convert to int)
-    first = [int(re.findall(r"\d+", i)[0]) for i in day_input]
-    second = [int(re.findall(r"\d+", i)[1]) for i in day_input]
+def split_in_two_list(data):
+    # all numbers in one pass (util.parse), every line is one record of (first, second)
+    first, second = extract_records(data, 2).T.tolist()
     return first, second
 
 
+@timer(return_time=True)
+def preprocess_input(input_data):
+    return split_in_two_list(input_data)
+
+
+@timer(return_time=True)
+def preprocess_stream(input_path):
+    # both tasks need all numbers (sorting), but they are parsed from the memory mapped file without a copy
+    # of the whole input as a string
+    with map_input(input_path) as data:
+        return split_in_two_list(data)
+
+
 @timer(return_time=True)
 def task1(day_input):
     # Day-specific code for Task 1
@@ -53,36 +67,48 @@ def task2(day_input):
     return result
 
 
-def main():
-    # Choose between the real input or the example input
-    day_input = load_input(os.path.join(cur_dir, "input.txt"))
-    # day_input = load_input(os.path.join(cur_dir, "example_input.txt"))
-
-    day_input = split_in_two_list(day_input.split("\n"))
+def main(args):
+    if args.profile:
+        enable_profiling(cur_day, sampling=args.profile == 2)
+    if args.memory:
+        enable_memory_tracking()
 
-    # Call the tasks and store their results (if needed)
+    # Choose between the real input or the example input
+    input_path = os.path.join(cur_dir, "example_input.txt" if args.example else "input.txt")
+
+    if args.stream:
+        day_input, t = preprocess_stream(input_path)
+    elif args.cache:
+        day_input, t = preprocess_cached(preprocess_input, load_input(input_path))
+    else:
+        day_input, t = preprocess_input(load_input(input_path))
     result_task1, time_task1 = task1(day_input)
     result_task2, time_task2 = task2(day_input)
 
     print(f"\nDay {cur_day}")
     print("------------------")
-    # Print the results
-    print("\nAnswers:")
-    print(f"Task 1: {result_task1}")
-    print(f"Task 2: {result_task2}")
+    print(f"Processing data: {t:.6f} seconds")
+    print(f"Task 1: {result_task1} ({time_task1:.6f} seconds)")
+    print(f"Task 2: {result_task2} ({time_task2:.6f} seconds)")
 
-    print("\nTimes:")
-    print(f"Task 1: {time_task1:.6f} seconds")
-    print(f"Task 2: {time_task2:.6f} seconds")
+    if args.memory:
+        print_memory_report()
 
-    # 1000 times and average the time
-    avg_time_task1 = average_time(1000, task1, day_input)
-    avg_time_task2 = average_time(1000, task2, day_input)
-    print("\nAverage times:")
-    print(f"Task 1: {avg_time_task1:.6f} seconds")
-    print(f"Task 2: {avg_time_task2:.6f} seconds")
-    write_times_to_readme(cur_day, avg_time_task1, avg_time_task2)
+    if args.timeit:
+        bench_task1 = bench(task1, day_input)
+        bench_task2 = bench(task2, day_input)
+        print("\nBenchmark:")
+        print(f"Task 1: {bench_task1}")
+        print(f"Task 2: {bench_task2}")
+        save_bench_results(cur_day, bench_task1, bench_task2, example=args.example)
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--example", type=int, help="Use the example input", default=1)
+    parser.add_argument("--timeit", type=int, help="Benchmark the tasks (see util/bench.py)", default=0)
+    parser.add_argument("--profile", type=int, help="Profile the tasks (1: cProfile, 2: sampling)", default=0)
+    parser.add_argument("--memory", type=int, help="Track the memory usage of the tasks", default=0)
+    parser.add_argument("--cache", type=int, help="Load the preprocessed input from the cache", default=1)
+    parser.add_argument("--stream", type=int, help="Read the input lazily (see preprocess_stream)", default=0)
+    main(parser.parse_args())
@@ -1,25 +1,22 @@
-import math
+import argparse
 import os
 import re
 import sys
-from copy import deepcopy
-from collections import Counter, OrderedDict, defaultdict, deque, namedtuple
-from datetime import datetime
-from functools import lru_cache, reduce
-from itertools import chain, combinations, permutations, product
-
-import numpy as np
-from tqdm import tqdm
+import time
 
 cur_dir = os.path.dirname(os.path.abspath(__file__))
 par_dir = os.path.dirname(cur_dir)
 sys.path.append(par_dir)
 
-from util.general_util import average_time, load_input, timer, write_times_to_readme
+from util.bench import bench
+from util.general_util import InputStream, load_input, preprocess_cached, timer
+from util.history import save_bench_results
+from util.memory import enable_memory_tracking, print_memory_report
+from util.profiling import enable_profiling
 
 last_dir = str(os.path.basename(os.path.normpath(cur_dir)))
 cur_day = re.findall(r"\d+", last_dir)
-cur_day = int(cur_day[0]) if len(cur_day) > 0 else datetime.today().day
+cur_day = int(cur_day[0]) if len(cur_day) > 0 else time.localtime().tm_mday
 images_path = os.path.join(par_dir, "images")
 
 
@@ -54,112 +51,113 @@ def kernel(is_increasing, row, pivot):
 
     return True
 
-@timer(return_time=True)
-def task1(day_input):
-    unsafe_rows = 0
-    increasing_rows = [day_input[i][0] < day_input[i][-1] for i in range(len(day_input))]
+def parse_report(line):
+    return [int(x) for x in line.split()]
 
-    for r, row in enumerate(day_input):
-        is_increasing = increasing_rows[r]
-        for i, num in enumerate(row):
-            is_safe = kernel(is_increasing, row, i)
-            if not is_safe:
-                unsafe_rows += 1
-                break
 
-    return len(day_input) - unsafe_rows
+@timer(return_time=True)
+def preprocess_input(input_data):
+    return [parse_report(d) for d in input_data.splitlines()]
+
 
 @timer(return_time=True)
-def task2(day_input):
-    safe_values = deepcopy(day_input)
-    # set all values to True
-    for i, row in enumerate(safe_values):
-        safe_values[i] = [True for _ in row]
+def preprocess_stream(input_path):
+    # the reports are independent, so the tasks can parse them while reading the file (constant memory)
+    return InputStream(input_path, parse_report)
+
+
+def is_report_safe(row):
+    is_increasing = row[0] < row[-1]
+    return all(kernel(is_increasing, row, i) for i in range(len(row)))
+
+
+def is_report_safe_with_removal(row):
+    safe_values = [True for _ in row]
 
     # first or last error could be the one problem we can remove
     # so, we have to check more values than just the first and last for increasing bool
-    increasing_rows = []
-    for r, row in enumerate(day_input):
-        checks = [row[i] < row[i + 1] for i in range(4)]
-        if checks.count(True) > checks.count(False):
-            increasing_rows.append(True)
-        else:
-            increasing_rows.append(False)
+    checks = [row[i] < row[i + 1] for i in range(4)]
+    is_increasing = checks.count(True) > checks.count(False)
 
-    for r, row in enumerate(day_input):
-        is_safe = True
-        is_increasing = increasing_rows[r]
-        unsafe_counter = 0
+    unsafe_counter = 0
+    for i, num in enumerate(row):
+        is_safe = kernel(is_increasing, row, i)
+        safe_values[i] = is_safe
 
-        for i, num in enumerate(row):
-            is_safe = kernel(is_increasing, row, i)
-            safe_values[r][i] = is_safe
+        unsafe_counter += 1 if not is_safe else 0
+        if unsafe_counter > 3:
+            break
 
-            unsafe_counter += 1 if not is_safe else 0
-            if unsafe_counter > 3:
-                break
+    # check again rows that have unsafe values (less than 4)
+    unsafe_values = sum([1 for v in safe_values if not v])
+    if unsafe_values == 0:
+        return True
 
-    safe_rows = 0
+    if 0 < unsafe_values < 4:
+        # remove all unsafe values iteratively and check then if the row is safe
+        unsafe_indices = [i for i, v in enumerate(safe_values) if not v]
 
-    # check again rows that have unsafe values (less than 4)
-    for r, row in enumerate(safe_values):
-        unsafe_values = sum([1 for v in row if not v])
-        if unsafe_values == 0:
-            safe_rows += 1
-            continue
+        for i in unsafe_indices:
+            row_copy = row.copy()
+            row_copy.pop(i)
+            if all(kernel(is_increasing, row_copy, j) for j in range(len(row_copy))):
+                return True
 
-        if 0 < unsafe_values < 4:
-            # remove all unsafe values iteratively and check then if the row is safe
-            unsafe_indices = [i for i, v in enumerate(row) if not v]
+    return False
 
-            for i in unsafe_indices:
-                row_copy = deepcopy(day_input[r])
-                row_copy.pop(i)
-                is_increasing = increasing_rows[r]
-                is_safe = True
 
-                for j, num in enumerate(row_copy):
-                    is_safe = kernel(is_increasing, row_copy, j)
-                    if not is_safe:
-                        is_safe = False
-                        break
+@timer(return_time=True)
+def task1(day_input):
+    return sum(1 for row in day_input if is_report_safe(row))
 
-                if is_safe:
-                    safe_rows += 1
-                    break
 
-    return safe_rows
+@timer(return_time=True)
+def task2(day_input):
+    return sum(1 for row in day_input if is_report_safe_with_removal(row))
 
 
-def main():
-    # Choose between the real input or the example input
-    day_input = load_input(os.path.join(cur_dir, "input.txt"))
-    # day_input = load_input(os.path.join(cur_dir, "example_input.txt"))
-    day_input = [[int(x) for x in d.split()] for d in day_input.splitlines()]
+def main(args):
+    if args.profile:
+        enable_profiling(cur_day, sampling=args.profile == 2)
+    if args.memory:
+        enable_memory_tracking()
 
-    # Call the tasks and store their results (if needed)
+    # Choose between the real input or the example input
+    input_path = os.path.join(cur_dir, "example_input.txt" if args.example else "input.txt")
+
+    if args.stream:
+        day_input, t = preprocess_stream(input_path)
+    elif args.cache:
+        day_input, t = preprocess_cached(preprocess_input, load_input(input_path))
+    else:
+        day_input, t = preprocess_input(load_input(input_path))
     result_task1, time_task1 = task1(day_input)
     result_task2, time_task2 = task2(day_input)
 
     print(f"\nDay {cur_day}")
     print("------------------")
-    # Print the results
-    print("\nAnswers:")
-    print(f"Task 1: {result_task1}")
-    print(f"Task 2: {result_task2}")
+    print(f"Processing data: {t:.6f} seconds")
+    print(f"Task 1: {result_task1} ({time_task1:.6f} seconds)")
+    print(f"Task 2: {result_task2} ({time_task2:.6f} seconds)")
 
-    print("\nTimes:")
-    print(f"Task 1: {time_task1:.6f} seconds")
-    print(f"Task 2: {time_task2:.6f} seconds")
+    if args.memory:
+        print_memory_report()
 
-    # 1000 times and average the time
-    avg_time_task1 = average_time(100, task1, day_input)
-    avg_time_task2 = average_time(100, task2, day_input)
-    print("\nAverage times:")
-    print(f"Task 1: {avg_time_task1:.6f} seconds")
-    print(f"Task 2: {avg_time_task2:.6f} seconds")
-    write_times_to_readme(cur_day, avg_time_task1, avg_time_task2)
+    if args.timeit:
+        bench_task1 = bench(task1, day_input)
+        bench_task2 = bench(task2, day_input)
+        print("\nBenchmark:")
+        print(f"Task 1: {bench_task1}")
+        print(f"Task 2: {bench_task2}")
+        save_bench_results(cur_day, bench_task1, bench_task2, example=args.example)
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--example", type=int, help="Use the example input", default=1)
+    parser.add_argument("--timeit", type=int, help="Benchmark the tasks (see util/bench.py)", default=0)
+    parser.add_argument("--profile", type=int, help="Profile the tasks (1: cProfile, 2: sampling)", default=0)
+    parser.add_argument("--memory", type=int, help="Track the memory usage of the tasks", default=0)
+    parser.add_argument("--cache", type=int, help="Load the preprocessed input from the cache", default=1)
+    parser.add_argument("--stream", type=int, help="Read the input lazily (see preprocess_stream)", default=0)
+    main(parser.parse_args())
@@ -1,153 +1,172 @@
-import math
+import argparse
 import os
 import re
 import sys
-from collections import Counter, OrderedDict, defaultdict, deque, namedtuple
-from datetime import datetime
-from copy import deepcopy
-from functools import lru_cache, reduce
-from itertools import chain, combinations, permutations, product
-
-import numpy as np
-from tqdm import tqdm
+import time
 
 cur_dir = os.path.dirname(os.path.abspath(__file__))
 par_dir = os.path.dirname(cur_dir)
 sys.path.append(par_dir)
 
-from util.general_util import average_time, load_input, timer, write_times_to_readme
+from util import counters
+from util.bench import bench
+from util.general_util import load_input, preprocess_cached, timer
+from util.grid import NORTH, Grid
+from util.history import save_bench_results
+from util.memory import enable_memory_tracking, print_memory_report
+from util.profiling import enable_profiling
 
 last_dir = str(os.path.basename(os.path.normpath(cur_dir)))
 cur_day = re.findall(r"\d+", last_dir)
-cur_day = int(cur_day[0]) if len(cur_day) > 0 else datetime.today().day
+cur_day = int(cur_day[0]) if len(cur_day) > 0 else time.localtime().tm_mday
 images_path = os.path.join(par_dir, "images")
 
-UP, RIGHT, DOWN, LEFT = (-1, 0), (0, 1), (1, 0), (0, -1)
-DIR_CYCLE = [UP, RIGHT, DOWN, LEFT]
+OBSTACLE = ord("#")
+# limits of the watchdog in run.py and perf.py check (see util/watchdog.py)
+TIME_LIMIT = 30
+MEMORY_LIMIT = 1024**3
+
 
+@timer(return_time=True)
+def preprocess_input(input_data):
+    grid = Grid.from_text(input_data)
+    return grid, grid.find("^"), NORTH
 
-def is_outside(np_grid, pos):
-    return not (0 <= pos[0] < np_grid.shape[0] and 0 <= pos[1] < np_grid.shape[1])
 
-def find_path(np_grid, obstacles, cur_pos, cur_direction):
+def find_path(grid, cur_pos, cur_direction):
+    step = grid.step_table()
+    cells = grid.cells
 
     while True:
-        x, y = cur_pos
-        dir_x, dir_y = DIR_CYCLE[cur_direction]
-        is_break_out = True
-        while not is_outside(np_grid, (x, y)):
-            if (x, y) in obstacles:
-                is_break_out = False
-                break
-            # yield the position and direction for tracking the guard's path
-            yield (x, y), cur_direction
-            x += dir_x
-            y += dir_y
-        if is_break_out:
+        # yield the position and direction for tracking the guard's path
+        yield cur_pos, cur_direction
+        next_pos = step[cur_direction][cur_pos]
+        if next_pos < 0:
             break
-
-        cur_pos = (x - dir_x, y - dir_y)
-        cur_direction = (cur_direction + 1) % 4
+        if cells[next_pos] == OBSTACLE:
+            cur_direction = (cur_direction + 1) % 4
+        else:
+            cur_pos = next_pos
 
 
 @timer(return_time=True)
 def task1(day_input):
-    np_grid, obstacles, cur_pos, cur_direction = day_input
-    return len({(pos) for pos, _ in find_path(np_grid, obstacles, cur_pos, cur_direction)})
-
+    grid, cur_pos, cur_direction = day_input
+    return len({(pos) for pos, _ in find_path(grid, cur_pos, cur_direction)})
 
 
 @timer(return_time=True)
 def task2(day_input):
-    np_grid, obstacles, cur_pos, cur_direction = day_input
-    start_pos = cur_pos
-    visited = set(find_path(np_grid, obstacles, cur_pos, cur_direction))
+    grid, start_pos, start_direction = day_input
+    # the new obstacle is placed directly in the cells, so work on a copy
+    grid = grid.copy()
+    cells = grid.cells
+    step = grid.step_table()
+    visited = set(find_path(grid, start_pos, start_direction))
 
     new_obstacle_positions = set()
+    counting = counters.is_enabled()
     # on the full path, check every position and direction for a potential new obstacle to create a loop
-    for pos, direction in tqdm(visited, desc="Checking for new obstacles"):
-        x, y = pos
-        dir_x, dir_y = DIR_CYCLE[direction]
-
-        new_obstacle_position = (x + dir_x, y + dir_y)
+    for pos, direction in visited:
+        new_obstacle_position = step[direction][pos]
 
         # check if the new obstacle is valid
         if (
-            is_outside(np_grid, new_obstacle_position)
-            or new_obstacle_position in obstacles
+            new_obstacle_position < 0
+            or cells[new_obstacle_position] == OBSTACLE
             or new_obstacle_position in new_obstacle_positions
             or new_obstacle_position == start_pos
         ):
             continue
 
         # Start from begin and check if the new obstacle will create a loop
-        temp_obstacles = obstacles | {new_obstacle_position}
+        old_value = cells[new_obstacle_position]
+        cells[new_obstacle_position] = OBSTACLE
         cur_pos = start_pos
-        cur_direction = 0
+        cur_direction = start_direction
         visited_states = set()
 
         while True:
-            state = (cur_pos, cur_direction)
+            # position and direction packed into one int, cheaper to hash than a tuple
+            state = cur_pos * 4 + cur_direction
             if state in visited_states:
                 # if golem was already at this position and direction, then there is a loop, add the new obstacle
                 new_obstacle_positions.add(new_obstacle_position)
                 break
             visited_states.add(state)
 
-            x, y = cur_pos
-            dir_x, dir_y = DIR_CYCLE[cur_direction]
-            next_pos = (x + dir_x, y + dir_y)
+            next_pos = step[cur_direction][cur_pos]
 
             # breaking the loop!
-            if is_outside(np_grid, next_pos):
+            if next_pos < 0:
                 break
 
             # check if direction needs to be changed because of obstacle
-            if next_pos in temp_obstacles:
+            if cells[next_pos] == OBSTACLE:
                 cur_direction = (cur_direction + 1) % 4
             else:
                 # just update the position if there is no obstacle
                 cur_pos = next_pos
 
-    return len(new_obstacle_positions)
+        cells[new_obstacle_position] = old_value
+        if counting:
+            # every simulated step added one state
+            counters.incr("candidates")
+            counters.incr("steps", len(visited_states))
+            counters.track_max("max_steps", len(visited_states))
 
+    if counting and counters.get("candidates"):
+        counters.gauge("steps_per_candidate", round(counters.get("steps") / counters.get("candidates"), 1))
+    return len(new_obstacle_positions)
 
-def main():
-    day_input = load_input(os.path.join(cur_dir, "input.txt"))
-    np_grid = np.array([list(row) for row in day_input.split("\n")])
-    obstacles = set()
-    cur_pos, cur_direction = (0, 0), DIR_CYCLE.index(UP)
-
-    for i, row in enumerate(np_grid):
-        for j, char in enumerate(row):
-            if char == "#":
-                obstacles.add((i, j))
-            elif char == "^":
-                cur_pos = (i, j)
 
-    day_input = (np_grid, obstacles, cur_pos, cur_direction)
+def main(args):
+    if args.profile:
+        enable_profiling(cur_day, sampling=args.profile == 2)
+    if args.memory:
+        enable_memory_tracking()
+    if args.counters:
+        counters.enable_counters()
+
+    # Choose between the real input or the example input
+    if args.example:
+        day_input = load_input(os.path.join(cur_dir, "example_input.txt"))
+    else:
+        day_input = load_input(os.path.join(cur_dir, "input.txt"))
+
+    if args.cache:
+        day_input, t = preprocess_cached(preprocess_input, day_input)
+    else:
+        day_input, t = preprocess_input(day_input)
     result_task1, time_task1 = task1(day_input)
     result_task2, time_task2 = task2(day_input)
 
     print(f"\nDay {cur_day}")
     print("------------------")
-    # Print the results
-    print("\nAnswers:")
-    print(f"Task 1: {result_task1}")
-    print(f"Task 2: {result_task2}")
+    print(f"Processing data: {t:.6f} seconds")
+    print(f"Task 1: {result_task1} ({time_task1:.6f} seconds)")
+    print(f"Task 2: {result_task2} ({time_task2:.6f} seconds)")
 
-    print("\nTimes:")
-    print(f"Task 1: {time_task1:.6f} seconds")
-    print(f"Task 2: {time_task2:.6f} seconds")
+    if args.memory:
+        print_memory_report()
+    if args.counters:
+        counters.print_counter_report()
 
-    # 100 times and average the time
-    avg_time_task1 = average_time(10, task1, day_input)
-    avg_time_task2 = average_time(10, task2, day_input)
-    print("\nAverage times:")
-    print(f"Task 1: {avg_time_task1:.6f} seconds")
-    print(f"Task 2: {avg_time_task2:.6f} seconds")
-    write_times_to_readme(cur_day, avg_time_task1, avg_time_task2)
+    if args.timeit:
+        bench_task1 = bench(task1, day_input)
+        bench_task2 = bench(task2, day_input)
+        print("\nBenchmark:")
+        print(f"Task 1: {bench_task1}")
+        print(f"Task 2: {bench_task2}")
+        save_bench_results(cur_day, bench_task1, bench_task2, example=args.example)
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--example", type=int, help="Use the example input", default=1)
+    parser.add_argument("--timeit", type=int, help="Benchmark the tasks (see util/bench.py)", default=0)
+    parser.add_argument("--profile", type=int, help="Profile the tasks (1: cProfile, 2: sampling)", default=0)
+    parser.add_argument("--memory", type=int, help="Track the memory usage of the tasks", default=0)
+    parser.add_argument("--counters", type=int, help="Count hot path operations (see util/counters.py)", default=0)
+    parser.add_argument("--cache", type=int, help="Load the preprocessed input from the cache", default=1)
+    main(parser.parse_args())
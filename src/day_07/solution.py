@@ -1,21 +1,41 @@
+import argparse
 import os
 import re
 import sys
-from datetime import datetime
-from tqdm import tqdm
+import time
 
 cur_dir = os.path.dirname(os.path.abspath(__file__))
 par_dir = os.path.dirname(cur_dir)
 sys.path.append(par_dir)
 
-from util.general_util import load_input, timer, average_time, write_times_to_readme
+from util import counters
+from util.bench import bench
+from util.general_util import InputStream, load_input, preprocess_cached, timer
+from util.history import save_bench_results
+from util.memory import enable_memory_tracking, print_memory_report
+from util.profiling import enable_profiling
 
 last_dir = str(os.path.basename(os.path.normpath(cur_dir)))
 cur_day = re.findall(r"\d+", last_dir)
-cur_day = int(cur_day[0]) if len(cur_day) > 0 else datetime.today().day
+cur_day = int(cur_day[0]) if len(cur_day) > 0 else time.localtime().tm_mday
 images_path = os.path.join(par_dir, "images")
 
 
+def parse_equation(line):
+    return (int(line.split(": ")[0]), *map(int, line.split(": ")[1].split()))
+
+
+@timer(return_time=True)
+def preprocess_input(input_data):
+    return [parse_equation(line) for line in input_data.splitlines()]
+
+
+@timer(return_time=True)
+def preprocess_stream(input_path):
+    # every equation is checked on its own, so the tasks can parse them while reading the file (constant memory)
+    return InputStream(input_path, parse_equation)
+
+
 def check_recursively(desired_output, current_result, rv):
     global OPERATORS
 
@@ -33,12 +53,34 @@ def check_recursively(desired_output, current_result, rv):
     return False
 
 
-@timer(return_time=True)
-def task1(day_input):
-    global OPERATORS
+def check_recursively_counted(desired_output, current_result, rv, calls):
+    # check_recursively counting its calls in calls[0], only used with util.counters enabled so the plain
+    # recursion has no extra work
+    calls[0] += 1
+    if len(rv) == 0:
+        return current_result == desired_output
+
+    v = rv[0]
+    for operator in OPERATORS:
+        new_result = operator(current_result, v)
+        if new_result > desired_output:
+            continue
+        if check_recursively_counted(desired_output, new_result, rv[1:], calls):
+            return True
+
+    return False
+
+
+def check_equations(day_input):
+    # sum of the test values of the solvable equations with the current OPERATORS
     total_calibration = 0
-    operators = [lambda x, y: x + y, lambda x, y: x * y]
-    OPERATORS = operators
+    if counters.is_enabled():
+        calls = [0]
+        for eq in day_input:
+            if check_recursively_counted(eq[0], eq[1], eq[2:], calls):
+                total_calibration += eq[0]
+        counters.incr("check_recursively.calls", calls[0])
+        return total_calibration
     for eq in day_input:
         # Start with the first number in the list and recursively check
         if check_recursively(eq[0], eq[1], eq[2:]):
@@ -46,6 +88,14 @@ def task1(day_input):
     return total_calibration
 
 
+@timer(return_time=True)
+def task1(day_input):
+    global OPERATORS
+    operators = [lambda x, y: x + y, lambda x, y: x * y]
+    OPERATORS = operators
+    return check_equations(day_input)
+
+
 @timer(return_time=True)
 def task2(day_input):
     global OPERATORS
@@ -55,45 +105,56 @@ def task2(day_input):
         lambda x, y: x + y,
     ]
     OPERATORS = operators
-    total_calibration = 0
-    for eq in day_input:
-        # Start with the first number in the list and recursively check
-        if check_recursively(eq[0], eq[1], eq[2:]):
-            total_calibration += eq[0]
-    return total_calibration
+    return check_equations(day_input)
 
 
-def main():
-    # Choose between the real input or the example input
-    day_input = load_input(os.path.join(cur_dir, "input.txt"))
-    # day_input = load_input(os.path.join(cur_dir, "example_input.txt"))
-    day_input = [
-        (int(line.split(": ")[0]), *map(int, line.split(": ")[1].split())) for line in tqdm(day_input.splitlines())
-    ]
+def main(args):
+    if args.profile:
+        enable_profiling(cur_day, sampling=args.profile == 2)
+    if args.memory:
+        enable_memory_tracking()
+    if args.counters:
+        counters.enable_counters()
 
-    # Call the tasks and store their results (if needed)
+    # Choose between the real input or the example input
+    input_path = os.path.join(cur_dir, "example_input.txt" if args.example else "input.txt")
+
+    if args.stream:
+        day_input, t = preprocess_stream(input_path)
+    elif args.cache:
+        day_input, t = preprocess_cached(preprocess_input, load_input(input_path))
+    else:
+        day_input, t = preprocess_input(load_input(input_path))
     result_task1, time_task1 = task1(day_input)
     result_task2, time_task2 = task2(day_input)
 
     print(f"\nDay {cur_day}")
     print("------------------")
-    # Print the results
-    print("\nAnswers:")
-    print(f"Task 1: {result_task1}")
-    print(f"Task 2: {result_task2}")
+    print(f"Processing data: {t:.6f} seconds")
+    print(f"Task 1: {result_task1} ({time_task1:.6f} seconds)")
+    print(f"Task 2: {result_task2} ({time_task2:.6f} seconds)")
 
-    print("\nTimes:")
-    print(f"Task 1: {time_task1:.6f} seconds")
-    print(f"Task 2: {time_task2:.6f} seconds")
+    if args.memory:
+        print_memory_report()
+    if args.counters:
+        counters.print_counter_report()
 
-    # 100 times and average the time
-    avg_time_task1 = average_time(10, task1, day_input)
-    avg_time_task2 = average_time(10, task2, day_input)
-    print("\nAverage times:")
-    print(f"Task 1: {avg_time_task1:.6f} seconds")
-    print(f"Task 2: {avg_time_task2:.6f} seconds")
-    write_times_to_readme(cur_day, avg_time_task1, avg_time_task2)
+    if args.timeit:
+        bench_task1 = bench(task1, day_input)
+        bench_task2 = bench(task2, day_input)
+        print("\nBenchmark:")
+        print(f"Task 1: {bench_task1}")
+        print(f"Task 2: {bench_task2}")
+        save_bench_results(cur_day, bench_task1, bench_task2, example=args.example)
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--example", type=int, help="Use the example input", default=1)
+    parser.add_argument("--timeit", type=int, help="Benchmark the tasks (see util/bench.py)", default=0)
+    parser.add_argument("--profile", type=int, help="Profile the tasks (1: cProfile, 2: sampling)", default=0)
+    parser.add_argument("--memory", type=int, help="Track the memory usage of the tasks", default=0)
+    parser.add_argument("--counters", type=int, help="Count hot path operations (see util/counters.py)", default=0)
+    parser.add_argument("--cache", type=int, help="Load the preprocessed input from the cache", default=1)
+    parser.add_argument("--stream", type=int, help="Read the input lazily (see preprocess_stream)", default=0)
+    main(parser.parse_args())
@@ -1,25 +1,23 @@
-import math
 import os
 import re
 import sys
-from collections import Counter, OrderedDict, defaultdict, deque, namedtuple
-from datetime import datetime
-from functools import lru_cache, reduce
-from itertools import chain, combinations, permutations, product
+import time
+from collections import defaultdict, deque
 import argparse
 
-import numpy as np
-from tqdm import tqdm
-
 cur_dir = os.path.dirname(os.path.abspath(__file__))
 par_dir = os.path.dirname(cur_dir)
 sys.path.append(par_dir)
 
-from util.general_util import average_time, load_input, timer, write_times_to_readme
+from util.bench import bench
+from util.general_util import load_input, preprocess_cached, timer
+from util.history import save_bench_results
+from util.memory import enable_memory_tracking, print_memory_report
+from util.profiling import enable_profiling
 
 last_dir = str(os.path.basename(os.path.normpath(cur_dir)))
 cur_day = re.findall(r"\d+", last_dir)
-cur_day = int(cur_day[0]) if len(cur_day) > 0 else datetime.today().day
+cur_day = int(cur_day[0]) if len(cur_day) > 0 else time.localtime().tm_mday
 images_path = os.path.join(par_dir, "images")
 
 
@@ -126,13 +124,21 @@ def task2(day_input):
 
 
 def main(args):
+    if args.profile:
+        enable_profiling(cur_day, sampling=args.profile == 2)
+    if args.memory:
+        enable_memory_tracking()
+
     # Choose between the real input or the example input
     if args.example:
         day_input = load_input(os.path.join(cur_dir, "example_input.txt"))
     else:
         day_input = load_input(os.path.join(cur_dir, "input.txt"))
 
-    day_input, t = preprocess_input(day_input)
+    if args.cache:
+        day_input, t = preprocess_cached(preprocess_input, day_input)
+    else:
+        day_input, t = preprocess_input(day_input)
     result_task1, time_task1 = task1(day_input)
     result_task2, time_task2 = task2(day_input)
 
@@ -142,17 +148,23 @@ def main(args):
     print(f"Task 1: {result_task1} ({time_task1:.6f} seconds)")
     print(f"Task 2: {result_task2} ({time_task2:.6f} seconds)")
 
+    if args.memory:
+        print_memory_report()
+
     if args.timeit:
-        avg_time_task1 = average_time(100, task1, day_input)
-        avg_time_task2 = average_time(100, task2, day_input)
-        print("\nAverage times:")
-        print(f"Task 1: {avg_time_task1:.6f} seconds")
-        print(f"Task 2: {avg_time_task2:.6f} seconds")
-        write_times_to_readme(cur_day, avg_time_task1, avg_time_task2)
+        bench_task1 = bench(task1, day_input)
+        bench_task2 = bench(task2, day_input)
+        print("\nBenchmark:")
+        print(f"Task 1: {bench_task1}")
+        print(f"Task 2: {bench_task2}")
+        save_bench_results(cur_day, bench_task1, bench_task2, example=args.example)
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--example", type=int, help="Use the example input", default=1)
-    parser.add_argument("--timeit", type=int, help="Average the execution time over 100 runs", default=0)
+    parser.add_argument("--timeit", type=int, help="Benchmark the tasks (see util/bench.py)", default=0)
+    parser.add_argument("--profile", type=int, help="Profile the tasks (1: cProfile, 2: sampling)", default=0)
+    parser.add_argument("--memory", type=int, help="Track the memory usage of the tasks", default=0)
+    parser.add_argument("--cache", type=int, help="Load the preprocessed input from the cache", default=1)
     main(parser.parse_args())
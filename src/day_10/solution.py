@@ -1,83 +1,82 @@
-import math
 import os
 import re
 import sys
-from collections import Counter, OrderedDict, defaultdict, deque, namedtuple
-from datetime import datetime
-from functools import lru_cache, reduce
-from itertools import chain, combinations, permutations, product
+import time
 import argparse
 
-import numpy as np
-from tqdm import tqdm
-
 cur_dir = os.path.dirname(os.path.abspath(__file__))
 par_dir = os.path.dirname(cur_dir)
 sys.path.append(par_dir)
 
-from util.general_util import average_time, load_input, timer, write_times_to_readme
+from util.bench import bench
+from util.general_util import load_input, preprocess_cached, timer
+from util.grid import Grid
+from util.history import save_bench_results
+from util.memory import enable_memory_tracking, print_memory_report
+from util.profiling import enable_profiling
+from util.search import bfs, count_paths
 
 last_dir = str(os.path.basename(os.path.normpath(cur_dir)))
 cur_day = re.findall(r"\d+", last_dir)
-cur_day = int(cur_day[0]) if len(cur_day) > 0 else datetime.today().day
+cur_day = int(cur_day[0]) if len(cur_day) > 0 else time.localtime().tm_mday
 images_path = os.path.join(par_dir, "images")
 
-DIRS = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+NINE = ord("9")
+
 
 @timer(return_time=True)
 def preprocess_input(input_data):
     # Preprocess the input data (if needed)
-    _map = {
-        (int(x), int(y)): int(val) if val != "." else -9
-        for y, row in enumerate(input_data.splitlines())
-        for x, val in enumerate(row)
-    }
-    start_coords = {c for c, val in _map.items() if val == 0}
+    # heights are stored as bytes, "." (impassable) is below "0" so it never is a valid next step
+    _map = Grid.from_text(input_data)
+    start_coords = _map.find_all("0")
     return (_map, start_coords)
 
-def find_trails(day_input):
-    _map = day_input[0]
-    start_coords = day_input[1]
-
-    # queue: (start, from)
-    queue = deque([(c, c) for c in start_coords])
-    trail_counter = defaultdict(list)
-
-    while queue:
-        start, _from = queue.pop()
 
-        if _map[_from] == 9:
-            trail_counter[start].append(_from)
-        else:
-            for dx, dy in DIRS:
-                new_coords = (_from[0] + dx, _from[1] + dy)
-                try:
-                    if _map[new_coords] - _map[_from] == 1:
-                        queue.append((start, new_coords))
-                except KeyError:
-                    pass
-
-    return trail_counter
+def uphill_neighbours(_map):
+    cells = _map.cells
+    # a trail only goes up by exactly one height per step
+    return lambda i: [n for n in _map.neighbours(i) if cells[n] - cells[i] == 1]
 
 
 @timer(return_time=True)
 def task1(day_input):
-    return sum([len(set(trail)) for trail in find_trails(day_input).values()])
+    # number of different 9s reachable from each trailhead
+    _map, start_coords = day_input
+    neighbours = uphill_neighbours(_map)
+    nines = _map.find_all("9")
+    score = 0
+    for start in start_coords:
+        dist, _, _ = bfs([start], neighbours, len(_map))
+        score += sum(1 for i in nines if dist[i] != -1)
+    return score
 
 
 @timer(return_time=True)
 def task2(day_input):
-    return sum([len(trail) for trail in find_trails(day_input).values()])
+    # number of different trails, the heights only go up so the trails form a DAG
+    _map, start_coords = day_input
+    cells = _map.cells
+    trails = count_paths(start_coords, uphill_neighbours(_map), lambda i: cells[i] == NINE)
+    return sum(trails.values())
 
 
 def main(args):
+    if args.profile:
+        enable_profiling(cur_day, sampling=args.profile == 2)
+    if args.memory:
+        enable_memory_tracking()
+
     # Choose between the real input or the example input
     if args.example:
         day_input = load_input(os.path.join(cur_dir, "example_input.txt"))
     else:
         day_input = load_input(os.path.join(cur_dir, "input.txt"))
 
-    day_input, t = preprocess_input(day_input)
+    if args.cache:
+        day_input, t = preprocess_cached(preprocess_input, day_input)
+    else:
+        day_input, t = preprocess_input(day_input)
     result_task1, time_task1 = task1(day_input)
     result_task2, time_task2 = task2(day_input)
 
@@ -87,17 +86,23 @@ def main(args):
     print(f"Task 1: {result_task1} ({time_task1:.6f} seconds)")
     print(f"Task 2: {result_task2} ({time_task2:.6f} seconds)")
 
+    if args.memory:
+        print_memory_report()
+
     if args.timeit:
-        avg_time_task1 = average_time(100, task1, day_input)
-        avg_time_task2 = average_time(100, task2, day_input)
-        print("\nAverage times:")
-        print(f"Task 1: {avg_time_task1:.6f} seconds")
-        print(f"Task 2: {avg_time_task2:.6f} seconds")
-        write_times_to_readme(cur_day, avg_time_task1, avg_time_task2)
+        bench_task1 = bench(task1, day_input)
+        bench_task2 = bench(task2, day_input)
+        print("\nBenchmark:")
+        print(f"Task 1: {bench_task1}")
+        print(f"Task 2: {bench_task2}")
+        save_bench_results(cur_day, bench_task1, bench_task2, example=args.example)
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--example", type=int, help="Use the example input", default=1)
-    parser.add_argument("--timeit", type=int, help="Average the execution time over 100 runs", default=0)
+    parser.add_argument("--timeit", type=int, help="Benchmark the tasks (see util/bench.py)", default=0)
+    parser.add_argument("--profile", type=int, help="Profile the tasks (1: cProfile, 2: sampling)", default=0)
+    parser.add_argument("--memory", type=int, help="Track the memory usage of the tasks", default=0)
+    parser.add_argument("--cache", type=int, help="Load the preprocessed input from the cache", default=1)
     main(parser.parse_args())
@@ -1,62 +1,62 @@
-import math
+import argparse
 import os
 import re
 import sys
-from collections import Counter, OrderedDict, defaultdict, deque, namedtuple
-from datetime import datetime
-from functools import lru_cache, reduce
-from itertools import chain, combinations, permutations, product
-import argparse
-
-import numpy as np
-from tqdm import tqdm
+import time
 
 cur_dir = os.path.dirname(os.path.abspath(__file__))
 par_dir = os.path.dirname(cur_dir)
 sys.path.append(par_dir)
 
-from util.general_util import average_time, load_input, timer, write_times_to_readme
+from util.bench import bench
+from util.general_util import InputStream, load_input, preprocess_cached, timer
+from util.history import save_bench_results
+from util.memory import enable_memory_tracking, print_memory_report
+from util.parse import extract_records
+from util.profiling import enable_profiling
 
 last_dir = str(os.path.basename(os.path.normpath(cur_dir)))
 cur_day = re.findall(r"\d+", last_dir)
-cur_day = int(cur_day[0]) if len(cur_day) > 0 else datetime.today().day
+cur_day = int(cur_day[0]) if len(cur_day) > 0 else time.localtime().tm_mday
 images_path = os.path.join(par_dir, "images")
 
 A_TOKENS = 3
 B_TOKENS = 1
 
 
+def parse_machines(data):
+    # "Button A: X+94, Y+34", "Button B: ..." and "Prize: X=8400, Y=5400" -> [[94, 34], [..], [8400, 5400]]
+    # every machine has 6 numbers, the labels have none
+    return extract_records(data, 6).reshape(-1, 3, 2).tolist()
+
+
 @timer(return_time=True)
 def preprocess_input(input_data):
     # Preprocess the input data (if needed)
-    input_data = [x.split(":")[1].strip() for x in input_data.splitlines() if x != ""]
-    input_data = [list(map(int, re.findall(r"\d+", x))) for x in input_data]
-    input_data = [input_data[i : i + 3] for i in range(0, len(input_data), 3)]
-    return input_data
-
-
-def is_near_int(x):
-    return abs(x - round(x)) < 1e-3
+    return parse_machines(input_data)
 
 
-def calc_inv(m):
-    return np.linalg.inv(np.array([[m[0][0], m[1][0]], [m[0][1], m[1][1]]]))
-
-
-def check_solvable(a, b):
-    return all([is_near_int(a), is_near_int(b), 0 <= a, 0 <= b])
+@timer(return_time=True)
+def preprocess_stream(input_path):
+    # the machines (separated by blank lines) are independent, so they are parsed while reading the file
+    return InputStream(input_path, separator="\n\n", parse_chunk=parse_machines)
 
 
-def calc_price(a, b):
-    return A_TOKENS * int(round(a)) + B_TOKENS * int(round(b))
+def solve_machine(m, add):
+    # Cramer's rule on the integers: a * A + b * B = prize has exactly one solution, it counts if it is whole
+    (ax, ay), (bx, by), (px, py) = m[0], m[1], (m[2][0] + add, m[2][1] + add)
+    det = ax * by - bx * ay
+    if det == 0:
+        return 0
+    a, rest_a = divmod(px * by - bx * py, det)
+    b, rest_b = divmod(ax * py - px * ay, det)
+    if rest_a or rest_b or a < 0 or b < 0:
+        return 0
+    return A_TOKENS * a + B_TOKENS * b
 
 
 def solve(day_input, add):
-    total = 0
-    for m in day_input:
-        a, b = calc_inv(m) @ (add + np.array(m[2]))
-        total += calc_price(a, b) if check_solvable(a, b) else 0
-    return total
+    return sum(solve_machine(m, add) for m in day_input)
 
 
 @timer(return_time=True)
@@ -70,13 +70,20 @@ def task2(day_input):
 
 
 def main(args):
+    if args.profile:
+        enable_profiling(cur_day, sampling=args.profile == 2)
+    if args.memory:
+        enable_memory_tracking()
+
     # Choose between the real input or the example input
-    if args.example:
-        day_input = load_input(os.path.join(cur_dir, "example_input.txt"))
-    else:
-        day_input = load_input(os.path.join(cur_dir, "input.txt"))
+    input_path = os.path.join(cur_dir, "example_input.txt" if args.example else "input.txt")
 
-    day_input, t = preprocess_input(day_input)
+    if args.stream:
+        day_input, t = preprocess_stream(input_path)
+    elif args.cache:
+        day_input, t = preprocess_cached(preprocess_input, load_input(input_path))
+    else:
+        day_input, t = preprocess_input(load_input(input_path))
     result_task1, time_task1 = task1(day_input)
     result_task2, time_task2 = task2(day_input)
 
@@ -86,17 +93,24 @@ def main(args):
     print(f"Task 1: {result_task1} ({time_task1:.6f} seconds)")
     print(f"Task 2: {result_task2} ({time_task2:.6f} seconds)")
 
+    if args.memory:
+        print_memory_report()
+
     if args.timeit:
-        avg_time_task1 = average_time(100, task1, day_input)
-        avg_time_task2 = average_time(100, task2, day_input)
-        print("\nAverage times:")
-        print(f"Task 1: {avg_time_task1:.6f} seconds")
-        print(f"Task 2: {avg_time_task2:.6f} seconds")
-        write_times_to_readme(cur_day, avg_time_task1, avg_time_task2)
+        bench_task1 = bench(task1, day_input)
+        bench_task2 = bench(task2, day_input)
+        print("\nBenchmark:")
+        print(f"Task 1: {bench_task1}")
+        print(f"Task 2: {bench_task2}")
+        save_bench_results(cur_day, bench_task1, bench_task2, example=args.example)
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--example", type=int, help="Use the example input", default=1)
-    parser.add_argument("--timeit", type=int, help="Average the execution time over 100 runs", default=0)
+    parser.add_argument("--timeit", type=int, help="Benchmark the tasks (see util/bench.py)", default=0)
+    parser.add_argument("--profile", type=int, help="Profile the tasks (1: cProfile, 2: sampling)", default=0)
+    parser.add_argument("--memory", type=int, help="Track the memory usage of the tasks", default=0)
+    parser.add_argument("--cache", type=int, help="Load the preprocessed input from the cache", default=1)
+    parser.add_argument("--stream", type=int, help="Read the input lazily (see preprocess_stream)", default=0)
     main(parser.parse_args())
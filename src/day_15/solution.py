@@ -1,73 +1,74 @@
 import os
 import re
 import sys
+import time
 from collections import deque
-from datetime import datetime
 import argparse
-from copy import deepcopy
-
-from rich import print
 
 cur_dir = os.path.dirname(os.path.abspath(__file__))
 par_dir = os.path.dirname(cur_dir)
 sys.path.append(par_dir)
 
-from util.general_util import average_time, load_input, timer, write_times_to_readme
+from util.bench import bench
+from util.general_util import load_input, preprocess_cached, timer
+from util.grid import EAST, NORTH, SOUTH, WEST, Grid
+from util.history import save_bench_results
+from util.memory import enable_memory_tracking, print_memory_report
+from util.profiling import enable_profiling
 
 last_dir = str(os.path.basename(os.path.normpath(cur_dir)))
 cur_day = re.findall(r"\d+", last_dir)
-cur_day = int(cur_day[0]) if len(cur_day) > 0 else datetime.today().day
+cur_day = int(cur_day[0]) if len(cur_day) > 0 else time.localtime().tm_mday
 images_path = os.path.join(par_dir, "images")
 
-DIRS = {"<": (-1, 0), ">": (1, 0), "^": (0, -1), "v": (0, 1)}
+EMPTY, WALL, BOX, BOX_LEFT, BOX_RIGHT, ROBOT = (ord(c) for c in ".#O[]@")
+DIRECTIONS = {"^": NORTH, ">": EAST, "v": SOUTH, "<": WEST}
+
 
 @timer(return_time=True)
 def preprocess_input(input_data):
     # Preprocess the input data (if needed)
     input_data = input_data.split("\n\n")
-    player_pos = None
-    _map = {}
-    for y, line in enumerate(input_data[0].split("\n")):
-        for x, char in enumerate(line):
-            if char == "@":
-                player_pos = (x, y)
-                _map[(x, y)] = "."
-                continue
-            _map[(x, y)] = char
+    _map = Grid.from_text(input_data[0])
+    player_pos = _map.find("@")
+    _map[player_pos] = "."
     return (_map, player_pos, list(input_data[1].replace("\n", "")))
 
 
 @timer(return_time=True)
 def task1(day_input):
     _map, player_pos, instructions = day_input
+    # boxes are moved in place, so work on a copy to keep the input reusable for task 2 and repeated runs
+    cells = _map.copy().cells
+    offsets = _map.offsets
 
     for instruction in instructions:
-        cur_dir = DIRS[instruction]
-        new_pos = (player_pos[0] + cur_dir[0], player_pos[1] + cur_dir[1])
+        cur_dir = offsets[DIRECTIONS[instruction]]
+        new_pos = player_pos + cur_dir
 
-        if _map[new_pos] == ".":
+        if cells[new_pos] == EMPTY:
             player_pos = new_pos
             continue
 
-        if _map[new_pos] == "#":
+        if cells[new_pos] == WALL:
             continue
 
-        if _map[new_pos] == "O":
+        if cells[new_pos] == BOX:
             is_movable = False
-            i = 1
+            new_box_pos = new_pos
             while True:
-                new_box_pos = (new_pos[0] + i * cur_dir[0], new_pos[1] + i * cur_dir[1])
-                if _map[new_box_pos] == "#":
+                new_box_pos += cur_dir
+                if cells[new_box_pos] == WALL:
                     break
-                if _map[new_box_pos] == ".":
+                if cells[new_box_pos] == EMPTY:
                     is_movable = True
                     break
-                i += 1
 
             if is_movable:
-                _map[new_pos], _map[new_box_pos], player_pos = ".", "O", new_pos
+                cells[new_pos], cells[new_box_pos], player_pos = EMPTY, BOX, new_pos
 
-    gps_score = sum([100 * y + x for (x, y), v in _map.items() if v == "O"])
+    width = _map.width
+    gps_score = sum(100 * (i // width) + i % width for i, v in enumerate(cells) if v == BOX)
     return gps_score
 
 
@@ -75,57 +76,54 @@ def task1(day_input):
 def task2(day_input):
     _map, player_pos, instructions = day_input
     # scale the x-axis of _map by 2 but keep y-axis the same
-    scaled_map = {}
-    for (x, y), v in _map.items():
-        scaled_map[(2 * x, y)] = "[" if v == "O" else v
-        scaled_map[(2 * x + 1, y)] = "]" if v == "O" else v
-    player_pos = (2 * player_pos[0], player_pos[1])
-    scaled_map[player_pos] = "@"
+    scaled = bytearray()
+    for v in _map.cells:
+        scaled += b"[]" if v == BOX else bytes((v, v))
+    scaled_map = Grid(2 * _map.width, _map.height, scaled)
+    cells = scaled_map.cells
+    offsets = scaled_map.offsets
+    player_pos = 2 * player_pos
+    cells[player_pos] = ROBOT
 
     for instruction in instructions:
-        cur_dir = DIRS[instruction]
-        new_pos = (player_pos[0] + cur_dir[0], player_pos[1] + cur_dir[1])
+        cur_dir = offsets[DIRECTIONS[instruction]]
+        new_pos = player_pos + cur_dir
 
-        if scaled_map[new_pos] == ".":
-            scaled_map[player_pos] = "."
-            scaled_map[new_pos] = "@"
+        if cells[new_pos] == EMPTY:
+            cells[player_pos] = EMPTY
+            cells[new_pos] = ROBOT
             player_pos = new_pos
             continue
 
-        if scaled_map[new_pos] == "#":
+        if cells[new_pos] == WALL:
             continue
 
-        if scaled_map[new_pos] in ("[", "]"):
+        if cells[new_pos] in (BOX_LEFT, BOX_RIGHT):
             # if cur instruction is right or left, nothing special happens
             if instruction in ("<", ">"):
                 last_pos = None
-                i = 1
+                new_box_pos = new_pos
                 while True:
-                    new_box_pos = (new_pos[0] + i * cur_dir[0], new_pos[1] + i * cur_dir[1])
-                    if scaled_map[new_box_pos] == "#":
+                    new_box_pos += cur_dir
+                    if cells[new_box_pos] == WALL:
                         break
-                    if scaled_map[new_box_pos] == ".":
+                    if cells[new_box_pos] == EMPTY:
                         last_pos = new_box_pos
                         break
-                    i += 1
 
                 if last_pos:
-                    scaled_map[player_pos] = "."
+                    cells[player_pos] = EMPTY
                     player_pos = new_pos
 
                     # move the boxes to left/right from the last_pos
-                    alter_symbols = ["[", "]"] if instruction == "<" else ["]", "["]
-                    back_dir = (-cur_dir[0], -cur_dir[1])
+                    alter_symbols = (BOX_LEFT, BOX_RIGHT) if instruction == "<" else (BOX_RIGHT, BOX_LEFT)
                     i = 0
-                    cur_symbol = alter_symbols[i]
-                    while True:
-                        new_box_pos = (last_pos[0] + i * back_dir[0], last_pos[1] + i * back_dir[1])
-                        scaled_map[new_box_pos] = cur_symbol
+                    new_box_pos = last_pos
+                    while new_box_pos != new_pos:
+                        cells[new_box_pos] = alter_symbols[i % 2]
+                        new_box_pos -= cur_dir
                         i += 1
-                        cur_symbol = alter_symbols[i % 2]
-                        if new_box_pos == new_pos:
-                            scaled_map[new_pos] = "@"
-                            break
+                    cells[new_pos] = ROBOT
             else:
                 # now things get a bit complicated
                 # check if all the boxes are movables to the up or down
@@ -135,13 +133,10 @@ def task2(day_input):
                 # 3 (a). if no # occurs, move all the boxes up or down
                 # 3 (b). if # occurs, no movement
 
+                # boxes are stored by the index of their left half
                 movable = True
                 visited = set()
-                queue = deque()
-                if scaled_map[new_pos] == "[":
-                    queue.extend([(new_pos, (new_pos[0] + 1, new_pos[1]))])
-                else:
-                    queue.extend([((new_pos[0] - 1, new_pos[1]), new_pos)])
+                queue = deque([new_pos if cells[new_pos] == BOX_LEFT else new_pos - 1])
                 while queue:
                     cur_box = queue.popleft()
 
@@ -149,58 +144,62 @@ def task2(day_input):
                         continue
                     visited.add(cur_box)
 
-                    new_pos1 = (cur_box[0][0] + cur_dir[0], cur_box[0][1] + cur_dir[1])
-                    new_pos2 = (cur_box[1][0] + cur_dir[0], cur_box[1][1] + cur_dir[1])
+                    new_pos1 = cur_box + cur_dir
+                    new_pos2 = new_pos1 + 1
 
-                    if scaled_map[new_pos1] == "#" or scaled_map[new_pos2] == "#":
+                    if cells[new_pos1] == WALL or cells[new_pos2] == WALL:
                         movable = False
                         break
 
-                    if scaled_map[new_pos1] == "." and scaled_map[new_pos2] == ".":
+                    if cells[new_pos1] == EMPTY and cells[new_pos2] == EMPTY:
                         continue
 
-                    if scaled_map[new_pos1] == "[" and scaled_map[new_pos2] == "]":
-                        queue.extend([(new_pos1, new_pos2)])
+                    if cells[new_pos1] == BOX_LEFT:
+                        queue.append(new_pos1)
                         continue
 
-                    if scaled_map[new_pos1] == "]":
-                        queue.extend([((new_pos1[0] - 1, new_pos1[1]), new_pos1)])
+                    if cells[new_pos1] == BOX_RIGHT:
+                        queue.append(new_pos1 - 1)
 
-                    if scaled_map[new_pos2] == "[":
-                        queue.extend([(new_pos2, (new_pos2[0] + 1, new_pos2[1]))])
+                    if cells[new_pos2] == BOX_LEFT:
+                        queue.append(new_pos2)
 
                 # go visited from the last to the first and move the box up or down
                 if movable:
                     # sort the visited by y-axis (asc if instruction is up, desc if instruction is down)
-                    visited = deque(sorted(visited, key=lambda x: x[0][1], reverse=instruction == "v"))
-
-                    while visited:
-                        cur_box = visited.popleft()
-                        new_pos1 = (cur_box[0][0] + cur_dir[0], cur_box[0][1] + cur_dir[1])
-                        new_pos2 = (cur_box[1][0] + cur_dir[0], cur_box[1][1] + cur_dir[1])
-
-                        scaled_map[cur_box[0]] = "."
-                        scaled_map[cur_box[1]] = "."
-                        scaled_map[new_pos1] = "["
-                        scaled_map[new_pos2] = "]"
-
-                    scaled_map[new_pos] = "@"
-                    scaled_map[player_pos] = "."
+                    for cur_box in sorted(visited, reverse=instruction == "v"):
+                        new_pos1 = cur_box + cur_dir
+                        cells[cur_box] = EMPTY
+                        cells[cur_box + 1] = EMPTY
+                        cells[new_pos1] = BOX_LEFT
+                        cells[new_pos1 + 1] = BOX_RIGHT
+
+                    cells[new_pos] = ROBOT
+                    cells[player_pos] = EMPTY
                     player_pos = new_pos
 
-    gps_score = sum([100 * y + x for (x, y), v in scaled_map.items() if v == "["])
+    width = scaled_map.width
+    gps_score = sum(100 * (i // width) + i % width for i, v in enumerate(cells) if v == BOX_LEFT)
     return gps_score
 
 
 def main(args):
+    if args.profile:
+        enable_profiling(cur_day, sampling=args.profile == 2)
+    if args.memory:
+        enable_memory_tracking()
+
     # Choose between the real input or the example input
     if args.example:
         day_input = load_input(os.path.join(cur_dir, "example_input.txt"))
     else:
         day_input = load_input(os.path.join(cur_dir, "input.txt"))
 
-    day_input, t = preprocess_input(day_input)
-    result_task1, time_task1 = task1(deepcopy(day_input))
+    if args.cache:
+        day_input, t = preprocess_cached(preprocess_input, day_input)
+    else:
+        day_input, t = preprocess_input(day_input)
+    result_task1, time_task1 = task1(day_input)
     result_task2, time_task2 = task2(day_input)
 
     print(f"\nDay {cur_day}")
@@ -209,17 +208,23 @@ def main(args):
     print(f"Task 1: {result_task1} ({time_task1:.6f} seconds)")
     print(f"Task 2: {result_task2} ({time_task2:.6f} seconds)")
 
+    if args.memory:
+        print_memory_report()
+
     if args.timeit:
-        avg_time_task1 = average_time(100, task1, day_input)
-        avg_time_task2 = average_time(100, task2, day_input)
-        print("\nAverage times:")
-        print(f"Task 1: {avg_time_task1:.6f} seconds")
-        print(f"Task 2: {avg_time_task2:.6f} seconds")
-        write_times_to_readme(cur_day, avg_time_task1, avg_time_task2)
+        bench_task1 = bench(task1, day_input)
+        bench_task2 = bench(task2, day_input)
+        print("\nBenchmark:")
+        print(f"Task 1: {bench_task1}")
+        print(f"Task 2: {bench_task2}")
+        save_bench_results(cur_day, bench_task1, bench_task2, example=args.example)
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--example", type=int, help="Use the example input", default=1)
-    parser.add_argument("--timeit", type=int, help="Average the execution time over 100 runs", default=0)
+    parser.add_argument("--timeit", type=int, help="Benchmark the tasks (see util/bench.py)", default=0)
+    parser.add_argument("--profile", type=int, help="Profile the tasks (1: cProfile, 2: sampling)", default=0)
+    parser.add_argument("--memory", type=int, help="Track the memory usage of the tasks", default=0)
+    parser.add_argument("--cache", type=int, help="Load the preprocessed input from the cache", default=1)
     main(parser.parse_args())
@@ -1,95 +1,85 @@
-from copy import deepcopy
 import math
 import os
 import re
 import sys
-from collections import Counter, OrderedDict, defaultdict, deque, namedtuple
-from datetime import datetime
-from functools import lru_cache, reduce
-from itertools import chain, combinations, permutations, product
+import time
 import argparse
 
-import numpy as np
-from tqdm import tqdm
-from rich import print
-
 cur_dir = os.path.dirname(os.path.abspath(__file__))
 par_dir = os.path.dirname(cur_dir)
 sys.path.append(par_dir)
 
-from util.general_util import average_time, load_input, timer, write_times_to_readme
+from util import counters
+from util.bench import bench
+from util.general_util import load_input, preprocess_cached, timer
+from util.grid import EAST, Grid
+from util.history import save_bench_results
+from util.memory import enable_memory_tracking, print_memory_report
+from util.profiling import enable_profiling
+from util.search import dag_nodes, dijkstra
 
 last_dir = str(os.path.basename(os.path.normpath(cur_dir)))
 cur_day = re.findall(r"\d+", last_dir)
-cur_day = int(cur_day[0]) if len(cur_day) > 0 else datetime.today().day
+cur_day = int(cur_day[0]) if len(cur_day) > 0 else time.localtime().tm_mday
 images_path = os.path.join(par_dir, "images")
 
-DIRS = {"N": (0, -1), "S": (0, 1), "E": (1, 0), "W": (-1, 0),}
 RC = 1000
+# limits of the watchdog in run.py and perf.py check (see util/watchdog.py)
+TIME_LIMIT = 30
+MEMORY_LIMIT = 1024**3
+WALL = ord("#")
 
 
 @timer(return_time=True)
 def preprocess_input(input_data):
     # Preprocess the input data (if needed)
-    _map = {(x, y): char for y, line in enumerate(input_data.splitlines()) for x, char in enumerate(line)}
-    start = next(k for k, v in _map.items() if v == "S")
-    end = next(k for k, v in _map.items() if v == "E")
-    return _map, start, end
+    _map = Grid.from_text(input_data)
+    return _map, _map.find("S"), _map.find("E")
 
 
 @timer(return_time=True)
 def tasks(day_input):
     maze_map, start, end = day_input
-    cur_lowest_cost = math.inf
-    queue = deque([(start, DIRS["E"], 0, [start])])
-    visited = defaultdict(lambda: cur_lowest_cost)
-    best_paths = []
-
-    while queue:
-        pos, direction, cost, path = queue.popleft()
-
-        if pos == end:
-            if cost < cur_lowest_cost:
-                cur_lowest_cost = cost
-                # if we find a new lowest cost, reset all current best paths because they are not the best anymore
-                best_paths = [path]
-            elif cost == cur_lowest_cost:
-                # found a path with the same cost as the current lowest cost, so add it to the best paths
-                best_paths.append(path)
-            continue
-
-        # for task 2, we have to revisit the same position with the same direction if costs are same => slow
-        # for task 1, we could skip this by changing < to <=, because we only want to find THE lowest cost
-        if (pos, direction) in visited and visited[(pos, direction)] < cost:
-            continue
-        visited[(pos, direction)] = cost
-
-        for new_dir in DIRS.values():
-            if direction == (-new_dir[0], -new_dir[1]):
-                continue
-
-            new_cost = cost + RC if direction != new_dir else cost + 1
-            if new_cost > cur_lowest_cost:
-                continue
-
-            if new_dir != direction:
-                queue.append((pos, new_dir, new_cost, path))
-            else:
-                new_pos = (pos[0] + new_dir[0], pos[1] + new_dir[1])
-                if new_pos in maze_map and maze_map[new_pos] != "#":
-                    queue.append((new_pos, direction, new_cost, path + [new_pos]))
-
-    return cur_lowest_cost, len(set([pos for path in best_paths for pos in path]))
+    cells = maze_map.cells
+    offsets = maze_map.offsets
+
+    # search states are position * 4 + direction: move forward (cost 1) or turn left/right (cost RC)
+    def neighbours(state):
+        pos, direction = divmod(state, 4)
+        # the maze is surrounded by walls, so there is no need for a bounds check
+        new_pos = pos + offsets[direction]
+        if cells[new_pos] != WALL:
+            yield new_pos * 4 + direction, 1
+        yield pos * 4 + (direction + 1) % 4, RC
+        yield pos * 4 + (direction + 3) % 4, RC
+
+    # task 2 needs all lowest cost paths, so keep every predecessor with the same cost (DAG of the best paths)
+    dist, pred, goals = dijkstra(
+        [start * 4 + EAST], neighbours, len(cells) * 4, is_goal=lambda state: state // 4 == end, all_paths=True
+    )
+    if not goals:
+        return math.inf, 0
+    return dist[goals[0]], len({state // 4 for state in dag_nodes(pred, goals)})
 
 
 def main(args):
+    if args.profile:
+        enable_profiling(cur_day, sampling=args.profile == 2)
+    if args.memory:
+        enable_memory_tracking()
+    if args.counters:
+        counters.enable_counters()
+
     # Choose between the real input or the example input
     if args.example:
         day_input = load_input(os.path.join(cur_dir, "example_input.txt"))
     else:
         day_input = load_input(os.path.join(cur_dir, "input.txt"))
 
-    day_input, t = preprocess_input(day_input)
+    if args.cache:
+        day_input, t = preprocess_cached(preprocess_input, day_input)
+    else:
+        day_input, t = preprocess_input(day_input)
     (result_task1, result_task2), time_tasks = tasks(day_input)
 
     print(f"\nDay {cur_day}")
@@ -98,16 +88,24 @@ def main(args):
     print(f"Task 1: {result_task1} ({time_tasks:.6f} seconds)")
     print(f"Task 2: {result_task2} ({time_tasks:.6f} seconds)")
 
+    if args.memory:
+        print_memory_report()
+    if args.counters:
+        counters.print_counter_report()
+
     if args.timeit:
-        avg_time_tasks = average_time(10, tasks, day_input)
-        print("\nAverage times:")
-        print(f"Task 1: {avg_time_tasks:.6f} seconds")
-        print(f"Task 2: {avg_time_tasks:.6f} seconds")
-        write_times_to_readme(cur_day, avg_time_tasks, avg_time_tasks)
+        bench_tasks = bench(tasks, day_input)
+        print("\nBenchmark:")
+        print(f"Task 1 + 2: {bench_tasks}")
+        save_bench_results(cur_day, bench_tasks, bench_tasks, example=args.example)
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--example", type=int, help="Use the example input", default=1)
-    parser.add_argument("--timeit", type=int, help="Average the execution time over 100 runs", default=0)
+    parser.add_argument("--timeit", type=int, help="Benchmark the tasks (see util/bench.py)", default=0)
+    parser.add_argument("--profile", type=int, help="Profile the tasks (1: cProfile, 2: sampling)", default=0)
+    parser.add_argument("--memory", type=int, help="Track the memory usage of the tasks", default=0)
+    parser.add_argument("--counters", type=int, help="Count hot path operations (see util/counters.py)", default=0)
+    parser.add_argument("--cache", type=int, help="Load the preprocessed input from the cache", default=1)
     main(parser.parse_args())
@@ -1,77 +1,70 @@
+import argparse
 import math
 import os
 import re
 import sys
-from collections import deque
-from datetime import datetime
-import argparse
-
-from rich import print
+import time
 
 cur_dir = os.path.dirname(os.path.abspath(__file__))
 par_dir = os.path.dirname(cur_dir)
 sys.path.append(par_dir)
 
-from util.general_util import average_time, load_input, timer, write_times_to_readme
+from util import counters
+from util.bench import bench
+from util.general_util import load_input, preprocess_cached, timer
+from util.grid import Grid
+from util.history import save_bench_results
+from util.memory import enable_memory_tracking, print_memory_report
+from util.parse import extract_records
+from util.profiling import enable_profiling
+from util.search import bfs, path_to
 
 last_dir = str(os.path.basename(os.path.normpath(cur_dir)))
 cur_day = re.findall(r"\d+", last_dir)
-cur_day = int(cur_day[0]) if len(cur_day) > 0 else datetime.today().day
+cur_day = int(cur_day[0]) if len(cur_day) > 0 else time.localtime().tm_mday
 images_path = os.path.join(par_dir, "images")
+# limits of the watchdog in run.py and perf.py check (see util/watchdog.py)
+TIME_LIMIT = 30
+MEMORY_LIMIT = 1024**3
 
 # WIDTH, HEIGHT = 7, 7
 WIDTH, HEIGHT = 71, 71
 T = 12
+WALL = ord("#")
 
 
 @timer(return_time=True)
 def preprocess_input(input_data):
-    return [list(map(int, re.findall(r"\d+", line))) for line in input_data.splitlines()]
+    return extract_records(input_data, 2).tolist()
 
 
 def get_mem_space():
-    _map = {(x, y): "." for x in range(WIDTH) for y in range(HEIGHT)}
-    _map[(0, 0)] = "S"
-    _map[(WIDTH - 1, HEIGHT - 1)] = "E"
+    _map = Grid(WIDTH, HEIGHT)
+    _map[0] = "S"
+    _map[len(_map) - 1] = "E"
     return _map
 
 
-def get_neighbours(x, y):
-    return [(x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)]
-
-
 def get_map_t(t, mem_space, _bytes):
     for idx, (x, y) in zip(range(t), _bytes):
-        mem_space[(x, y)] = "#"
+        mem_space[mem_space.index(x, y)] = "#"
     return mem_space
 
 
 def get_path(mem_space_t):
-    queue = deque([(0, 0, 0, [])])
-    visited = set()
-    shortest = math.inf
-    shortest_path = []
-
-    while queue:
-        x, y, t, path = queue.popleft()
+    counters.incr("get_path.calls")
+    cells = mem_space_t.cells
+    north, east, south, west = mem_space_t.step_table()
+    end = len(cells) - 1
 
-        if t >= shortest:
-            continue
+    def neighbours(i):
+        return [n for n in (east[i], west[i], south[i], north[i]) if n != -1 and cells[n] != WALL]
 
-        if (x, y) in visited:
-            continue
-        visited.add((x, y))
-
-        if mem_space_t[(x, y)] == "E":
-            shortest = t
-            shortest_path = path
-            continue
-
-        for nx, ny in get_neighbours(x, y):
-            if (nx, ny) in mem_space_t and mem_space_t[(nx, ny)] != "#":
-                queue.append((nx, ny, t + 1, path + [(nx, ny)]))
-
-    return shortest, set(shortest_path)
+    dist, pred, goal = bfs([0], neighbours, len(cells), is_goal=lambda i: i == end)
+    if goal is None:
+        return math.inf, set()
+    # the path without the start
+    return dist[end], set(path_to(pred, end)[1:])
 
 
 @timer(return_time=True)
@@ -94,7 +87,7 @@ def task2(day_input):
 
         # go through the bytes and pick the time_step with a byte coordinate that is in the path
         for new_t, (x, y) in enumerate(_bytes[t + 1 :], start=t + 1):
-            if (x, y) in path:
+            if y * WIDTH + x in path:
                 t = new_t
                 last_added = (x, y)
                 break
@@ -103,13 +96,23 @@ def task2(day_input):
 
 
 def main(args):
+    if args.profile:
+        enable_profiling(cur_day, sampling=args.profile == 2)
+    if args.memory:
+        enable_memory_tracking()
+    if args.counters:
+        counters.enable_counters()
+
     # Choose between the real input or the example input
     if args.example:
         day_input = load_input(os.path.join(cur_dir, "example_input.txt"))
     else:
         day_input = load_input(os.path.join(cur_dir, "input.txt"))
 
-    day_input, t = preprocess_input(day_input)
+    if args.cache:
+        day_input, t = preprocess_cached(preprocess_input, day_input)
+    else:
+        day_input, t = preprocess_input(day_input)
     result_task1, time_task1 = task1(day_input)
     result_task2, time_task2 = task2(day_input)
 
@@ -119,17 +122,26 @@ def main(args):
     print(f"Task 1: {result_task1} ({time_task1:.6f} seconds)")
     print(f"Task 2: {result_task2} ({time_task2:.6f} seconds)")
 
+    if args.memory:
+        print_memory_report()
+    if args.counters:
+        counters.print_counter_report()
+
     if args.timeit:
-        avg_time_task1 = average_time(100, task1, day_input)
-        avg_time_task2 = average_time(100, task2, day_input)
-        print("\nAverage times:")
-        print(f"Task 1: {avg_time_task1:.6f} seconds")
-        print(f"Task 2: {avg_time_task2:.6f} seconds")
-        write_times_to_readme(cur_day, avg_time_task1, avg_time_task2)
+        bench_task1 = bench(task1, day_input)
+        bench_task2 = bench(task2, day_input)
+        print("\nBenchmark:")
+        print(f"Task 1: {bench_task1}")
+        print(f"Task 2: {bench_task2}")
+        save_bench_results(cur_day, bench_task1, bench_task2, example=args.example)
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--example", type=int, help="Use the example input", default=1)
-    parser.add_argument("--timeit", type=int, help="Average the execution time over 100 runs", default=0)
+    parser.add_argument("--timeit", type=int, help="Benchmark the tasks (see util/bench.py)", default=0)
+    parser.add_argument("--profile", type=int, help="Profile the tasks (1: cProfile, 2: sampling)", default=0)
+    parser.add_argument("--memory", type=int, help="Track the memory usage of the tasks", default=0)
+    parser.add_argument("--counters", type=int, help="Count hot path operations (see util/counters.py)", default=0)
+    parser.add_argument("--cache", type=int, help="Load the preprocessed input from the cache", default=1)
     main(parser.parse_args())
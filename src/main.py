@@ -2,14 +2,16 @@ import os
 import re
 import shutil
 import sys
+import time
 from argparse import ArgumentParser
 from datetime import datetime
 
 import markdownify
-import requests
 from colorama import Fore, Style, init
 from dotenv import load_dotenv
 
+from util.fetch import POOL_SIZE, fetch_all
+
 # Initialize colorama
 init()
 
@@ -24,6 +26,8 @@ sys.path.append(os.path.dirname(cur_dir))
 
 load_dotenv()
 AOC_SESSION = os.getenv("AOC_SESSION")
+# another server with the same paths (e.g. a local stand-in for testing)
+AOC_URL = os.getenv("AOC_URL", "https://adventofcode.com")
 if not AOC_SESSION:
     print_color("AOC_SESSION not found in .env file.", Fore.RED)
     print_color(
@@ -50,23 +54,41 @@ def create_day_folder(day):
     return folder_path
 
 
-def fetch_input(folder_path, day, year):
-    url = f"https://adventofcode.com/{year}/day/{day}"
-    print_color(f"URL for day {day}, year {year}: {url}", Fore.CYAN)
-    url += "/input"
-    headers = {"Cookie": f"session={AOC_SESSION}"}
-    response = requests.get(url, headers=headers)
+def day_url(day, year, base_url=None):
+    return f"{base_url or AOC_URL}/{year}/day/{day}"
+
+
+def fetch_day(day, year, offline=False, base_url=None):
+    # input and description of one day, both at once
+    return fetch_days([day], year, offline=offline, base_url=base_url)[day]
+
+
+def fetch_days(days, year, offline=False, base_url=None, workers=None):
+    """
+    Fetches the inputs and descriptions of all days concurrently (see util/fetch.py, cached on disk and
+    revalidated with ETag / Last-Modified). Returns {day: {"input": result, "description": result}}.
+    """
+    urls = {day: day_url(day, year, base_url) for day in days}
+    fetch_urls = [url + suffix for url in urls.values() for suffix in ("/input", "")]
+    results = fetch_all(fetch_urls, AOC_SESSION, offline=offline, workers=workers or min(POOL_SIZE, 2 * len(urls)))
+    return {day: {"input": results[url + "/input"], "description": results[url]} for day, url in urls.items()}
+
+
+def fetch_input(folder_path, day, year, result=None):
+    if result is None:
+        result = fetch_day(day, year)["input"]
+    print_color(f"URL for day {day}, year {year}: {result['url'].removesuffix('/input')}", Fore.CYAN)
     input_file_path = os.path.join(folder_path, "input.txt")
     example_input_file_path = os.path.join(folder_path, "example_input.txt")
 
     ret_code = 0
-    if response.status_code == 200:
-        input_data = response.text.strip()
+    if result["status"] == 200:
+        input_data = result["text"].strip()
         example_input_data = "Placeholder for example input..."
-        print_color(f"Input for Day {day} fetched successfully.", Fore.GREEN)
+        print_color(f"Input for Day {day} fetched successfully ({result['source']}).", Fore.GREEN)
     else:
         print_color(
-            f"Failed to fetch input for Day {day}. Status Code: {response.status_code}",
+            f"Failed to fetch input for Day {day}. Status Code: {result['status']} ({result['source']})",
             Fore.RED,
         )
         print_color("Creating empty input file and example input file...", Fore.YELLOW)
@@ -103,25 +125,40 @@ def try_get_example_input(md_path, example_input_file_path):
             print_color("No code blocks found in markdown file. Skipping...", Fore.YELLOW)
 
 
-def get_exercise_description(current_day, year):
-    url = f"https://adventofcode.com/{year}/day/{current_day}"
-    headers = {"Cookie": f"session={AOC_SESSION}"}
-    response = requests.get(url, headers=headers)
+def get_exercise_description(current_day, year, result=None):
+    if result is None:
+        result = fetch_day(current_day, year)["description"]
 
-    if response.status_code == 200:
-        description = response.text
+    if result["status"] == 200:
+        description = result["text"]
         description = description.split('<article class="day-desc">')[1]
         description = description.split("</article>")[0]
         description = description.replace("<p>", "").replace("</p>", "\n")
         return description
     else:
         print_color(
-            f"Failed to fetch description for Day {current_day}. Status Code: {response.status_code}",
+            f"Failed to fetch description for Day {current_day}. Status Code: {result['status']} ({result['source']})",
             Fore.RED,
         )
 
 
-def create_python_script(day, template_path):
+def puzzle_title(result):
+    # "Day 1: Historian Hysteria" from the <h2> of the description page, None if it is not there
+    if result is None or result["status"] != 200:
+        return None
+    match = re.search(r"<h2>--- (.*?) ---</h2>", result["text"])
+    return match.group(1) if match else None
+
+
+def render_template(template_content, day, year, title=None, base_url=None):
+    # solution class of the day (Day07) and a docstring with the puzzle title and link
+    content = re.sub(r"\bDay(?=\(Solution\)|\(__file__\))", f"Day{day:02d}", template_content)
+    title = title or f"Day {day}"
+    docstring = f'"""\n{title}\n{day_url(day, year, base_url)}\n"""\n\n'
+    return docstring + content
+
+
+def create_python_script(day, template_path, year=None, title=None, base_url=None):
     script_path = f"day_{day:02d}/solution.py"
     script_path = os.path.join(cur_dir, script_path)
 
@@ -129,7 +166,7 @@ def create_python_script(day, template_path):
         template_content = template_file.read()
 
     with open(script_path, "w") as script_file:
-        script_file.write(template_content)
+        script_file.write(render_template(template_content, day, year or datetime.now().year, title, base_url))
 
     print_color(f"Python script for Day {day} created.", Fore.GREEN)
 
@@ -145,15 +182,74 @@ def create_markdown(day, description):
     return markdown_path
 
 
-def main(current_day, year):
+def update_day(day, year, results):
+    # existing day: only the input and the description are replaced, the solution and the example stay
+    folder_path = os.path.join(cur_dir, f"day_{day:02d}")
+    if results["input"]["status"] != 200:
+        print_color(f"Failed to fetch input for Day {day} ({results['input']['source']}), kept the old one.", Fore.RED)
+        return -1
+    with open(os.path.join(folder_path, "input.txt"), "w", encoding="utf-8") as input_file:
+        input_file.write(results["input"]["text"].strip())
+    print_color(f"Input for Day {day} updated ({results['input']['source']}).", Fore.GREEN)
+    exercise_description = get_exercise_description(day, year, results["description"])
+    if exercise_description is not None:
+        create_markdown(day, exercise_description)
+    return 0
+
+
+def create_day(day, year, results, base_url=None):
+    # new day: folder, input, solution from the template, description and example input
+    folder_path = os.path.join(cur_dir, f"day_{day:02d}")
+    os.mkdir(folder_path)
+    ret_code, _, example_input_file_path = fetch_input(folder_path, day, year, results["input"])
+    title = puzzle_title(results["description"])
+    create_python_script(day, os.path.join(cur_dir, "template.py"), year, title, base_url)
+    if ret_code != 0:
+        return ret_code
+    exercise_description = get_exercise_description(day, year, results["description"])
+    if exercise_description is None:
+        return -1
+    md_path = create_markdown(day, exercise_description)
+    try_get_example_input(md_path, example_input_file_path)
+    return 0
+
+
+def main_bulk(days, year, offline=False, base_url=None, workers=None):
+    invalid = [day for day in days if not 1 <= day <= 25]
+    if invalid:
+        print_color(f"Day(s) {', '.join(map(str, invalid))} not valid for AOC {year}!", Fore.RED)
+        sys.exit(1)
+
+    days = sorted(days)
+    print_color(f"Fetching {len(days)} days{' from the cache' if offline else ''}...", Fore.CYAN)
+    start_time = time.perf_counter()
+    results = fetch_days(days, year, offline=offline, base_url=base_url, workers=workers)
+    print_color(f"Fetched in {time.perf_counter() - start_time:.2f} seconds.", Fore.CYAN)
+
+    failed = []
+    for day in days:
+        if os.path.exists(os.path.join(cur_dir, f"day_{day:02d}")):
+            ret_code = update_day(day, year, results[day])
+        else:
+            print_color(f"Creating files for Day {day}...", Fore.CYAN)
+            ret_code = create_day(day, year, results[day], base_url)
+        if ret_code != 0:
+            failed.append(day)
+    if failed:
+        print_color(f"Failed to fetch day(s) {', '.join(map(str, failed))}.", Fore.RED)
+        sys.exit(1)
+
+
+def main(current_day, year, offline=False, base_url=None):
     if 1 <= current_day <= 25:
         print_color(f"Creating files for Day {current_day}...", Fore.CYAN)
         folder_path = create_day_folder(current_day)
-        ret_code, _, example_input_file_path = fetch_input(folder_path, current_day, year)
+        results = fetch_day(current_day, year, offline=offline, base_url=base_url)
+        ret_code, _, example_input_file_path = fetch_input(folder_path, current_day, year, results["input"])
 
         template_path = "template.py"
         template_path = os.path.join(cur_dir, template_path)
-        create_python_script(current_day, template_path)
+        create_python_script(current_day, template_path, year, puzzle_title(results["description"]), base_url)
 
         if ret_code != 0:
             print_color(
@@ -162,7 +258,7 @@ def main(current_day, year):
             )
             sys.exit(ret_code)
 
-        exercise_description = get_exercise_description(current_day, year)
+        exercise_description = get_exercise_description(current_day, year, results["description"])
         md_path = create_markdown(current_day, exercise_description)
         try_get_example_input(md_path, example_input_file_path)
     else:
@@ -186,5 +282,21 @@ if __name__ == "__main__":
         help="year to create. If not specified, the current year will be used",
         default=datetime.now().year,
     )
+    parser.add_argument(
+        "--days",
+        dest="days",
+        help="days to fetch concurrently, e.g. '1-25'. Existing days only get a new input and description",
+        default="",
+    )
+    parser.add_argument("--offline", type=int, help="only use the cached responses (.cache/http)", default=0)
+    parser.add_argument(
+        "--url", type=str, help="server to fetch from. Default: AOC_URL or adventofcode.com", default=""
+    )
+    parser.add_argument("--workers", type=int, help=f"concurrent requests. Default: {POOL_SIZE}", default=None)
     args = parser.parse_args()
-    main(int(args.day), int(args.year))
+    if args.days:
+        from run import parse_days
+
+        main_bulk(parse_days(args.days), int(args.year), bool(args.offline), args.url or None, args.workers)
+    else:
+        main(int(args.day), int(args.year), bool(args.offline), args.url or None)
@@ -0,0 +1,705 @@
+import argparse
+import os
+import sys
+
+cur_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(cur_dir)
+
+from run import discover_days, load_day_module, parse_days
+from util.dashboard import DASHBOARD_PATH
+from util.history import (
+    HISTORY_PATH,
+    ISOLATED_HISTORY_PATH,
+    REGRESSION_ALPHA,
+    REGRESSION_THRESHOLD,
+    compare,
+    print_comparison,
+    update_readme,
+)
+
+
+def cmd_compare(args):
+    history_path = ISOLATED_HISTORY_PATH if args.isolated else HISTORY_PATH
+    rows = compare(
+        args.baseline,
+        args.candidate,
+        machine=args.machine,
+        threshold=args.threshold,
+        alpha=args.alpha,
+        history_path=history_path,
+    )
+    if not rows:
+        print(f"No comparable benchmark results found for baseline {args.baseline}.")
+        sys.exit(1)
+    print_comparison(rows)
+    if any(r["status"] == "regression" for r in rows):
+        sys.exit(2)
+
+
+def cmd_readme(args):
+    update_readme(machine=args.machine)
+
+
+def cmd_dashboard(args):
+    import json
+
+    from util.dashboard import render_dashboard
+
+    scaling = None
+    if args.scaling:
+        with open(args.scaling) as file:
+            scaling = json.load(file)
+    count = render_dashboard(args.output, scaling=scaling, machine=args.machine)
+    print(f"Dashboard with {count} day/part series written to {args.output}")
+
+
+def cmd_startup(args):
+    from rich.console import Console
+    from rich.table import Table
+
+    from util.startup import measure_import_time
+
+    table = Table(title=f"Import time of the solutions (budget {args.budget_ms:.0f} ms)")
+    for column in ("Day", "Import (ms)", "Slowest imports", "Status"):
+        table.add_column(column)
+
+    over_budget = []
+    for day, script_path in discover_days(parse_days(args.days)).items():
+        seconds, modules = measure_import_time(script_path, repeat=args.repeat)
+        slowest = ", ".join(f"{name} ({us / 1000:.1f})" for name, us in modules[:3])
+        ok = seconds * 1000 <= args.budget_ms
+        if not ok:
+            over_budget.append(day)
+        table.add_row(str(day), f"{seconds * 1000:.1f}", slowest, "ok" if ok else "[red]over budget[/red]")
+    Console().print(table)
+
+    if over_budget:
+        print(f"Import time over budget for day(s): {', '.join(map(str, over_budget))}")
+        sys.exit(1)
+
+
+def dict_flood_fill(text):
+    # the old way: dict (x, y) -> char and tuple arithmetic
+    _map = {(x, y): char for y, line in enumerate(text.splitlines()) for x, char in enumerate(line)}
+    seen = {(0, 0)}
+    queue = [(0, 0)]
+    for x, y in queue:
+        for dx, dy in ((0, -1), (1, 0), (0, 1), (-1, 0)):
+            n = (x + dx, y + dy)
+            if n in _map and _map[n] != "#" and n not in seen:
+                seen.add(n)
+                queue.append(n)
+    return len(seen)
+
+
+def grid_flood_fill(text):
+    from util.grid import Grid
+
+    grid = Grid.from_text(text)
+    cells, wall = grid.cells, ord("#")
+    seen = bytearray(len(cells))
+    seen[0] = 1
+    queue = [0]
+    for i in queue:
+        for n in grid.neighbours(i):
+            if cells[n] != wall and not seen[n]:
+                seen[n] = 1
+                queue.append(n)
+    return len(queue)
+
+
+def cmd_grid(args):
+    import random
+
+    from util.bench import bench
+    from util.memory import format_bytes
+
+    rnd = random.Random(0)
+    text = "\n".join("".join("#" if rnd.random() < 0.2 else "." for _ in range(args.size)) for _ in range(args.size))
+    text = "." + text[1:]
+    # same map, same answer
+    assert dict_flood_fill(text) == grid_flood_fill(text)
+
+    print(f"Parse + flood fill of a random {args.size}x{args.size} map:")
+    for name, func in (("dict", dict_flood_fill), ("Grid", grid_flood_fill)):
+        result = bench(func, text, measure_memory=True)
+        print(f"{name:>4}: median {result.median * 1000:.3f} ms, peak {format_bytes(result.memory['peak_bytes'])}")
+
+
+def regex_ints(text):
+    # the old way: re.findall on every line
+    import re
+
+    return [int(x) for line in text.splitlines() for x in re.findall(r"-?\d+", line)]
+
+
+def numpy_ints(text):
+    from util.parse import extract_ints
+
+    return extract_ints(text, signed=True).tolist()
+
+
+def cmd_parse(args):
+    from util.bench import bench
+    from util.gen import generate
+    from util.memory import format_bytes
+
+    text, _ = generate(args.day, args.scale)
+    # same input, same numbers
+    assert regex_ints(text) == numpy_ints(text)
+
+    print(f"All integers of a generated day {args.day} input ({args.scale}x, {len(text) / 1e6:.1f} MB):")
+    for name, func in (("regex", regex_ints), ("numpy", numpy_ints)):
+        result = bench(func, text, measure_memory=True)
+        print(f"{name:>5}: median {result.median * 1000:.3f} ms, peak {format_bytes(result.memory['peak_bytes'])}")
+
+
+def pickled_chunk_sum(job):
+    # the old way: every task gets the whole array pickled
+    data, (start, stop) = job
+    return int(data[start:stop].sum())
+
+
+def shared_chunk_sum(arrays, chunk):
+    start, stop = chunk
+    return int(arrays["data"][start:stop].sum())
+
+
+def cmd_shm(args):
+    import multiprocessing
+    import time
+    from concurrent.futures import ProcessPoolExecutor
+
+    import numpy as np
+
+    from util.shared import pool_map
+
+    context = multiprocessing.get_context(args.method)
+    print(f"Sum of an int64 array in {args.tasks} tasks on {args.workers} workers ({args.method}):")
+    for mb in (int(s) for s in args.sizes.split(",")):
+        data = np.arange(mb * 1024 * 1024 // 8, dtype=np.int64)
+        step = -(-len(data) // args.tasks)
+        chunks = [(start, min(start + step, len(data))) for start in range(0, len(data), step)]
+
+        start_time = time.perf_counter()
+        with ProcessPoolExecutor(args.workers, mp_context=context) as pool:
+            pickled = sum(pool.map(pickled_chunk_sum, [(data, chunk) for chunk in chunks]))
+        time_pickled = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        shared = sum(pool_map(shared_chunk_sum, chunks, {"data": data}, args.workers, context))
+        time_shared = time.perf_counter() - start_time
+        # same array, same sum
+        assert pickled == shared == int(data.sum())
+        print(f"{mb:>5} MB: pickled {time_pickled * 1000:9.1f} ms, shared memory {time_shared * 1000:9.1f} ms")
+
+
+# exponents above this are flagged in perf.py complexity
+SUPER_LINEAR = 1.2
+
+
+def scaling_worker(day, scale, seed, runs, measure_memory, queue):
+    from util.bench import bench
+    from util.gen import generate, set_constants
+
+    text, constants = generate(day, scale, seed)
+    module = load_day_module(day)
+    set_constants(module, constants)
+    day_input = module.preprocess_input(text)[0] if hasattr(module, "preprocess_input") else text
+    # day 16 solves both parts in one go
+    tasks = [module.tasks] if hasattr(module, "tasks") else [module.task1, module.task2]
+    results = [
+        bench(task, day_input, warmup=0, min_runs=1, max_runs=runs, min_time=0, measure_memory=measure_memory)
+        for task in tasks
+    ]
+    results = results * 2 if len(results) == 1 else results
+    queue.put(
+        {
+            "size": len(text),
+            "times": [result.median for result in results],
+            "peaks": [result.memory["peak_bytes"] for result in results] if measure_memory else None,
+        }
+    )
+
+
+def run_scaling(day, scales, seed=0, runs=3, timeout=60.0, measure_memory=False):
+    """
+    Median time of task 1 and 2 on generated inputs of every scale, each scale in a fresh process. Once a
+    scale takes longer than timeout seconds, the larger scales are skipped. Returns {scale: result or None},
+    result being {"size": input bytes, "times": [t1, t2], "peaks": [peak bytes 1, 2] or None}.
+    """
+    import multiprocessing
+
+    results = {}
+    for scale in scales:
+        queue = multiprocessing.Queue()
+        process = multiprocessing.Process(target=scaling_worker, args=(day, scale, seed, runs, measure_memory, queue))
+        process.start()
+        process.join(timeout)
+        if process.is_alive():
+            process.terminate()
+            process.join()
+            results[scale] = None
+            break
+        results[scale] = queue.get() if process.exitcode == 0 else None
+        if results[scale] is None:
+            break
+    return results
+
+
+def cmd_scaling(args):
+    import json
+    import math
+
+    from rich.console import Console
+    from rich.table import Table
+
+    from util.gen import SCALES
+    from util.gen.days import GENERATORS
+
+    scales = [int(s) for s in args.scales.split(",")] if args.scales else list(SCALES)
+    days = [day for day in discover_days(parse_days(args.days)) if day in GENERATORS]
+
+    table = Table(title=f"Scaling on generated inputs (seed {args.seed}, median of up to {args.runs} runs)")
+    table.add_column("Day")
+    table.add_column("Part")
+    for scale in scales:
+        table.add_column(f"{scale}x (s)")
+
+    report = {}
+    for day in days:
+        results = run_scaling(day, scales, seed=args.seed, runs=args.runs, timeout=args.timeout)
+        report[day] = {scale: result and result["times"] for scale, result in results.items()}
+        for part in (0, 1):
+            row = [str(day), str(part + 1)]
+            prev = None
+            for scale in scales:
+                if scale not in results:
+                    row.append("-")
+                    continue
+                if results[scale] is None:
+                    row.append("[red]timeout/error[/red]")
+                    continue
+                seconds = results[scale]["times"][part]
+                cell = f"{seconds:.4f}"
+                if prev is not None and prev[1] > 0 and seconds > 0:
+                    # growth exponent k of time ~ n^k between the two scales
+                    k = math.log(seconds / prev[1]) / math.log(scale / prev[0])
+                    cell += f" (n^{k:.2f})"
+                row.append(cell)
+                prev = (scale, seconds)
+            table.add_row(*row)
+    Console().print(table)
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+def cmd_complexity(args):
+    import json
+
+    from rich.console import Console
+    from rich.table import Table
+
+    from util.complexity import estimate
+    from util.gen.days import GENERATORS
+    from util.memory import format_bytes
+
+    if args.scaling:
+        # reuse the times of perf.py scaling --json, the scale is the size (no memory)
+        with open(args.scaling) as file:
+            scaling = json.load(file)
+        measurements = {
+            int(day): [{"size": int(scale), "times": times, "peaks": None} for scale, times in results.items() if times]
+            for day, results in scaling.items()
+        }
+    else:
+        scales = [int(s) for s in args.scales.split(",")]
+        days = [day for day in discover_days(parse_days(args.days)) if day in GENERATORS]
+        measurements = {}
+        for day in days:
+            results = run_scaling(day, scales, args.seed, args.runs, args.timeout, measure_memory=bool(args.memory))
+            measurements[day] = [result for result in results.values() if result]
+
+    table = Table(title="Empirical complexity (power law fit y ~ n^k, n = input bytes, and best matching class)")
+    for column in ("Day", "Part", "Sizes", "Time n^k (r²)", "Time class", "Memory n^k (r²)", "Memory class"):
+        table.add_column(column)
+
+    def cells(result):
+        if result is None:
+            return ["-", "-"]
+        color = "red" if result["exponent"] > SUPER_LINEAR else "white"
+        r2 = "-" if result["r2"] is None else f"{result['r2']:.2f}"
+        return [f"[{color}]n^{result['exponent']:.2f}[/{color}] ({r2})", result["model"]]
+
+    report = {}
+    for day, results in sorted(measurements.items()):
+        ns = [result["size"] for result in results]
+        if not ns:
+            sizes = "-"
+        elif args.scaling:
+            sizes = f"{min(ns)}x .. {max(ns)}x"
+        else:
+            sizes = f"{format_bytes(min(ns))} .. {format_bytes(max(ns))}"
+        for part in (0, 1):
+            time_fit = estimate(ns, [result["times"][part] for result in results])
+            peaks = [result["peaks"][part] if result["peaks"] else None for result in results]
+            memory_fit = estimate(ns, peaks)
+            report.setdefault(day, {})[part + 1] = {"sizes": ns, "time": time_fit, "memory": memory_fit}
+            table.add_row(str(day), str(part + 1), sizes, *cells(time_fit), *cells(memory_fit))
+    Console().print(table)
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+def cmd_stable(args):
+    import json
+
+    from rich.console import Console
+    from rich.table import Table
+
+    from run import get_input_path
+    from util.history import append_records, input_info, make_record
+    from util.stable import bench_isolated
+
+    constants = json.loads(args.constants) if args.constants else {}
+    table = Table(title=f"Isolated runs ({args.samples} processes per task, outliers removed)")
+    for column in ("Day", "Part", "Median (s)", "Min (s)", "p95 (s)", "Spread", "Kept", "CPU", "MHz", "Load"):
+        table.add_column(column)
+
+    records = []
+    for day in discover_days(parse_days(args.days)):
+        input_path = args.input or get_input_path(day, args.example)
+        measured = {}
+        for part in (1, 2):
+            if measured.get(1) and measured[1][0].name == "tasks":
+                # a day solving both parts in one function (day 16) is measured once
+                result, info = measured[1]
+            else:
+                try:
+                    result, info = bench_isolated(
+                        day, part, input_path, args.samples, args.cpu, constants, args.timeout
+                    )
+                except Exception as e:  # noqa: BLE001
+                    # a broken day is reported in its row, the other days are still measured
+                    table.add_row(str(day), str(part), f"[red]{e!r}[/red]", *["-"] * 7)
+                    continue
+            measured[part] = (result, info)
+            spread = (result.p95 - result.min) / result.median if result.median > 0 else 0.0
+            mhz = "-" if info["freq_mhz"] is None else "{:.0f}..{:.0f}".format(*info["freq_mhz"])
+            load = "-" if info["load_before"] is None else f"{info['load_before']:.2f} -> {info['load_after']:.2f}"
+            table.add_row(
+                str(day),
+                str(part),
+                f"{result.median:.6f}",
+                f"{result.min:.6f}",
+                f"{result.p95:.6f}",
+                f"{spread:.1%}",
+                f"{result.runs}/{info['samples']}",
+                str(info["cpu"]),
+                mhz,
+                load,
+            )
+            if args.record:
+                kind = "other" if args.input else "example" if args.example else "real"
+                records.append(make_record(day, part, result, input=input_info(input_path, kind), **info))
+    Console().print(table)
+
+    if records:
+        append_records(records, ISOLATED_HISTORY_PATH)
+        print(f"Recorded {len(records)} results in {ISOLATED_HISTORY_PATH}")
+
+
+def cmd_ab(args):
+    from rich.console import Console
+    from rich.table import Table
+
+    from run import get_input_path
+    from util.bench import speedup_ci
+    from util.gen import generate
+    from util.gen.days import GENERATORS
+    from util.general_util import load_input
+    from util.variants import bench_variants, discover_variants, load_variants, verify_variants
+
+    names = args.variants.split(",") if args.variants else list(discover_variants(args.day))
+    if len(names) < 2:
+        print(f"Error: Day {args.day} needs at least two variants to compare (found: {', '.join(names) or '-'})")
+        sys.exit(1)
+    baseline = args.baseline or names[0]
+    if baseline not in names:
+        names.insert(0, baseline)
+
+    # (label, raw input, constants): the real and example input as they are, generated ones with their constants
+    inputs = []
+    for label, example in (("real", False), ("example", True)):
+        path = get_input_path(args.day, example)
+        if (args.example or not example) and os.path.exists(path):
+            inputs.append((label, load_input(path), {}))
+    if args.scales and args.day in GENERATORS:
+        for scale in (int(s) for s in args.scales.split(",")):
+            text, constants = generate(args.day, scale, args.seed)
+            inputs.append((f"gen {scale}x", text, constants))
+    if not inputs:
+        print(f"Error: No inputs for day {args.day} (no input.txt, example or generator)")
+        sys.exit(1)
+
+    table = Table(title=f"Day {args.day}: variants against {baseline} (speedup of the means, 95% CI)")
+    for column in ("Input", "Part", "Variant", "Median (s)", "Runs", "Speedup", "95% CI", "Answer"):
+        table.add_column(column)
+
+    failed = False
+    for label, raw_input, constants in inputs:
+        try:
+            modules = load_variants(args.day, names, constants)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        answers, mismatches = verify_variants(modules, raw_input)
+        failed |= bool(mismatches)
+        results = bench_variants(modules, raw_input, max_time=args.max_time, measure_memory=False)
+        for part, per_variant in results.items():
+            base = per_variant[baseline]
+            for name, result in per_variant.items():
+                if name == baseline:
+                    speedup, ci = "1.00x", "-"
+                else:
+                    value, low, high = speedup_ci(base.times_ns, result.times_ns)
+                    color = "green" if low > 1 else "red" if high < 1 else "white"
+                    speedup, ci = f"[{color}]{value:.2f}x[/{color}]", f"{low:.2f} .. {high:.2f}"
+                ok = "[red]differs[/red]" if part in mismatches else "ok"
+                table.add_row(label, str(part), name, f"{result.median:.6f}", str(result.runs), speedup, ci, ok)
+        for part in mismatches:
+            print(f"Day {args.day} part {part} on {label}: " + ", ".join(f"{n}={a}" for n, a in answers[part].items()))
+    Console().print(table)
+
+    if failed:
+        print("The variants do not give the same answers.")
+        sys.exit(1)
+
+
+def cmd_gen(args):
+    from util.gen import write_input
+
+    constants = write_input(args.day, args.output, scale=args.scale, seed=args.seed)
+    print(f"Wrote {args.output}" + (f" (set {constants} in the solution)" if constants else ""))
+
+
+def cmd_cache(args):
+    from util.general_util import INPUT_CACHE_PATH
+    from util.memory import format_bytes
+    from util.results import RESULT_CACHE_PATH, evict
+
+    max_bytes = 0 if args.clear else int(args.max_mb * 1024 * 1024)
+    max_age = 0 if args.clear else args.max_days * 24 * 3600
+    for name, cache_dir in (("results", RESULT_CACHE_PATH), ("inputs", INPUT_CACHE_PATH)):
+        removed, removed_bytes = evict(cache_dir, max_bytes, max_age)
+        print(f"{name}: removed {removed} entries ({format_bytes(removed_bytes)})")
+
+
+def cmd_check(args):
+    from rich.console import Console
+    from rich.table import Table
+
+    from run import get_input_path, print_failures, run_all
+    from util import golden as g
+    from util.general_util import load_input
+    from util.watchdog import day_limits
+
+    days = discover_days(parse_days(args.days))
+    golden = g.load_json(g.GOLDEN_PATH)
+    budgets = g.load_json(g.BUDGETS_PATH)
+    # a runaway day is stopped at its limits and reported with the counters it got to
+    limits = {day: day_limits(day, script_path, budgets) for day, script_path in days.items()}
+    kinds = ["example", "input"] if args.example else ["input"]
+
+    table = Table(title="Golden answers" + (" and budgets" if args.budgets else ""))
+    for column in ("Day", "Input", "Task 1", "Task 2", "Time 1 (s)", "Time 2 (s)", "Status"):
+        table.add_column(column)
+
+    failed = False
+    missing = []
+    reports_over_limits = []
+    for kind in kinds:
+        example = kind == "example"
+        track_memory = args.budgets and not example
+        reports = run_all(
+            days,
+            workers=args.workers,
+            example=example,
+            track_memory=track_memory,
+            count=True,
+            limits=limits if args.watchdog else None,
+            constants=g.EXAMPLE_CONSTANTS if example else None,
+        )
+        for report in reports:
+            day = report["day"]
+            if report["status"] == "missing input":
+                # not an error, the (real) input is just not there on this machine
+                missing.append(f"{day} ({kind})")
+                continue
+            if report["status"] != "ok":
+                failed = True
+                table.add_row(str(day), kind, "-", "-", "-", "-", report["status"])
+                reports_over_limits.append(report)
+                continue
+
+            input_hash = g.hash_input(load_input(get_input_path(day, example)))
+            if args.record:
+                g.record_answers(report, kind, input_hash, golden)
+                problems = []
+            else:
+                problems = g.check_answers(report, kind, input_hash, golden)
+            if track_memory and args.record_budgets:
+                g.record_budgets(report, budgets, args.record_budgets)
+            elif track_memory:
+                problems += g.check_budgets(report, budgets)
+
+            # an input without recorded answers fails as well, a fresh checkout must not pass without comparing
+            failed |= bool(problems)
+            status = "[red]" + "; ".join(problems) + "[/red]" if problems else "ok"
+            table.add_row(
+                str(day),
+                kind,
+                str(report["task1"]["answer"]),
+                str(report["task2"]["answer"]),
+                f"{report['task1']['time']:.4f}",
+                f"{report['task2']['time']:.4f}",
+                status,
+            )
+    Console().print(table)
+    print_failures(reports_over_limits)
+    if missing:
+        print(f"No input for day(s): {', '.join(missing)}")
+    if failed and not args.record:
+        print("Answers of new inputs are recorded with --record 1 (check them first).")
+
+    if args.record:
+        g.save_json(g.GOLDEN_PATH, golden)
+        print(f"Golden answers written to {g.GOLDEN_PATH}")
+    if args.record_budgets:
+        g.save_json(g.BUDGETS_PATH, budgets)
+        print(f"Budgets written to {g.BUDGETS_PATH}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Performance tooling for the daily solutions")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    parser_compare = subparsers.add_parser("compare", help="Flag regressions against a baseline commit")
+    parser_compare.add_argument("baseline", type=str, help="Commit (prefix) of the baseline results")
+    parser_compare.add_argument(
+        "--candidate", type=str, help="Commit (prefix) to compare. Default: latest", default=None
+    )
+    parser_compare.add_argument("--machine", type=str, help="Machine fingerprint. Default: this machine", default=None)
+    parser_compare.add_argument(
+        "--threshold", type=float, help="Relative slowdown to report", default=REGRESSION_THRESHOLD
+    )
+    parser_compare.add_argument("--alpha", type=float, help="Significance level", default=REGRESSION_ALPHA)
+    parser_compare.add_argument("--isolated", type=int, help="Compare the results of 'perf.py stable'", default=0)
+    parser_compare.set_defaults(func=cmd_compare)
+
+    parser_readme = subparsers.add_parser("readme", help="Regenerate the README times from the history")
+    parser_readme.add_argument("--machine", type=str, help="Machine fingerprint. Default: this machine", default=None)
+    parser_readme.set_defaults(func=cmd_readme)
+
+    parser_dashboard = subparsers.add_parser("dashboard", help="Render the benchmark history as HTML with plots")
+    parser_dashboard.add_argument("--output", type=str, help="Path of the HTML file", default=DASHBOARD_PATH)
+    parser_dashboard.add_argument("--scaling", type=str, help="JSON of 'perf.py scaling --json'", default="")
+    parser_dashboard.add_argument(
+        "--machine", type=str, help="Machine fingerprint. Default: this machine", default=None
+    )
+    parser_dashboard.set_defaults(func=cmd_dashboard)
+
+    parser_startup = subparsers.add_parser("startup", help="Check the import time of the solutions")
+    parser_startup.add_argument("--days", type=str, help="Days to check, e.g. '1-5,7'. Default: all", default="")
+    parser_startup.add_argument("--budget-ms", type=float, help="Max import time per solution", default=250.0)
+    parser_startup.add_argument("--repeat", type=int, help="Imports per solution (fastest counts)", default=5)
+    parser_startup.set_defaults(func=cmd_startup)
+
+    parser_grid = subparsers.add_parser("grid", help="Micro-benchmark util.grid.Grid against a dict map")
+    parser_grid.add_argument("--size", type=int, help="Width and height of the map", default=300)
+    parser_grid.set_defaults(func=cmd_grid)
+
+    parser_parse = subparsers.add_parser("parse", help="Micro-benchmark util.parse against re.findall")
+    parser_parse.add_argument("--day", type=int, help="Day of the generated input", default=1)
+    parser_parse.add_argument("--scale", type=int, help="Size relative to a real input", default=100)
+    parser_parse.set_defaults(func=cmd_parse)
+
+    parser_shm = subparsers.add_parser("shm", help="Compare pickled and shared memory inputs for a process pool")
+    parser_shm.add_argument("--sizes", type=str, help="Array sizes in MB", default="1,10,100")
+    parser_shm.add_argument("--tasks", type=int, help="Tasks per array", default=16)
+    parser_shm.add_argument("--workers", type=int, help="Worker processes", default=2)
+    parser_shm.add_argument("--method", type=str, help="Start method of the workers", default="forkserver")
+    parser_shm.set_defaults(func=cmd_shm)
+
+    parser_check = subparsers.add_parser("check", help="Check the answers against the golden answers")
+    parser_check.add_argument("--days", type=str, help="Days to check, e.g. '1-5,7'. Default: all", default="")
+    parser_check.add_argument("--workers", type=int, help="Worker processes. Default: cpu count", default=None)
+    parser_check.add_argument("--example", type=int, help="Also check the example inputs", default=1)
+    parser_check.add_argument("--budgets", type=int, help="Check the time/memory budgets (real input)", default=0)
+    parser_check.add_argument("--watchdog", type=int, help="Stop days over their time/memory limits", default=1)
+    parser_check.add_argument("--record", type=int, help="Record the answers as the golden answers", default=0)
+    parser_check.add_argument("--record-budgets", type=float, help="Record factor * measured as budgets", default=0)
+    parser_check.set_defaults(func=cmd_check)
+
+    parser_cache = subparsers.add_parser("cache", help="Evict old entries of the result and input caches")
+    parser_cache.add_argument("--max-mb", type=float, help="Max size per cache (least recently used go)", default=64)
+    parser_cache.add_argument("--max-days", type=float, help="Remove entries not used for this many days", default=30)
+    parser_cache.add_argument("--clear", type=int, help="Remove everything", default=0)
+    parser_cache.set_defaults(func=cmd_cache)
+
+    parser_scaling = subparsers.add_parser("scaling", help="Time the tasks on generated inputs of growing size")
+    parser_scaling.add_argument("--days", type=str, help="Days to run, e.g. '1-5,7'. Default: all", default="")
+    parser_scaling.add_argument("--scales", type=str, help="Input scales, e.g. '1,10,100'", default="")
+    parser_scaling.add_argument("--seed", type=int, help="Seed of the generated inputs", default=0)
+    parser_scaling.add_argument("--runs", type=int, help="Max runs per task and scale", default=3)
+    parser_scaling.add_argument("--timeout", type=float, help="Seconds per day and scale", default=60.0)
+    parser_scaling.add_argument("--json", type=str, help="Write the times as JSON to this path", default="")
+    parser_scaling.set_defaults(func=cmd_scaling)
+
+    parser_complexity = subparsers.add_parser("complexity", help="Estimate the complexity of the tasks")
+    parser_complexity.add_argument("--days", type=str, help="Days to run, e.g. '1-5,7'. Default: all", default="")
+    parser_complexity.add_argument("--scales", type=str, help="Input scales (geometric)", default="1,2,4,8,16")
+    parser_complexity.add_argument("--seed", type=int, help="Seed of the generated inputs", default=0)
+    parser_complexity.add_argument("--runs", type=int, help="Max runs per task and scale", default=3)
+    parser_complexity.add_argument("--timeout", type=float, help="Seconds per day and scale", default=60.0)
+    parser_complexity.add_argument("--memory", type=int, help="Also fit the peak memory (tracemalloc)", default=1)
+    parser_complexity.add_argument("--scaling", type=str, help="Fit the JSON of 'perf.py scaling' instead", default="")
+    parser_complexity.add_argument("--json", type=str, help="Write the fits as JSON to this path", default="")
+    parser_complexity.set_defaults(func=cmd_complexity)
+
+    parser_stable = subparsers.add_parser("stable", help="Time every run in its own process pinned to one core")
+    parser_stable.add_argument("--days", type=str, help="Days to run, e.g. '1-5,7'. Default: all", default="")
+    parser_stable.add_argument("--samples", type=int, help="Processes (runs) per task", default=20)
+    parser_stable.add_argument("--cpu", type=int, help="Core to pin to. Default: last allowed core", default=None)
+    parser_stable.add_argument("--example", type=int, help="Use the example inputs", default=0)
+    parser_stable.add_argument("--input", type=str, help="Input file instead of the day's input", default="")
+    parser_stable.add_argument("--constants", type=str, help="JSON of module constants for --input", default="")
+    parser_stable.add_argument("--timeout", type=float, help="Seconds per sample", default=300.0)
+    parser_stable.add_argument("--record", type=int, help="Append the results to the isolated history", default=0)
+    parser_stable.set_defaults(func=cmd_stable)
+
+    parser_ab = subparsers.add_parser("ab", help="Benchmark the variants of a day against each other")
+    parser_ab.add_argument("day", type=int, help="Day with more than one solution*.py")
+    parser_ab.add_argument("--variants", type=str, help="Variants to compare, e.g. 'counter,recursive'", default="")
+    parser_ab.add_argument("--baseline", type=str, help="Variant to compare against. Default: solution.py", default="")
+    parser_ab.add_argument("--example", type=int, help="Also run the example input", default=0)
+    parser_ab.add_argument("--scales", type=str, help="Scales of generated inputs, e.g. '1,10'", default="1")
+    parser_ab.add_argument("--seed", type=int, help="Seed of the generated inputs", default=0)
+    parser_ab.add_argument("--max-time", type=float, help="Max seconds per variant, part and input", default=10.0)
+    parser_ab.set_defaults(func=cmd_ab)
+
+    parser_gen = subparsers.add_parser("gen", help="Write a generated input for a day")
+    parser_gen.add_argument("day", type=int, help="Day of the input")
+    parser_gen.add_argument("output", type=str, help="Path of the input file")
+    parser_gen.add_argument("--scale", type=int, help="Size relative to a real input", default=1)
+    parser_gen.add_argument("--seed", type=int, help="Seed of the generated input", default=0)
+    parser_gen.set_defaults(func=cmd_gen)
+
+    args = parser.parse_args()
+    args.func(args)
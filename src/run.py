@@ -0,0 +1,382 @@
+import argparse
+import importlib.util
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+cur_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(cur_dir)
+
+DAY_DIR_PATTERN = re.compile(r"^day_(\d{2})$")
+
+
+def discover_days(days=None):
+    # find all day_XX folders with a solution.py (optionally filtered by day numbers)
+    found = {}
+    for name in sorted(os.listdir(cur_dir)):
+        match = DAY_DIR_PATTERN.match(name)
+        script_path = os.path.join(cur_dir, name, "solution.py")
+        if match and os.path.isfile(script_path):
+            day = int(match.group(1))
+            if days is None or day in days:
+                found[day] = script_path
+    return found
+
+
+def load_day_module(day, script_path=None):
+    if script_path is None:
+        script_path = os.path.join(cur_dir, f"day_{day:02d}", "solution.py")
+    spec = importlib.util.spec_from_file_location(f"day_{day:02d}_solution", script_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def get_input_path(day, example=False):
+    file_name = "example_input.txt" if example else "input.txt"
+    return os.path.join(cur_dir, f"day_{day:02d}", file_name)
+
+
+def solve_tasks(module, day_input, parts=(1, 2)):
+    # {"task1": {"answer": ..., "time": seconds}, ...} for the given parts of an already preprocessed input
+    if hasattr(module, "tasks"):
+        # both parts are solved in one go (e.g. day 16)
+        answers, time_tasks = module.tasks(day_input)
+        return {f"task{part}": {"answer": answers[part - 1], "time": time_tasks} for part in parts}
+    report = {}
+    for part in parts:
+        answer, seconds = getattr(module, f"task{part}")(day_input)
+        report[f"task{part}"] = {"answer": answer, "time": seconds}
+    return report
+
+
+def cached_tasks(module, raw_input):
+    # report of both tasks from the result cache (util/results.py), None if one of them is not cached
+    from util.results import load_result, result_key
+
+    if hasattr(module, "tasks"):
+        entry = load_result(result_key(module.tasks, raw_input))
+        if entry is None:
+            return None
+        answers, seconds = entry["result"], entry["time"]
+        report = {f"task{part}": {"answer": answers[part - 1], "time": seconds} for part in (1, 2)}
+    else:
+        report = {}
+        for part in (1, 2):
+            entry = load_result(result_key(getattr(module, f"task{part}"), raw_input))
+            if entry is None:
+                return None
+            report[f"task{part}"] = {"answer": entry["result"], "time": entry["time"]}
+    report["preprocess"] = 0.0
+    report["cached"] = True
+    return report
+
+
+def store_tasks(module, raw_input, report):
+    from util.results import result_key, store_result
+
+    if hasattr(module, "tasks"):
+        answers = (report["task1"]["answer"], report["task2"]["answer"])
+        store_result(result_key(module.tasks, raw_input), answers, report["task1"]["time"])
+        return
+    for part in (1, 2):
+        task = report[f"task{part}"]
+        store_result(result_key(getattr(module, f"task{part}"), raw_input), task["answer"], task["time"])
+
+
+def solve_day(module, raw_input, use_cache=False, use_results=False):
+    from util import counters, memory
+    from util.general_util import preprocess_cached
+
+    # answers of an unchanged input and solution come from the result cache, not with memory tracking or
+    # counters (nothing to measure)
+    use_results = use_results and not memory.is_enabled() and not counters.is_enabled()
+    if use_results:
+        report = cached_tasks(module, raw_input)
+        if report is not None:
+            return report
+
+    # every callable is wrapped with @timer(return_time=True), so each call returns (result, seconds)
+    memory.last_results.clear()
+    counters.last_results.clear()
+    preprocess = getattr(module, "preprocess_input", None)
+    if preprocess is not None and use_cache:
+        day_input, time_preprocess = preprocess_cached(preprocess, raw_input)
+    elif preprocess is not None:
+        day_input, time_preprocess = preprocess(raw_input)
+    else:
+        day_input, time_preprocess = raw_input, 0.0
+
+    report = solve_tasks(module, day_input)
+    report["preprocess"] = time_preprocess
+    if use_results:
+        store_tasks(module, raw_input, report)
+    if memory.is_enabled():
+        # filled by the timer decorator, keyed by the function name
+        mem_task1 = memory.last_results.get("tasks", memory.last_results.get("task1"))
+        mem_task2 = memory.last_results.get("tasks", memory.last_results.get("task2"))
+        report["task1"]["memory"], report["task2"]["memory"] = mem_task1, mem_task2
+        report["preprocess_memory"] = memory.last_results.get("preprocess_input")
+    if counters.is_enabled():
+        for task in ("task1", "task2"):
+            report[task]["counters"] = counters.last_results.get("tasks", counters.last_results.get(task, {}))
+    return report
+
+
+def run_day(
+    day, script_path, example=False, track_memory=False, use_cache=False, use_results=False, count=False, constants=None
+):
+    from util.counters import enable_counters
+    from util.general_util import load_input
+    from util.memory import enable_memory_tracking
+
+    if track_memory:
+        enable_memory_tracking()
+    if count:
+        enable_counters()
+
+    report = {"day": day, "status": "ok"}
+    input_path = get_input_path(day, example)
+    if not os.path.isfile(input_path):
+        report["status"] = "missing input"
+        return report
+
+    start_time = time.perf_counter()
+    try:
+        module = load_day_module(day, script_path)
+        report["import"] = time.perf_counter() - start_time
+        if constants:
+            # e.g. the map size of an example input (util/golden.py EXAMPLE_CONSTANTS)
+            from util.gen import set_constants
+
+            set_constants(module, constants)
+        report.update(solve_day(module, load_input(input_path), use_cache, use_results))
+    except MemoryError:
+        # over the address space limit of the watchdog (util/watchdog.py) or out of memory
+        from util.watchdog import partial_counters
+
+        report["status"] = "out of memory"
+        report["partial_counters"] = partial_counters()
+    except Exception as e:  # noqa: BLE001
+        # a broken day is reported in the table instead of taking down the other days
+        report["status"] = f"error: {e!r}"
+    report["wall"] = time.perf_counter() - start_time
+    return report
+
+
+def json_default(value):
+    # numpy answers (e.g. day 1) as the python number, everything else json does not know as str
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+def watched_report(day, limits, status, payload):
+    # report of a day run under the watchdog (util/watchdog.py), see run_all
+    if status == "ok":
+        return payload
+    report = {"day": day, "limits": limits}
+    if status == "aborted":
+        report["status"] = f"over time limit ({limits['time']:.0f} s)"
+        report["partial_counters"] = payload["counters"]
+        report["stuck_at"] = payload["stuck_at"]
+    elif status == "out of memory":
+        report["status"] = "out of memory"
+        report["partial_counters"] = payload["counters"]
+    else:
+        report["status"] = f"killed (exit code {payload['exitcode']})"
+    return report
+
+
+def run_all(
+    days,
+    workers=None,
+    example=False,
+    track_memory=False,
+    use_cache=False,
+    use_results=False,
+    count=False,
+    limits=None,
+    constants=None,
+):
+    """
+    Runs the days in parallel, returns their reports sorted by day. With limits ({day: {"time": seconds,
+    "memory": bytes}}, see util/watchdog.day_limits) every day runs in its own watched process, a day over its
+    limits is reported as failed and does not hold up the others. constants ({day: {name: value}}) are set on
+    the solution modules before they run.
+    """
+    run_args = (example, track_memory, use_cache, use_results, count)
+    constants = constants or {}
+    reports = []
+    if limits is not None:
+        from util.watchdog import watch_all
+
+        jobs = {
+            day: (
+                run_day,
+                (day, script_path, *run_args, constants.get(day)),
+                limits[day]["time"],
+                limits[day]["memory"],
+            )
+            for day, script_path in days.items()
+        }
+        for day, status, payload in watch_all(jobs, workers):
+            reports.append(watched_report(day, limits[day], status, payload))
+        return sorted(reports, key=lambda r: r["day"])
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(run_day, day, script_path, *run_args, constants.get(day))
+            for day, script_path in days.items()
+        ]
+        for future in as_completed(futures):
+            reports.append(future.result())
+    return sorted(reports, key=lambda r: r["day"])
+
+
+def parse_days(days_arg):
+    # "1-5,7,9" -> {1, 2, 3, 4, 5, 7, 9}
+    if not days_arg:
+        return None
+    days = set()
+    for part in days_arg.split(","):
+        if "-" in part:
+            start, end = part.split("-")
+            days.update(range(int(start), int(end) + 1))
+        else:
+            days.add(int(part))
+    return days
+
+
+def print_table(reports, total_time, track_memory=False):
+    from rich.console import Console
+    from rich.table import Table
+
+    from util.memory import format_bytes
+
+    columns = ["Day", "Task 1", "Time 1 (s)", "Task 2", "Time 2 (s)", "Preprocess (s)"]
+    if track_memory:
+        columns += ["Peak 1", "Peak 2"]
+    table = Table(title=f"Advent of Code 2024 ({total_time:.3f} seconds wall time)")
+    for column in columns + ["Status"]:
+        table.add_column(column)
+
+    for r in reports:
+        if r["status"] != "ok":
+            table.add_row(str(r["day"]), *["-"] * (len(columns) - 1), r["status"])
+            continue
+        row = [
+            str(r["day"]),
+            str(r["task1"]["answer"]),
+            f"{r['task1']['time']:.6f}",
+            str(r["task2"]["answer"]),
+            f"{r['task2']['time']:.6f}",
+            f"{r['preprocess']:.6f}",
+        ]
+        if track_memory:
+            row += [format_bytes(r[task]["memory"]["peak_bytes"]) for task in ("task1", "task2")]
+        table.add_row(*row, "ok (cached)" if r.get("cached") else r["status"])
+    Console().print(table)
+
+
+def print_counters(reports):
+    from rich.console import Console
+    from rich.table import Table
+
+    from util.counters import format_counters
+
+    table = Table(title="Counters")
+    for column in ("Day", "Task", "Counters"):
+        table.add_column(column)
+    for r in reports:
+        if r["status"] != "ok":
+            continue
+        if r["task1"].get("counters") is r["task2"].get("counters"):
+            # both parts solved in one go (tasks), same counters
+            rows = [("tasks", r["task1"].get("counters"))]
+        else:
+            rows = [(task, r[task].get("counters")) for task in ("task1", "task2")]
+        for task, task_counters in rows:
+            if task_counters:
+                table.add_row(str(r["day"]), task, format_counters(task_counters))
+    Console().print(table)
+
+
+def print_failures(reports):
+    # what a day over its limits got done: counters of the finished tasks, the running one and where it was
+    from util.counters import format_counters
+
+    for r in reports:
+        if "partial_counters" not in r and "stuck_at" not in r:
+            continue
+        print(f"Day {r['day']}: {r['status']}")
+        if r.get("stuck_at"):
+            print(f"  stopped in {' -> '.join(r['stuck_at'])}")
+        for name, task_counters in (r.get("partial_counters") or {}).items():
+            print(f"  {name}: {format_counters(task_counters)}")
+
+
+def main(args):
+    days = discover_days(parse_days(args.days))
+    if not days:
+        print("Error: No solutions found.")
+        sys.exit(1)
+
+    limits = None
+    if args.watchdog:
+        from util.golden import BUDGETS_PATH, load_json
+        from util.watchdog import day_limits
+
+        budgets = load_json(BUDGETS_PATH)
+        limits = {day: day_limits(day, script_path, budgets) for day, script_path in days.items()}
+
+    constants = None
+    if args.example:
+        # the examples are smaller than the real inputs, e.g. the map size of day 14 and 18
+        from util.golden import EXAMPLE_CONSTANTS
+
+        constants = EXAMPLE_CONSTANTS
+
+    start_time = time.perf_counter()
+    reports = run_all(
+        days,
+        workers=args.workers,
+        example=args.example,
+        track_memory=args.memory,
+        use_cache=args.cache,
+        use_results=args.results,
+        count=args.counters,
+        limits=limits,
+        constants=constants,
+    )
+    total_time = time.perf_counter() - start_time
+
+    if args.json:
+        output = json.dumps({"wall": total_time, "days": reports}, indent=2, default=json_default)
+        if args.json == "-":
+            print(output)
+        else:
+            with open(args.json, "w") as file:
+                file.write(output)
+    else:
+        print_table(reports, total_time, track_memory=args.memory)
+        if args.counters:
+            print_counters(reports)
+        print_failures(reports)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=str, help="Days to run, e.g. '1-5,7'. Default: all", default="")
+    parser.add_argument("--workers", type=int, help="Number of worker processes. Default: cpu count", default=None)
+    parser.add_argument("--example", type=int, help="Use the example input", default=0)
+    parser.add_argument("--memory", type=int, help="Track the memory usage of the tasks", default=0)
+    parser.add_argument("--cache", type=int, help="Load the preprocessed inputs from the cache", default=1)
+    parser.add_argument("--counters", type=int, help="Count hot path operations (see util/counters.py)", default=0)
+    parser.add_argument("--results", type=int, help="Reuse cached answers of unchanged days", default=0)
+    parser.add_argument("--watchdog", type=int, help="Stop days over their time/memory limits", default=1)
+    parser.add_argument("--json", type=str, help="Write the report as JSON to this path ('-' for stdout)", default="")
+    main(parser.parse_args())
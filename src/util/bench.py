@@ -0,0 +1,184 @@
+import copy
+import gc
+import math
+import time
+
+from util import memory
+
+# Defaults for the adaptive benchmark (can be overwritten per call)
+WARMUP = 1
+MIN_RUNS = 5
+MAX_RUNS = 10_000
+MIN_TIME = 1.0  # seconds of measurement before the confidence interval is checked
+MAX_TIME = 30.0  # seconds of measurement after which we stop in any case (slow days)
+TARGET_REL_CI = 0.02  # stop if the 95% confidence interval of the mean is within +-2%
+MEASURE_MEMORY = True  # one extra run under tracemalloc after the timed runs
+
+
+class BenchResult:
+    def __init__(self, name, times_ns, memory_stats=None):
+        self.name = name
+        self.times_ns = sorted(times_ns)
+        self.memory = memory_stats
+
+    @property
+    def runs(self):
+        return len(self.times_ns)
+
+    @property
+    def min(self):
+        return self.times_ns[0] / 1e9
+
+    @property
+    def max(self):
+        return self.times_ns[-1] / 1e9
+
+    @property
+    def mean(self):
+        return math.fsum(self.times_ns) / len(self.times_ns) / 1e9
+
+    @property
+    def median(self):
+        return percentile(self.times_ns, 50) / 1e9
+
+    @property
+    def p95(self):
+        return percentile(self.times_ns, 95) / 1e9
+
+    @property
+    def stddev(self):
+        return stdev(self.times_ns) / 1e9
+
+    @property
+    def rel_ci(self):
+        return relative_ci(self.times_ns)
+
+    def as_dict(self):
+        return {
+            "name": self.name,
+            "runs": self.runs,
+            "min": self.min,
+            "median": self.median,
+            "mean": self.mean,
+            "p95": self.p95,
+            "max": self.max,
+            "stddev": self.stddev,
+            **(self.memory or {}),
+        }
+
+    def __str__(self):
+        text = (
+            f"median {self.median:.6f} s | min {self.min:.6f} s | p95 {self.p95:.6f} s | "
+            f"stddev {self.stddev:.6f} s | {self.runs} runs"
+        )
+        if self.memory:
+            text += f"\n        {memory.format_stats(self.memory)}"
+        return text
+
+
+def percentile(sorted_values, p):
+    # linear interpolation between the closest ranks
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    k = (len(sorted_values) - 1) * p / 100
+    f = math.floor(k)
+    c = min(f + 1, len(sorted_values) - 1)
+    return sorted_values[f] + (sorted_values[c] - sorted_values[f]) * (k - f)
+
+
+def stdev(values):
+    # sample standard deviation (statistics is not imported, it pulls in decimal and fractions)
+    if len(values) < 2:
+        return 0.0
+    mean = math.fsum(values) / len(values)
+    return math.sqrt(math.fsum((v - mean) ** 2 for v in values) / (len(values) - 1))
+
+
+def relative_ci(times_ns):
+    # half width of the 95% confidence interval of the mean, relative to the mean
+    if len(times_ns) < 2:
+        return math.inf
+    mean = math.fsum(times_ns) / len(times_ns)
+    if mean == 0:
+        return 0.0
+    return 1.96 * stdev(times_ns) / math.sqrt(len(times_ns)) / mean
+
+
+def speedup_ci(baseline_ns, candidate_ns):
+    """
+    Speedup of candidate over baseline (mean of baseline / mean of candidate, > 1 is faster) with its 95%
+    confidence interval, (speedup, low, high). The interval comes from the standard errors of both means on
+    the log scale (delta method), so it stays positive and is symmetric in the ratio.
+    """
+    mean_base = math.fsum(baseline_ns) / len(baseline_ns)
+    mean_cand = math.fsum(candidate_ns) / len(candidate_ns)
+    speedup = mean_base / mean_cand
+    # relative_ci is 1.96 times the relative standard error
+    half_width = math.hypot(relative_ci(baseline_ns), relative_ci(candidate_ns))
+    return speedup, speedup * math.exp(-half_width), speedup * math.exp(half_width)
+
+
+def bench(
+    func,
+    *args,
+    warmup=WARMUP,
+    min_runs=MIN_RUNS,
+    max_runs=MAX_RUNS,
+    min_time=MIN_TIME,
+    max_time=MAX_TIME,
+    target_rel_ci=TARGET_REL_CI,
+    disable_gc=True,
+    measure_memory=MEASURE_MEMORY,
+    copy_args=True,
+    **kwargs,
+):
+    """
+    Measures func(*args, **kwargs) with perf_counter_ns until min_time is reached and the relative
+    confidence interval is below target_rel_ci (or max_runs/max_time is hit). Functions wrapped with
+    @timer are measured without the wrapper. With measure_memory, one extra untimed run is traced
+    with tracemalloc. With copy_args, every run gets its own deep copy of the arguments (made outside the
+    timed region), tasks that change their input (sorting in place, the registers of day 17) would
+    otherwise work on what the previous run left behind. The arguments passed in are never changed.
+    """
+    # measure the raw function, not the @timer wrapper
+    raw_func = getattr(func, "__wrapped__", func)
+
+    def fresh_args():
+        return copy.deepcopy((args, kwargs)) if copy_args else (args, kwargs)
+
+    for _ in range(warmup):
+        run_args, run_kwargs = fresh_args()
+        raw_func(*run_args, **run_kwargs)
+
+    gc_was_enabled = gc.isenabled()
+    gc.collect()
+    if disable_gc:
+        gc.disable()
+
+    times_ns = []
+    total_ns = 0
+    try:
+        while len(times_ns) < max_runs:
+            run_args, run_kwargs = fresh_args()
+            start = time.perf_counter_ns()
+            raw_func(*run_args, **run_kwargs)
+            elapsed = time.perf_counter_ns() - start
+            times_ns.append(elapsed)
+            total_ns += elapsed
+
+            if len(times_ns) < min_runs:
+                continue
+            if total_ns >= max_time * 1e9:
+                break
+            if total_ns >= min_time * 1e9 and relative_ci(times_ns) <= target_rel_ci:
+                break
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    if measure_memory:
+        run_args, run_kwargs = fresh_args()
+        memory_stats = memory.measure(raw_func, *run_args, **run_kwargs)[1]
+    else:
+        memory_stats = None
+    return BenchResult(raw_func.__name__, times_ns, memory_stats)
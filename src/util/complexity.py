@@ -0,0 +1,78 @@
+import math
+
+# Empirical complexity: fit y = c * f(n) to measurements (time or peak memory) on inputs of growing size n.
+# All fits are least squares on log(y), so every size counts the same no matter how big its y is.
+
+# candidate classes for the best match, f(n)
+MODELS = {
+    "1": lambda n: 1.0,
+    "log n": lambda n: math.log(n),
+    "n": lambda n: n,
+    "n log n": lambda n: n * math.log(n),
+    "n^2": lambda n: n**2,
+    "n^2 log n": lambda n: n**2 * math.log(n),
+    "n^3": lambda n: n**3,
+}
+# sizes needed for a fit, with only two the fit is exact and there is no r2
+MIN_POINTS = 2
+
+
+def clean_points(ns, ys):
+    # log needs positive values
+    return [(n, y) for n, y in zip(ns, ys) if y is not None and y > 0 and n > 0]
+
+
+def fit_power_law(ns, ys):
+    """
+    Fits y = c * n^k, returns (k, c, r2) with r2 the coefficient of determination of the log-log fit,
+    None with less than MIN_POINTS usable points.
+    """
+    points = clean_points(ns, ys)
+    if len(points) < MIN_POINTS:
+        return None
+    xs = [math.log(n) for n, _ in points]
+    log_ts = [math.log(y) for _, y in points]
+    mean_x, mean_log_t = sum(xs) / len(xs), sum(log_ts) / len(log_ts)
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    if sxx == 0:
+        return None
+    k = sum((x - mean_x) * (log_t - mean_log_t) for x, log_t in zip(xs, log_ts)) / sxx
+    log_c = mean_log_t - k * mean_x
+    ss_res = sum((log_t - (log_c + k * x)) ** 2 for x, log_t in zip(xs, log_ts))
+    ss_tot = sum((log_t - mean_log_t) ** 2 for log_t in log_ts)
+    if len(points) == 2:
+        r2 = None
+    else:
+        r2 = 1 - ss_res / ss_tot if ss_tot > 0 else 1.0
+    return k, math.exp(log_c), r2
+
+
+def fit_model(ns, ys, f):
+    # fits y = c * f(n), returns (c, rms of the log residuals), rms is inf if the model can't be fitted
+    # (e.g. log n at n = 1)
+    points = [(n, y) for n, y in clean_points(ns, ys) if f(n) > 0]
+    if len(points) < MIN_POINTS:
+        return None, math.inf
+    diffs = [math.log(y) - math.log(f(n)) for n, y in points]
+    log_c = sum(diffs) / len(diffs)
+    rms = math.sqrt(sum((d - log_c) ** 2 for d in diffs) / len(diffs))
+    return math.exp(log_c), rms
+
+
+def best_model(ns, ys):
+    # name of the class in MODELS that fits best (lowest rms of the log residuals), None with too few points
+    if len(clean_points(ns, ys)) < MIN_POINTS:
+        return None
+    return min(MODELS, key=lambda name: fit_model(ns, ys, MODELS[name])[1])
+
+
+def estimate(ns, ys):
+    """
+    {"exponent": k of the power law fit, "r2": ..., "model": best matching class} for the measurements
+    ys at sizes ns, None if there are not enough usable points.
+    """
+    fit = fit_power_law(ns, ys)
+    if fit is None:
+        return None
+    k, _, r2 = fit
+    return {"exponent": k, "r2": r2, "model": best_model(ns, ys)}
@@ -0,0 +1,86 @@
+# Counters for the hot paths of a solution (queue pushes, simulated steps, recursive calls, ...), to see why a
+# task is slow and not just that it is. Disabled by default: code in a hot loop checks is_enabled() once
+# before the loop, keeps its counts in local variables behind that flag and adds them here after the loop,
+# so a disabled counter costs one branch on a local variable.
+
+# set by enable_counters, checked by the timer decorator
+_enabled = False
+# counters of the running task, reset by the timer decorator before every call
+values = {}
+# counters of the last call per function name (filled by the timer decorator)
+last_results = {}
+
+
+def enable_counters():
+    global _enabled
+    _enabled = True
+
+
+def disable_counters():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def incr(name, n=1):
+    if _enabled:
+        values[name] = values.get(name, 0) + n
+
+
+def gauge(name, value):
+    # last value wins
+    if _enabled:
+        values[name] = value
+
+
+def track_max(name, value):
+    if _enabled and value > values.get(name, value - 1):
+        values[name] = value
+
+
+def get(name, default=0):
+    return values.get(name, default)
+
+
+def reset():
+    values.clear()
+
+
+def snapshot():
+    return dict(values)
+
+
+def record_cache_info(name, func):
+    # hits, misses and hit ratio of an lru_cache decorated function (since its last cache_clear)
+    if not _enabled:
+        return
+    info = func.cache_info()
+    calls = info.hits + info.misses
+    values[f"{name}.hits"] = info.hits
+    values[f"{name}.misses"] = info.misses
+    values[f"{name}.hit_ratio"] = round(info.hits / calls, 4) if calls else 0.0
+
+
+def record_search(name, pushes, pops, max_queue):
+    # the usual counters of a queue based search, name is e.g. "bfs" or "dijkstra"
+    if not _enabled:
+        return
+    incr(f"{name}.pushes", pushes)
+    incr(f"{name}.pops", pops)
+    track_max(f"{name}.max_queue", max_queue)
+
+
+def format_counters(counters):
+    return ", ".join(
+        f"{name}={value:,}" if isinstance(value, int) else f"{name}={value}" for name, value in counters.items()
+    )
+
+
+def print_counter_report():
+    print("\nCounters:")
+    for name, counters in last_results.items():
+        if counters:
+            print(f"{name}: {format_counters(counters)}")
@@ -0,0 +1,210 @@
+import html
+import os
+
+from util.history import (
+    REGRESSION_ALPHA,
+    REGRESSION_THRESHOLD,
+    get_machine_fingerprint,
+    is_real_input,
+    load_records,
+    mann_whitney_u,
+)
+from util.memory import format_bytes
+
+cur_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(cur_dir))
+DASHBOARD_PATH = os.path.join(root_dir, "benchmarks", "dashboard.html")
+
+# The dashboard is one static HTML file with the plots embedded as base64 PNGs, so it can be opened or shared
+# without a server. Everything comes from benchmarks/history.jsonl (--timeit runs) and optionally the JSON
+# of perf.py scaling.
+
+STYLE = """
+body { font-family: sans-serif; margin: 2em; color: #222; }
+table { border-collapse: collapse; margin-bottom: 2em; }
+th, td { border: 1px solid #ccc; padding: 4px 10px; text-align: right; }
+th { background: #f0f0f0; }
+.regression { color: #c00; font-weight: bold; }
+.improvement { color: #080; font-weight: bold; }
+img { max-width: 100%; }
+"""
+SUMMARY_COLUMNS = (
+    "Day",
+    "Part",
+    "Min (s)",
+    "Median (s)",
+    "p95 (s)",
+    "Peak",
+    "Commit",
+    "Commits",
+    "vs previous",
+    "Status",
+)
+
+
+def history_by_commit(records, machine):
+    """
+    {(day, part): [record, ...]} with the latest record per commit, in the order the commits were first
+    benchmarked.
+    """
+    series = {}
+    for record in records:
+        if record["machine"] != machine or not is_real_input(record):
+            continue
+        # dicts keep the insertion order, so the first run of a commit sets its position and the last one its values
+        series.setdefault((record["day"], record["part"]), {})[record["commit"]] = record
+    return {key: list(per_commit.values()) for key, per_commit in sorted(series.items())}
+
+
+def trend_status(history):
+    # latest commit against the one before, same rule as perf.py compare (see util/history.py)
+    if len(history) < 2:
+        return "-", None
+    base, cand = history[-2], history[-1]
+    ratio = cand["median"] / base["median"] if base["median"] > 0 else float("inf")
+    p_value = mann_whitney_u(base["samples_ns"], cand["samples_ns"])
+    if p_value < REGRESSION_ALPHA and ratio > 1 + REGRESSION_THRESHOLD:
+        return "regression", ratio
+    if p_value < REGRESSION_ALPHA and ratio < 1 - REGRESSION_THRESHOLD:
+        return "improvement", ratio
+    return "-", ratio
+
+
+def figure_to_html(fig):
+    import base64
+    import io
+
+    import matplotlib.pyplot as plt
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=100, bbox_inches="tight")
+    plt.close(fig)
+    return f'<img src="data:image/png;base64,{base64.b64encode(buffer.getvalue()).decode()}">'
+
+
+def plot_day_trend(day, histories):
+    # time (median with the min..p95 band) and peak memory over the commits, both parts in one figure
+    import matplotlib.pyplot as plt
+
+    has_memory = any(r.get("peak_bytes") is not None for history in histories.values() for r in history)
+    fig, axes = plt.subplots(1, 2 if has_memory else 1, figsize=(12 if has_memory else 7, 3.5), squeeze=False)
+    # one x position per commit, so both parts line up even if a commit only has one of them
+    commits = list(dict.fromkeys(r["commit"] for _, history in sorted(histories.items()) for r in history))
+    ax_time = axes[0][0]
+    for part, history in sorted(histories.items()):
+        x = [commits.index(r["commit"]) for r in history]
+        ax_time.plot(x, [r["median"] for r in history], marker="o", label=f"part {part} median")
+        ax_time.fill_between(x, [r["min"] for r in history], [r["p95"] for r in history], alpha=0.2)
+    for ax in axes[0]:
+        ax.set_xticks(range(len(commits)), [commit[:12] for commit in commits], rotation=45, ha="right")
+        ax.grid(alpha=0.3)
+    ax_time.set_title(f"Day {day}: time per commit (band: min..p95)")
+    ax_time.set_ylabel("seconds")
+    ax_time.legend(fontsize="small")
+
+    if has_memory:
+        ax_memory = axes[0][1]
+        for part, history in sorted(histories.items()):
+            points = [(commits.index(r["commit"]), r["peak_bytes"]) for r in history if r.get("peak_bytes") is not None]
+            ax_memory.plot(
+                [i for i, _ in points], [b / 1024 / 1024 for _, b in points], marker="o", label=f"part {part}"
+            )
+        ax_memory.set_title(f"Day {day}: peak memory per commit")
+        ax_memory.set_ylabel("MiB")
+        ax_memory.legend(fontsize="small")
+    return fig
+
+
+def plot_latest_stats(latest):
+    # min / median / p95 of the latest record per day and part side by side
+    import matplotlib.pyplot as plt
+
+    keys = sorted(latest)
+    width = 0.27
+    fig, ax = plt.subplots(figsize=(max(7, len(keys) * 0.6), 4))
+    for offset, stat in ((-width, "min"), (0, "median"), (width, "p95")):
+        ax.bar([i + offset for i in range(len(keys))], [latest[key][stat] for key in keys], width, label=stat)
+    ax.set_xticks(range(len(keys)), [f"{day}.{part}" for day, part in keys], rotation=90)
+    ax.set_yscale("log")
+    ax.set_ylabel("seconds (log)")
+    ax.set_xlabel("day.part")
+    ax.set_title("Latest benchmark: min / median / p95")
+    ax.grid(axis="y", alpha=0.3)
+    ax.legend(fontsize="small")
+    return fig
+
+
+def plot_scaling(scaling):
+    # perf.py scaling --json: {"<day>": {"<scale>": [seconds part 1, seconds part 2] or null}}
+    import matplotlib.pyplot as plt
+
+    fig, axes = plt.subplots(1, 2, figsize=(12, 4.5), sharey=True)
+    for part, ax in enumerate(axes):
+        for day, results in sorted(scaling.items(), key=lambda item: int(item[0])):
+            points = sorted((int(scale), times[part]) for scale, times in results.items() if times)
+            points = [(scale, seconds) for scale, seconds in points if seconds > 0]
+            if points:
+                ax.plot(*zip(*points), marker="o", label=f"day {day}")
+        ax.set_xscale("log")
+        ax.set_yscale("log")
+        ax.set_xlabel("input scale")
+        ax.set_title(f"Part {part + 1} on generated inputs")
+        ax.grid(alpha=0.3, which="both")
+    axes[0].set_ylabel("seconds (median)")
+    axes[1].legend(fontsize="small", ncol=2)
+    return fig
+
+
+def summary_table(series):
+    rows = []
+    for (day, part), history in series.items():
+        latest = history[-1]
+        status, ratio = trend_status(history)
+        ratio_text = "-" if ratio is None else f"{ratio:.3f}"
+        rows.append(
+            f"<tr><td>{day}</td><td>{part}</td><td>{latest['min']:.6f}</td><td>{latest['median']:.6f}</td>"
+            f"<td>{latest['p95']:.6f}</td><td>{format_bytes(latest.get('peak_bytes'))}</td>"
+            f"<td>{html.escape(latest['commit'])}</td><td>{len(history)}</td><td>{ratio_text}</td>"
+            f'<td class="{status}">{status}</td></tr>'
+        )
+    header = "".join(f"<th>{column}</th>" for column in SUMMARY_COLUMNS)
+    return f"<table><tr>{header}</tr>{''.join(rows)}</table>"
+
+
+def render_dashboard(output_path=DASHBOARD_PATH, scaling=None, machine=None, records=None):
+    """
+    Writes the dashboard of this machine (or the given fingerprint) to output_path: summary table with the
+    latest min/median/p95 and the change to the previous commit, min/median/p95 of all days side by side,
+    scaling curves (if the JSON of perf.py scaling is given) and the time and memory trend of every day.
+    Returns the number of day/part series.
+    """
+    import matplotlib
+
+    # no display needed, the plots only go to PNG
+    matplotlib.use("Agg")
+
+    machine = machine or get_machine_fingerprint()
+    series = history_by_commit(load_records() if records is None else records, machine)
+
+    sections = [f"<h1>Advent of Code 2024 benchmarks</h1><p>Machine {html.escape(machine)}</p>"]
+    if series:
+        sections.append("<h2>Latest results</h2>" + summary_table(series))
+        latest = {key: history[-1] for key, history in series.items()}
+        sections.append("<h2>Min / median / p95</h2>" + figure_to_html(plot_latest_stats(latest)))
+    else:
+        sections.append("<p>No benchmark results for this machine yet, run a solution with --timeit 1.</p>")
+    if scaling:
+        sections.append("<h2>Scaling on generated inputs</h2>" + figure_to_html(plot_scaling(scaling)))
+
+    days = sorted({day for day, _ in series})
+    if days:
+        sections.append("<h2>Trends per day</h2>")
+    for day in days:
+        histories = {part: history for (d, part), history in series.items() if d == day}
+        sections.append(f"<h3>Day {day}</h3>" + figure_to_html(plot_day_trend(day, histories)))
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as file:
+        file.write("<!DOCTYPE html><html><head><meta charset='utf-8'><title>AoC 2024 benchmarks</title>")
+        file.write(f"<style>{STYLE}</style></head><body>{''.join(sections)}</body></html>\n")
+    return len(series)
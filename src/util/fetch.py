@@ -0,0 +1,121 @@
+import hashlib
+import json
+import os
+import threading
+
+cur_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(cur_dir))
+HTTP_CACHE_PATH = os.path.join(root_dir, ".cache", "http")
+
+# The AoC server asks automated tools to identify themselves
+USER_AGENT = "github.com/Gabriel9753/Advent-of-Code-2024 input fetcher"
+# connections kept open to the server, also the number of fetch threads
+POOL_SIZE = 8
+TIMEOUT = 30
+
+# Every response with status 200 is stored as <key>.body (the text) and <key>.json (url, ETag, Last-Modified).
+# The next request for the url sends If-None-Match / If-Modified-Since and a 304 is answered from the cache,
+# offline everything is answered from the cache. The key hashes the url and the session cookie, the inputs
+# are different per account.
+
+
+def make_session(aoc_session=None, pool_size=POOL_SIZE):
+    # one requests.Session for all threads, its connection pool keeps the TLS connections to the server alive
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    if aoc_session:
+        session.headers["Cookie"] = f"session={aoc_session}"
+    return session
+
+
+def cache_files(url, aoc_session=None, cache_dir=HTTP_CACHE_PATH):
+    account = hashlib.sha256((aoc_session or "").encode()).hexdigest()
+    key = hashlib.sha256(f"{url}|{account}".encode()).hexdigest()[:32]
+    base = os.path.join(cache_dir, key)
+    return base + ".body", base + ".json"
+
+
+def load_cached(url, aoc_session=None, cache_dir=HTTP_CACHE_PATH):
+    # (meta, text) of the stored response, None if there is none
+    body_path, meta_path = cache_files(url, aoc_session, cache_dir)
+    try:
+        with open(meta_path, encoding="utf-8") as file:
+            meta = json.load(file)
+        with open(body_path, encoding="utf-8") as file:
+            return meta, file.read()
+    except (OSError, ValueError):
+        return None
+
+
+def store_cached(url, response, aoc_session=None, cache_dir=HTTP_CACHE_PATH):
+    body_path, meta_path = cache_files(url, aoc_session, cache_dir)
+    os.makedirs(cache_dir, exist_ok=True)
+    meta = {
+        "url": url,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    }
+    # body first, the meta file marks a complete entry (threads and interrupted runs never see half of one)
+    for path, text in ((body_path, response.text), (meta_path, json.dumps(meta))):
+        # per process and thread, the fetch threads of one process can store the same url
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            file.write(text)
+        os.replace(tmp_path, path)
+
+
+def fetch(session, url, aoc_session=None, offline=False, cache_dir=HTTP_CACHE_PATH, timeout=TIMEOUT):
+    """
+    GET url through the on-disk cache. Returns {"url", "status", "text", "source"}: source is "network",
+    "not modified" (304, text from the cache), "cache" (offline, or the server could not be reached) or
+    "missing" (offline without a cached response). status is None if there was no response at all.
+    """
+    import requests
+
+    cached = load_cached(url, aoc_session, cache_dir)
+    if offline:
+        if cached is None:
+            return {"url": url, "status": None, "text": None, "source": "missing"}
+        return {"url": url, "status": 200, "text": cached[1], "source": "cache"}
+
+    headers = {}
+    if cached is not None:
+        meta = cached[0]
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+    try:
+        response = session.get(url, headers=headers, timeout=timeout)
+    except requests.RequestException as e:
+        if cached is None:
+            return {"url": url, "status": None, "text": None, "source": f"error: {e}"}
+        return {"url": url, "status": 200, "text": cached[1], "source": "cache"}
+
+    if response.status_code == 304 and cached is not None:
+        return {"url": url, "status": 200, "text": cached[1], "source": "not modified"}
+    if response.status_code == 200:
+        store_cached(url, response, aoc_session, cache_dir)
+        return {"url": url, "status": 200, "text": response.text, "source": "network"}
+    return {"url": url, "status": response.status_code, "text": None, "source": "network"}
+
+
+def fetch_all(urls, aoc_session=None, offline=False, workers=POOL_SIZE, cache_dir=HTTP_CACHE_PATH):
+    """
+    Fetches all urls concurrently through one pooled session, returns {url: result of fetch}.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    session = make_session(aoc_session, workers)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(lambda url: fetch(session, url, aoc_session, offline, cache_dir), urls)
+            return dict(zip(urls, results))
+    finally:
+        session.close()
@@ -0,0 +1,34 @@
+import os
+import random
+
+from util.gen.days import GENERATORS
+
+SCALES = (1, 10, 100, 1000)
+
+
+def generate(day, scale=1, seed=0):
+    """
+    Synthetic input for a day, scale times the size of a real input. The same (day, scale, seed) always gives
+    the same input. Returns (input text, constants), constants being module constants the solution needs
+    patched to read the input (e.g. the map size of day 18), see set_constants.
+    """
+    if day not in GENERATORS:
+        raise ValueError(f"No input generator for day {day}")
+    # seeded per day and scale, so the inputs do not depend on which other days/scales were generated
+    rnd = random.Random(f"{day}-{scale}-{seed}")
+    return GENERATORS[day](scale, rnd)
+
+
+def set_constants(module, constants):
+    for name, value in constants.items():
+        if not hasattr(module, name):
+            raise AttributeError(f"{module.__name__} has no constant {name}")
+        setattr(module, name, value)
+
+
+def write_input(day, path, scale=1, seed=0):
+    text, constants = generate(day, scale, seed)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(text)
+    return constants
@@ -0,0 +1,321 @@
+import math
+import string
+
+# One generator per day: generator(scale, rnd) -> (input text, module constants). Scale 1 is about the size of a
+# real puzzle input, scale 10 has ten times the lines / cells / moves. Most days read everything from the input,
+# the constants are for the days with the map size hardcoded in the solution (day 14 and 18).
+
+
+def scaled_side(side, scale):
+    # side length of a square map with scale times the cells
+    return max(2, round(side * math.sqrt(scale)))
+
+
+def grid_to_text(rows):
+    return "\n".join("".join(row) for row in rows)
+
+
+def day01(scale, rnd):
+    lines = (f"{rnd.randint(10000, 99999)}   {rnd.randint(10000, 99999)}" for _ in range(1000 * scale))
+    return "\n".join(lines), {}
+
+
+def day02(scale, rnd):
+    reports = []
+    for _ in range(1000 * scale):
+        # mostly monotone reports with small steps, so there are safe, unsafe and "safe after removal" ones
+        sign = rnd.choice((-1, 1))
+        levels = [rnd.randint(10, 90)]
+        for _ in range(rnd.randint(4, 7)):
+            levels.append(levels[-1] + sign * rnd.choice((1, 1, 2, 3, 3, 4, 0)))
+        if rnd.random() < 0.2:
+            levels[rnd.randrange(len(levels))] = rnd.randint(1, 99)
+        reports.append(" ".join(map(str, levels)))
+    return "\n".join(reports), {}
+
+
+def day03(scale, rnd):
+    tokens = []
+    for _ in range(1000 * scale):
+        r = rnd.random()
+        if r < 0.55:
+            tokens.append(f"mul({rnd.randint(1, 999)},{rnd.randint(1, 999)})")
+        elif r < 0.6:
+            tokens.append("do()")
+        elif r < 0.65:
+            tokens.append("don't()")
+        else:
+            # corrupted instructions and noise
+            tokens.append(rnd.choice(("mul(4*", "mul[3,7]", "mul ( 2 , 4 )", "?(12,34)", "do_not_mul(5,5)")))
+        tokens.append("".join(rnd.choices("!@#$%^&*()[]{}<>,;:'-+ whymulfrom", k=rnd.randint(0, 8))))
+    return "".join(tokens), {}
+
+
+def day04(scale, rnd):
+    side = scaled_side(140, scale)
+    return grid_to_text(rnd.choices("XMAS", k=side) for _ in range(side)), {}
+
+
+def day05(scale, rnd):
+    # every pair of pages has a rule (like the real input), so there always is one valid order
+    pages = rnd.sample(range(10, 100), 49)
+    rules = [f"{a}|{b}" for i, a in enumerate(pages) for b in pages[i + 1 :]]
+    rnd.shuffle(rules)
+    updates = []
+    for _ in range(200 * scale):
+        update = rnd.sample(pages, rnd.choice(range(5, 24, 2)))
+        if rnd.random() < 0.5:
+            update.sort(key=pages.index)
+        updates.append(",".join(map(str, update)))
+    return "\n".join(rules) + "\n\n" + "\n".join(updates), {}
+
+
+def guard_leaves_map(rows, x, y):
+    # the day 6 solution needs a guard that walks off the map at some point
+    width, height = len(rows[0]), len(rows)
+    direction = 0
+    deltas = ((0, -1), (1, 0), (0, 1), (-1, 0))
+    seen = set()
+    while True:
+        if (x, y, direction) in seen:
+            return False
+        seen.add((x, y, direction))
+        new_x, new_y = x + deltas[direction][0], y + deltas[direction][1]
+        if not (0 <= new_x < width and 0 <= new_y < height):
+            return True
+        if rows[new_y][new_x] == "#":
+            direction = (direction + 1) % 4
+        else:
+            x, y = new_x, new_y
+
+
+def day06(scale, rnd):
+    side = scaled_side(130, scale)
+    while True:
+        rows = [["#" if rnd.random() < 0.05 else "." for _ in range(side)] for _ in range(side)]
+        x, y = rnd.randrange(side), rnd.randrange(side)
+        rows[y][x] = "^"
+        if guard_leaves_map(rows, x, y):
+            return grid_to_text(rows), {}
+
+
+def day07(scale, rnd):
+    lines = []
+    for _ in range(850 * scale):
+        numbers = [rnd.randint(1, 999) for _ in range(rnd.randint(3, 12))]
+        if rnd.random() < 0.5:
+            # solvable with +, * and ||
+            result = numbers[0]
+            for n in numbers[1:]:
+                result = rnd.choice((result + n, result * n, int(f"{result}{n}")))
+        else:
+            result = rnd.randint(1, 10 ** rnd.randint(3, 15))
+        lines.append(f"{result}: {' '.join(map(str, numbers))}")
+    return "\n".join(lines), {}
+
+
+def day08(scale, rnd):
+    side = scaled_side(50, scale)
+    rows = [["."] * side for _ in range(side)]
+    frequencies = string.digits + string.ascii_letters
+    for _ in range(200 * scale):
+        rows[rnd.randrange(side)][rnd.randrange(side)] = rnd.choice(frequencies)
+    return grid_to_text(rows), {}
+
+
+def day09(scale, rnd):
+    # file and free space lengths alternate and the map starts and ends with a file
+    digits = [str(rnd.randint(1, 9)) if i % 2 == 0 else str(rnd.randint(0, 9)) for i in range(20000 * scale - 1)]
+    return "".join(digits), {}
+
+
+def day10(scale, rnd):
+    # height goes up by one to the right and down (so there are lots of trails), with some random cells in between
+    side = scaled_side(45, scale)
+    rows = [
+        [rnd.choice("0123456789.") if rnd.random() < 0.15 else str((x + y) % 10) for x in range(side)]
+        for y in range(side)
+    ]
+    return grid_to_text(rows), {}
+
+
+def day11(scale, rnd):
+    return " ".join(str(rnd.randint(0, 10**6)) for _ in range(8 * scale)), {}
+
+
+def day12(scale, rnd):
+    # regions: random plants on a coarse grid scaled up, with some noise
+    side = scaled_side(140, scale)
+    coarse = [[rnd.choice(string.ascii_uppercase) for _ in range(side // 4 + 1)] for _ in range(side // 4 + 1)]
+    rows = []
+    for y in range(side):
+        row = []
+        for x in range(side):
+            row.append(rnd.choice(string.ascii_uppercase) if rnd.random() < 0.05 else coarse[y // 4][x // 4])
+        rows.append(row)
+    return grid_to_text(rows), {}
+
+
+def day13(scale, rnd):
+    machines = []
+    while len(machines) < 320 * scale:
+        ax, ay, bx, by = (rnd.randint(10, 99) for _ in range(4))
+        if ax * by - ay * bx == 0:
+            # the solution inverts the button matrix
+            continue
+        r = rnd.random()
+        if r < 0.33:
+            a, b = rnd.randint(1, 100), rnd.randint(1, 100)
+            prize_x, prize_y = a * ax + b * bx, a * ay + b * by
+        elif r < 0.66:
+            # solvable for task 2: round the (real valued) presses for a prize at 10000000000000 + ~10000
+            target = 10000000000000 + rnd.randint(5000, 15000)
+            det = ax * by - ay * bx
+            a = round((target * by - target * bx) / det)
+            b = round((ax * target - ay * target) / det)
+            if a < 0 or b < 0:
+                continue
+            prize_x, prize_y = a * ax + b * bx - 10000000000000, a * ay + b * by - 10000000000000
+            if prize_x <= 0 or prize_y <= 0:
+                continue
+        else:
+            prize_x, prize_y = rnd.randint(1000, 20000), rnd.randint(1000, 20000)
+        machines.append(f"Button A: X+{ax}, Y+{ay}\nButton B: X+{bx}, Y+{by}\nPrize: X={prize_x}, Y={prize_y}")
+    return "\n\n".join(machines), {}
+
+
+def day14(scale, rnd):
+    # the map size stays (task 2 depends on it), only the number of robots grows. Some of the robots meet in
+    # a filled square at one time step (the "tree" task 2 is looking for)
+    width, height = 101, 103
+    t = rnd.randrange(1000, 7000)
+    side = min(math.isqrt(500 * scale // 3), 60)
+    robots = []
+    for i in range(500 * scale):
+        dx, dy = rnd.randint(-99, 99), rnd.randint(-99, 99)
+        if i < side * side:
+            # start where the robot has to be to reach its cell of the square at time t
+            x, y = 20 + i % side, 20 + i // side
+            robots.append(f"p={(x - t * dx) % width},{(y - t * dy) % height} v={dx},{dy}")
+        else:
+            robots.append(f"p={rnd.randrange(width)},{rnd.randrange(height)} v={dx},{dy}")
+    rnd.shuffle(robots)
+    return "\n".join(robots), {"MAP_WIDTH": width, "MAP_HEIGHT": height}
+
+
+def day15(scale, rnd):
+    side = scaled_side(50, scale)
+    rows = []
+    for y in range(side):
+        row = []
+        for x in range(side):
+            if x in (0, side - 1) or y in (0, side - 1):
+                row.append("#")
+            else:
+                r = rnd.random()
+                row.append("#" if r < 0.05 else "O" if r < 0.4 else ".")
+        rows.append(row)
+    rows[rnd.randrange(1, side - 1)][rnd.randrange(1, side - 1)] = "@"
+    moves = "".join(rnd.choices("<>^v", k=20000 * scale))
+    moves = "\n".join(moves[i : i + 1000] for i in range(0, len(moves), 1000))
+    return grid_to_text(rows) + "\n\n" + moves, {}
+
+
+def day16(scale, rnd):
+    # maze from a randomized depth first search (odd side, cells at odd coordinates), then some walls are
+    # removed so there are multiple (equally good) paths
+    side = scaled_side(141, scale) // 2 * 2 + 1
+    rows = [["#"] * side for _ in range(side)]
+    rows[side - 2][1] = "."
+    stack = [(1, side - 2)]
+    while stack:
+        x, y = stack[-1]
+        options = [
+            (x + dx, y + dy)
+            for dx, dy in ((2, 0), (-2, 0), (0, 2), (0, -2))
+            if 0 < x + dx < side - 1 and 0 < y + dy < side - 1 and rows[y + dy][x + dx] == "#"
+        ]
+        if not options:
+            stack.pop()
+            continue
+        new_x, new_y = rnd.choice(options)
+        rows[(y + new_y) // 2][(x + new_x) // 2] = "."
+        rows[new_y][new_x] = "."
+        stack.append((new_x, new_y))
+    for _ in range(side * side // 30):
+        x, y = rnd.randrange(1, side - 1), rnd.randrange(1, side - 1)
+        rows[y][x] = "."
+    rows[side - 2][1] = "S"
+    rows[1][side - 2] = "E"
+    return grid_to_text(rows), {}
+
+
+def day17_outputs(a, k1, k2):
+    # the program generated by day17 as plain python
+    out = []
+    while True:
+        b = a % 8 ^ k1
+        out.append((b ^ k2 ^ (a >> b)) % 8)
+        a >>= 3
+        if a == 0:
+            return out
+
+
+def day17_has_quine(program, k1, k2):
+    # build A three bits at a time from the last output to the first
+    candidates = [0]
+    for i in range(len(program) - 1, -1, -1):
+        candidates = [
+            a * 8 + bits
+            for a in candidates
+            for bits in range(8)
+            if a * 8 + bits > 0 and day17_outputs(a * 8 + bits, k1, k2) == program[i:]
+        ]
+    return bool(candidates)
+
+
+def day17(scale, rnd):
+    # the real programs all look like this (bst, bxl, cdv, bxl, bxc, out, adv 3, jnz), task 2 only works if
+    # there is an A that outputs the program. Scale changes the size of register A (the run length of task 1)
+    while True:
+        k1, k2 = rnd.randrange(8), rnd.randrange(8)
+        program = [2, 4, 1, k1, 7, 5, 1, k2, 4, rnd.randrange(8), 5, 5, 0, 3, 3, 0]
+        if day17_has_quine(program, k1, k2):
+            break
+    digits = 16 * scale
+    a = rnd.randrange(8 ** (digits - 1), 8**digits)
+    text = f"Register A: {a}\nRegister B: 0\nRegister C: 0\n\nProgram: {','.join(map(str, program))}"
+    return text, {}
+
+
+def day18(scale, rnd):
+    # every cell except start, end and their neighbours falls at some point, so the path is always blocked
+    # in the end (and not just by closing in one of the corners)
+    side = scaled_side(71, scale)
+    free = {(0, 0), (1, 0), (0, 1), (side - 1, side - 1), (side - 2, side - 1), (side - 1, side - 2)}
+    cells = [(x, y) for y in range(side) for x in range(side) if (x, y) not in free]
+    rnd.shuffle(cells)
+    text = "\n".join(f"{x},{y}" for x, y in cells)
+    return text, {"WIDTH": side, "HEIGHT": side, "T": 1024 * scale}
+
+
+GENERATORS = {
+    1: day01,
+    2: day02,
+    3: day03,
+    4: day04,
+    5: day05,
+    6: day06,
+    7: day07,
+    8: day08,
+    9: day09,
+    10: day10,
+    11: day11,
+    12: day12,
+    13: day13,
+    14: day14,
+    15: day15,
+    16: day16,
+    17: day17,
+    18: day18,
+}
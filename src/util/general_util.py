@@ -1,12 +1,19 @@
+import contextlib
+import functools
 import os
 import re
 import sys
 import time
 
+from util import counters, memory, profiling
+
 cur_dir = os.path.dirname(os.path.abspath(__file__))
 # full path to the parent directory
 readme_dir = os.path.dirname(os.path.dirname(cur_dir))
 README_PATH = os.path.join(readme_dir, "README.md")
+INPUT_CACHE_PATH = os.path.join(readme_dir, ".cache", "inputs")
+# bytes per read of the chunked input readers
+CHUNK_SIZE = 1 << 20
 
 
 # Timer decorator to measure the execution time of a function
@@ -19,11 +26,23 @@ def timer(return_time=False):
     """
 
     def decorator(func):
+        @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            start_time = time.time()
-            result = func(*args, **kwargs)
-            end_time = time.time()
-            execution_time = end_time - start_time
+            call = func
+            if profiling.is_enabled():
+                call = functools.partial(profiling.profile_call, call)
+            if memory.is_enabled():
+                call = functools.partial(memory.track_call, func.__name__, call)
+
+            if counters.is_enabled():
+                counters.reset()
+
+            start_time = time.perf_counter_ns()
+            result = call(*args, **kwargs)
+            end_time = time.perf_counter_ns()
+            if counters.is_enabled():
+                counters.last_results[func.__name__] = counters.snapshot()
+            execution_time = (end_time - start_time) / 1e9
             if return_time:
                 return result, execution_time
             else:
@@ -47,15 +66,173 @@ def load_input(input_file_path):
         sys.exit(1)
 
 
-def average_time(runs, func, *args, **kwargs):
-    total_time = 0
-    for _ in range(runs):
-        _, time = func(*args, **kwargs)
-        total_time += time
-    return total_time / runs
+def check_input_file(input_file_path):
+    if not os.path.isfile(input_file_path):
+        print(f"Error: Input file not found ({input_file_path})")
+        sys.exit(1)
+
+
+def iter_lines(input_file_path):
+    """
+    Lazy line iterator (constant memory). Yields the lines of load_input(...).splitlines(), blank lines at
+    the start and end of the file are skipped like load_input strips them.
+    """
+    check_input_file(input_file_path)
+    started = False
+    blank_lines = []
+    with open(input_file_path, "r", encoding="utf-8") as input_file:
+        for line in input_file:
+            line = line.rstrip("\r\n")
+            if not line.strip():
+                # only passed on if a non blank line follows
+                if started:
+                    blank_lines.append(line)
+                continue
+            yield from blank_lines
+            blank_lines.clear()
+            started = True
+            yield line
+
+
+@contextlib.contextmanager
+def map_input(input_file_path):
+    """
+    Read only memory map of the input file. It is bytes-like (slicing, find, bytes regex, numpy.frombuffer)
+    and paged in by the OS on access instead of being read into memory. Views on it (e.g. numpy arrays) must
+    not outlive the with block.
+    """
+    import mmap
+
+    check_input_file(input_file_path)
+    with open(input_file_path, "rb") as input_file:
+        if os.fstat(input_file.fileno()).st_size == 0:
+            # empty files can not be mapped
+            yield b""
+            return
+        with mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def iter_chunks(input_file_path, chunk_size=CHUNK_SIZE, separator=b"\n"):
+    """
+    Reads the file in binary chunks of about chunk_size bytes that always end right after a separator, so
+    no line (or record, e.g. separator=b"\n\n") is split between two chunks. The last chunk is the rest.
+    Windows line endings are turned into "\n", so the separators match on files with "\r\n" as well.
+    """
+    check_input_file(input_file_path)
+    separator = separator.replace(b"\r\n", b"\n")
+    rest = b""
+    with open(input_file_path, "rb") as input_file:
+        while data := input_file.read(chunk_size):
+            data = data.replace(b"\r\n", b"\n")
+            if rest.endswith(b"\r") and data.startswith(b"\n"):
+                # "\r\n" split between the previous and this read
+                rest = rest[:-1]
+            # the separator can also be split between the previous and this read
+            data = rest + data
+            cut = data.rfind(separator)
+            if cut == -1:
+                rest = data
+                continue
+            cut += len(separator)
+            rest = data[cut:]
+            yield data[:cut]
+    if rest:
+        yield rest
+
+
+def iter_records(input_file_path, separator="\n", chunk_size=CHUNK_SIZE):
+    # records (lines by default) of the file, stripped and without empty ones
+    separator = separator.replace("\r\n", "\n")
+    for chunk in iter_chunks(input_file_path, chunk_size, separator.encode()):
+        for record in chunk.decode("utf-8").split(separator):
+            record = record.strip()
+            if record:
+                yield record
 
 
-def write_times_to_readme(day, time_task1, time_task2):
+class InputStream:
+    """
+    Re-iterable lazy view on an input file: every iteration reads the file again in chunks and yields
+    parse(record) for each record (line by default). Tasks that just loop over their input can get an
+    InputStream instead of a list and run in constant memory.
+    Instead of parse, parse_chunk can turn a whole chunk (bytes that end with a separator) into its records
+    at once, e.g. with the bulk parsers of util.parse.
+    """
+
+    def __init__(self, input_file_path, parse=None, separator="\n", chunk_size=CHUNK_SIZE, parse_chunk=None):
+        check_input_file(input_file_path)
+        self.input_file_path = input_file_path
+        self.parse = parse
+        self.separator = separator
+        self.chunk_size = chunk_size
+        self.parse_chunk = parse_chunk
+
+    def __iter__(self):
+        if self.parse_chunk is not None:
+            for chunk in iter_chunks(self.input_file_path, self.chunk_size, self.separator.encode()):
+                yield from self.parse_chunk(chunk)
+            return
+        for record in iter_records(self.input_file_path, self.separator, self.chunk_size):
+            yield self.parse(record) if self.parse is not None else record
+
+
+def get_source_hash(func):
+    import hashlib
+    import inspect
+
+    from util.results import util_dependencies
+
+    # hash of the whole file the function is defined in, so helper functions are covered as well, and of every
+    # util module it imports (e.g. a change to util.parse or util.grid changes the parsed input)
+    source_file = inspect.getsourcefile(inspect.unwrap(func))
+    digest = hashlib.sha256()
+    for path in [source_file] + util_dependencies(source_file):
+        with open(path, "rb") as file:
+            digest.update(hashlib.sha256(file.read()).digest())
+    return digest.hexdigest()
+
+
+def preprocess_cached(preprocess_func, input_data, cache_dir=INPUT_CACHE_PATH):
+    """
+    Drop-in for preprocess_input(input_data): returns (day_input, seconds), but the preprocessed input is
+    stored as pickle (protocol 5) keyed on the hash of the input, of the solution source and of the util modules
+    it imports. The next run with the same input and source loads the pickle instead of parsing again.
+    """
+    import hashlib
+    import pickle
+    import platform
+
+    key = hashlib.sha256()
+    key.update(input_data.encode())
+    key.update(get_source_hash(preprocess_func).encode())
+    key.update(platform.python_version().encode())
+    cache_path = os.path.join(cache_dir, f"{preprocess_func.__name__}_{key.hexdigest()[:32]}.pkl")
+
+    if os.path.exists(cache_path):
+        start_time = time.perf_counter_ns()
+        try:
+            with open(cache_path, "rb") as file:
+                day_input = pickle.load(file)
+            return day_input, (time.perf_counter_ns() - start_time) / 1e9
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            # broken or outdated cache file, just parse again
+            pass
+
+    day_input, execution_time = preprocess_func(input_data)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # write to a temporary file first, other processes could read the cache at the same time
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as file:
+            pickle.dump(day_input, file, protocol=5)
+        os.replace(tmp_path, cache_path)
+    except (OSError, pickle.PicklingError, AttributeError, TypeError) as e:
+        print(f"Warning: Could not cache the preprocessed input: {e}")
+    return day_input, execution_time
+
+
+def write_times_to_readme(day, time_task1, time_task2, peak_task1=None, peak_task2=None):
     if not os.path.exists(README_PATH):
         print(f"Error: README file not found ({README_PATH})")
         sys.exit(1)
@@ -77,15 +254,20 @@ def write_times_to_readme(day, time_task1, time_task2):
 
     # Construct the regex pattern to find the correct day
     day_pattern = re.compile(
-        rf"^\|\s*\[{day}\]\(.*day_{day}/solution\.py\)\s*\|\s*([\d.-]+|-)\s*\|\s*([\d.-]+|-)\s*\|$"
+        rf"^\|\s*\[{int(day)}\]\(.*day_{int(day):02d}/solution\.py\)\s*\|\s*([\d.-]+|-)\s*\|\s*([\d.-]+|-)\s*\|"
+        rf"(\s*([\d.-]+|-)\s*\|\s*([\d.-]+|-)\s*\|)?$"
     )
 
+    # peak memory in MiB, "-" if not measured
+    peak_task1 = f"{peak_task1 / 2**20:.3f}" if peak_task1 is not None else "-"
+    peak_task2 = f"{peak_task2 / 2**20:.3f}" if peak_task2 is not None else "-"
+
     updated = False
     for i, line in enumerate(lines):
         if day_pattern.match(line):
             lines[i] = (
                 f"| [{day}]({base_url}/day_{int(day):02d}/solution.py)   "
-                f"| {time_task1:.6f}      | {time_task2:.6f}      |\n"
+                f"| {time_task1:.6f}      | {time_task2:.6f}      | {peak_task1}      | {peak_task2}      |\n"
             )
             updated = True
             break
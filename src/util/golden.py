@@ -0,0 +1,92 @@
+import hashlib
+import json
+import os
+
+cur_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(cur_dir))
+GOLDEN_PATH = os.path.join(root_dir, "benchmarks", "golden.json")
+BUDGETS_PATH = os.path.join(root_dir, "benchmarks", "budgets.json")
+
+# recorded budgets never go below this, tiny tasks are mostly noise
+MIN_TIME_BUDGET = 0.05
+MIN_MEMORY_BUDGET = 1024 * 1024
+
+# constants of the solutions that are sized for the real input, set for the example inputs
+EXAMPLE_CONSTANTS = {
+    14: {"MAP_WIDTH": 11, "MAP_HEIGHT": 7},
+    18: {"WIDTH": 7, "HEIGHT": 7, "T": 12},
+}
+
+# golden.json: {"<day>": {"example" | "input": {"sha256": ..., "task1": ..., "task2": ...}}}
+# The answers are stored as strings (str() of whatever the task returns) and the input hash tells apart a
+# wrong answer and a different input (e.g. the real input of another account).
+# budgets.json: {"<day>": {"task1": {"time": seconds, "peak_bytes": bytes}, "task2": {...}}}, the budgets are
+# for the real input (the examples are too small to say anything)
+
+
+def hash_input(text):
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def load_json(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def save_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def check_answers(report, kind, input_hash, golden):
+    """
+    Compares the answers of a run_day report with the golden answers of that day and kind ("example" or
+    "input"). Returns a list of problems, an input without recorded answers is one as well.
+    """
+    expected = golden.get(str(report["day"]), {}).get(kind)
+    if expected is None:
+        return ["no golden answers"]
+    if expected["sha256"] != input_hash:
+        return ["input differs from the recorded one"]
+    problems = []
+    for task in ("task1", "task2"):
+        answer = str(report[task]["answer"])
+        if answer != expected[task]:
+            problems.append(f"{task}: {answer} != {expected[task]}")
+    return problems
+
+
+def record_answers(report, kind, input_hash, golden):
+    golden.setdefault(str(report["day"]), {})[kind] = {
+        "sha256": input_hash,
+        "task1": str(report["task1"]["answer"]),
+        "task2": str(report["task2"]["answer"]),
+    }
+
+
+def check_budgets(report, budgets):
+    # needs a report with memory tracking (run_day(..., track_memory=True))
+    problems = []
+    for task, budget in budgets.get(str(report["day"]), {}).items():
+        measured = report[task]
+        if "time" in budget and measured["time"] > budget["time"]:
+            problems.append(f"{task}: {measured['time']:.3f} s > {budget['time']:.3f} s")
+        peak = (measured.get("memory") or {}).get("peak_bytes")
+        if "peak_bytes" in budget and peak is not None and peak > budget["peak_bytes"]:
+            problems.append(f"{task}: peak {peak} B > {budget['peak_bytes']} B")
+    return problems
+
+
+def record_budgets(report, budgets, factor):
+    # budget = factor * measured, so normal noise does not fail the check
+    day_budgets = budgets.setdefault(str(report["day"]), {})
+    for task in ("task1", "task2"):
+        measured = report[task]
+        budget = {"time": round(max(measured["time"] * factor, MIN_TIME_BUDGET), 4)}
+        if measured.get("memory"):
+            budget["peak_bytes"] = int(max(measured["memory"]["peak_bytes"] * factor, MIN_MEMORY_BUDGET))
+        day_budgets[task] = budget
@@ -0,0 +1,122 @@
+NORTH, EAST, SOUTH, WEST = 0, 1, 2, 3
+# (dx, dy) per direction, clockwise starting at north (turning right is (d + 1) % 4)
+DIRECTION_DELTAS = ((0, -1), (1, 0), (0, 1), (-1, 0))
+
+
+class Grid:
+    """
+    2d map stored row by row in a flat bytearray, cells are addressed by the integer index y * width + x.
+    Values are bytes, so compare with ord("#") etc. (or use the char helpers).
+    """
+
+    __slots__ = ("_step_table", "cells", "height", "offsets", "width")
+
+    def __init__(self, width, height, cells=None, fill="."):
+        self.width = width
+        self.height = height
+        self.cells = bytearray(cells) if cells is not None else bytearray(fill.encode() * (width * height))
+        if len(self.cells) != width * height:
+            raise ValueError(f"Expected {width * height} cells, got {len(self.cells)}")
+        # index offsets for north, east, south, west (no bounds check!)
+        self.offsets = (-width, 1, width, -1)
+        self._step_table = None
+
+    @classmethod
+    def from_text(cls, text):
+        lines = text.strip().splitlines()
+        width = len(lines[0])
+        if any(len(line) != width for line in lines):
+            raise ValueError("All lines of the grid need the same length")
+        return cls(width, len(lines), "".join(lines).encode())
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __getitem__(self, i):
+        return self.cells[i]
+
+    def __setitem__(self, i, value):
+        self.cells[i] = ord(value) if isinstance(value, str) else value
+
+    def __str__(self):
+        text = self.cells.decode()
+        return "\n".join(text[y * self.width : (y + 1) * self.width] for y in range(self.height))
+
+    def copy(self):
+        grid = Grid(self.width, self.height, self.cells)
+        grid._step_table = self._step_table
+        return grid
+
+    def padded(self, char, size=1):
+        """
+        New grid with a border of size cells filled with char around this one. Cell (x, y) of this grid is
+        (x + size, y + size) in the padded one, so walking up to size steps off the map needs no bounds check.
+        """
+        width = self.width + 2 * size
+        grid = Grid(width, self.height + 2 * size, fill=char)
+        for y in range(self.height):
+            start = (y + size) * width + size
+            grid.cells[start : start + self.width] = self.cells[y * self.width : (y + 1) * self.width]
+        return grid
+
+    def index(self, x, y):
+        return y * self.width + x
+
+    def coords(self, i):
+        y, x = divmod(i, self.width)
+        return x, y
+
+    def in_bounds(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def char(self, i):
+        return chr(self.cells[i])
+
+    def find(self, char):
+        # first index of char, -1 if not found
+        return self.cells.find(char.encode())
+
+    def find_all(self, char):
+        value = ord(char)
+        return [i for i, v in enumerate(self.cells) if v == value]
+
+    def neighbours(self, i):
+        # in bounds neighbours in the order north, east, south, west
+        width = self.width
+        x = i % width
+        result = []
+        if i >= width:
+            result.append(i - width)
+        if x + 1 < width:
+            result.append(i + 1)
+        if i + width < len(self.cells):
+            result.append(i + width)
+        if x > 0:
+            result.append(i - 1)
+        return result
+
+    def step_table(self):
+        """
+        Precomputed moves: step_table()[direction][i] is the index of the neighbour of i in that direction
+        or -1 if it would leave the grid. Built once per grid size and shared by copies.
+        """
+        if self._step_table is None:
+            width, size = self.width, len(self.cells)
+            north = [i - width if i >= width else -1 for i in range(size)]
+            east = [i + 1 if (i + 1) % width else -1 for i in range(size)]
+            south = [i + width if i + width < size else -1 for i in range(size)]
+            west = [i - 1 if i % width else -1 for i in range(size)]
+            self._step_table = (north, east, south, west)
+        return self._step_table
+
+    def to_array(self):
+        # zero copy (height, width) uint8 numpy view on the cells
+        import numpy as np
+
+        return np.frombuffer(self.cells, dtype=np.uint8).reshape(self.height, self.width)
+
+    def mask(self, chars):
+        # boolean numpy mask of all cells with one of the given chars
+        import numpy as np
+
+        return np.isin(self.to_array(), np.frombuffer(chars.encode(), dtype=np.uint8))
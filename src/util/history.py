@@ -0,0 +1,243 @@
+import math
+import os
+
+from util.general_util import write_times_to_readme
+
+cur_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(cur_dir))
+HISTORY_PATH = os.path.join(root_dir, "benchmarks", "history.jsonl")
+# perf.py stable (one process per sample), kept apart so compare never mixes the two kinds of measurement
+ISOLATED_HISTORY_PATH = os.path.join(root_dir, "benchmarks", "history_isolated.jsonl")
+
+# only a downsampled copy of the measurements is stored to keep the history small
+MAX_STORED_SAMPLES = 200
+
+# compare, perf.py compare and the dashboard: a part is a regression (improvement) if it is slower (faster) by more
+# than REGRESSION_THRESHOLD and the Mann-Whitney U test is significant at REGRESSION_ALPHA
+REGRESSION_THRESHOLD = 0.05
+REGRESSION_ALPHA = 0.01
+
+
+def get_git_commit():
+    import subprocess
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=root_dir, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=root_dir,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{commit}+dirty" if dirty else commit
+
+
+def get_machine_fingerprint():
+    import hashlib
+    import platform
+
+    cpu_model = platform.processor()
+    if os.path.exists("/proc/cpuinfo"):
+        with open("/proc/cpuinfo") as file:
+            for line in file:
+                if line.startswith("model name"):
+                    cpu_model = line.split(":", 1)[1].strip()
+                    break
+    machine = f"{platform.system()}|{platform.machine()}|{cpu_model}|{os.cpu_count()}"
+    return hashlib.sha1(machine.encode()).hexdigest()[:12]
+
+
+def downsample(sorted_values, n=MAX_STORED_SAMPLES):
+    # evenly spaced picks from the sorted samples keep the shape of the distribution
+    if len(sorted_values) <= n:
+        return list(sorted_values)
+    step = (len(sorted_values) - 1) / (n - 1)
+    return [sorted_values[round(i * step)] for i in range(n)]
+
+
+def day_input_path(day, example=False):
+    return os.path.join(root_dir, "src", f"day_{int(day):02d}", "example_input.txt" if example else "input.txt")
+
+
+def input_info(input_path, kind="real"):
+    # which input a record was measured on: "real", "example" or "other" (any other file) and its sha256
+    import hashlib
+
+    with open(input_path, "rb") as file:
+        return {"kind": kind, "sha256": hashlib.sha256(file.read()).hexdigest()}
+
+
+def is_real_input(record):
+    # compare, the README and the dashboard only use the real input, records without the input field (older
+    # history) can not be told apart and are left out
+    return record.get("input", {}).get("kind") == "real"
+
+
+def make_record(day, part, bench_result, **extra):
+    import platform
+    from datetime import datetime
+
+    record = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "day": int(day),
+        "part": part,
+        "commit": get_git_commit(),
+        "python": platform.python_version(),
+        "machine": get_machine_fingerprint(),
+        **bench_result.as_dict(),
+        "samples_ns": downsample(bench_result.times_ns),
+    }
+    record.update(extra)
+    return record
+
+
+def append_records(records, history_path=HISTORY_PATH):
+    import json
+
+    os.makedirs(os.path.dirname(history_path), exist_ok=True)
+    with open(history_path, "a") as file:
+        file.writelines(json.dumps(record) + "\n" for record in records)
+
+
+def load_records(history_path=HISTORY_PATH):
+    import json
+
+    if not os.path.exists(history_path):
+        return []
+    with open(history_path) as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def latest_records(records, machine=None, commit=None):
+    # latest record of the real input per (day, part), optionally filtered by machine and commit
+    latest = {}
+    for record in records:
+        if not is_real_input(record):
+            continue
+        if machine and record["machine"] != machine:
+            continue
+        if commit and not record["commit"].startswith(commit):
+            continue
+        latest[(record["day"], record["part"])] = record
+    return latest
+
+
+def save_bench_results(day, bench_task1, bench_task2, example=False, input_path=None):
+    """
+    Appends the benchmark results of both parts to the history and regenerates the README row from it. Runs on
+    the example input are not saved, the history is for the real input (input_path, default: input.txt of the day).
+    """
+    if example:
+        print("\nExample input, the results are not saved.")
+        return
+    info = input_info(input_path or day_input_path(day))
+    append_records([make_record(day, 1, bench_task1, input=info), make_record(day, 2, bench_task2, input=info)])
+    update_readme(days=[int(day)])
+
+
+def update_readme(days=None, machine=None):
+    latest = latest_records(load_records(), machine=machine or get_machine_fingerprint())
+    for day in sorted({d for d, _ in latest}):
+        if days is not None and day not in days:
+            continue
+        if (day, 1) in latest and (day, 2) in latest:
+            task1, task2 = latest[(day, 1)], latest[(day, 2)]
+            write_times_to_readme(
+                day, task1["median"], task2["median"], task1.get("peak_bytes"), task2.get("peak_bytes")
+            )
+
+
+def mann_whitney_u(a, b):
+    # two sided Mann-Whitney U test with normal approximation, returns the p-value
+    n1, n2 = len(a), len(b)
+    if n1 < 2 or n2 < 2:
+        return 1.0
+    values = sorted([(v, 0) for v in a] + [(v, 1) for v in b])
+    ranks = [0.0] * len(values)
+    tie_correction = 0
+    i = 0
+    while i < len(values):
+        j = i
+        while j + 1 < len(values) and values[j + 1][0] == values[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        tie_correction += (j - i + 1) ** 3 - (j - i + 1)
+        i = j + 1
+
+    rank_sum_a = sum(r for r, (_, group) in zip(ranks, values) if group == 0)
+    u = rank_sum_a - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    sigma = math.sqrt(n1 * n2 / 12 * ((n + 1) - tie_correction / (n * (n - 1))))
+    if sigma == 0:
+        return 1.0
+    z = (u - n1 * n2 / 2) / sigma
+    return math.erfc(abs(z) / math.sqrt(2))
+
+
+def compare(
+    baseline,
+    candidate=None,
+    machine=None,
+    threshold=REGRESSION_THRESHOLD,
+    alpha=REGRESSION_ALPHA,
+    history_path=HISTORY_PATH,
+):
+    """
+    Compares the latest records of the baseline commit with the candidate commit (default: latest records).
+    A part is flagged as regression if it is slower by more than threshold and the difference is significant.
+    """
+    records = load_records(history_path)
+    machine = machine or get_machine_fingerprint()
+    base = latest_records(records, machine=machine, commit=baseline)
+    cand = latest_records(records, machine=machine, commit=candidate)
+
+    rows = []
+    for key in sorted(base.keys() & cand.keys()):
+        b, c = base[key], cand[key]
+        ratio = c["median"] / b["median"] if b["median"] > 0 else math.inf
+        p_value = mann_whitney_u(b["samples_ns"], c["samples_ns"])
+        if p_value < alpha and ratio > 1 + threshold:
+            status = "regression"
+        elif p_value < alpha and ratio < 1 - threshold:
+            status = "improvement"
+        else:
+            status = "-"
+        rows.append(
+            {
+                "day": key[0],
+                "part": key[1],
+                "baseline": b["median"],
+                "candidate": c["median"],
+                "ratio": ratio,
+                "p_value": p_value,
+                "status": status,
+            }
+        )
+    return rows
+
+
+def print_comparison(rows):
+    from rich.console import Console
+    from rich.table import Table
+
+    table = Table(title="Benchmark comparison (median)")
+    for column in ("Day", "Part", "Baseline (s)", "Candidate (s)", "Ratio", "p-value", "Status"):
+        table.add_column(column)
+    for r in rows:
+        color = "red" if r["status"] == "regression" else "green" if r["status"] == "improvement" else "white"
+        table.add_row(
+            str(r["day"]),
+            str(r["part"]),
+            f"{r['baseline']:.6f}",
+            f"{r['candidate']:.6f}",
+            f"{r['ratio']:.3f}",
+            f"{r['p_value']:.4f}",
+            f"[{color}]{r['status']}[/{color}]",
+        )
+    Console().print(table)
@@ -0,0 +1,92 @@
+import sys
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+# set by enable_memory_tracking, checked by the timer decorator
+_enabled = False
+# memory stats of the last call per function name (filled by track_call)
+last_results = {}
+
+
+def enable_memory_tracking():
+    global _enabled
+    _enabled = True
+
+
+def disable_memory_tracking():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def get_peak_rss():
+    # peak resident set size of the whole process in bytes (high-water mark, never decreases)
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # linux reports kilobytes, macOS bytes
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def measure(func, *args, **kwargs):
+    """
+    Runs func once under tracemalloc and returns (result, stats) with the traced peak, the memory and
+    the number of blocks still allocated after the call and the peak RSS of the process.
+    """
+    import tracemalloc
+
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    start_current, _ = tracemalloc.get_traced_memory()
+    start_blocks = sys.getallocatedblocks()
+    try:
+        result = func(*args, **kwargs)
+        end_blocks = sys.getallocatedblocks()
+        end_current, peak = tracemalloc.get_traced_memory()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    stats = {
+        "peak_bytes": peak - start_current,
+        "retained_bytes": end_current - start_current,
+        "retained_blocks": end_blocks - start_blocks,
+        "max_rss": get_peak_rss(),
+    }
+    return result, stats
+
+
+def track_call(name, func, *args, **kwargs):
+    result, last_results[name] = measure(func, *args, **kwargs)
+    return result
+
+
+def format_bytes(n):
+    if n is None:
+        return "-"
+    for unit in ("B", "KiB", "MiB"):
+        if abs(n) < 1024:
+            return f"{n:.1f} {unit}" if unit != "B" else f"{n} {unit}"
+        n /= 1024
+    return f"{n:.1f} GiB"
+
+
+def format_stats(stats):
+    return (
+        f"peak {format_bytes(stats['peak_bytes'])} | retained {format_bytes(stats['retained_bytes'])} "
+        f"({stats['retained_blocks']} blocks) | max RSS {format_bytes(stats['max_rss'])}"
+    )
+
+
+def print_memory_report():
+    print("\nMemory:")
+    for name, stats in last_results.items():
+        print(f"{name}: {format_stats(stats)}")
@@ -0,0 +1,78 @@
+# Bulk integer parsing with numpy: all integers of a whole buffer in one pass instead of re.findall per line.
+# numpy is imported with this module: only the days parsing with it import util.parse, and the import stays out of
+# their timed preprocess_input (see perf.py startup).
+
+import numpy as np
+
+# bytes per numpy pass, bounds the temporary arrays (a few bytes per input byte) for huge inputs
+BLOCK_SIZE = 1 << 24
+# int64 holds every number with up to 18 digits
+MAX_DIGITS = 18
+
+MINUS = ord("-")
+
+
+def ints_in_block(buf, signed):
+    # uint8 arithmetic wraps around, so only "0".."9" end up below 10
+    is_digit = (buf - 48) < 10
+    # start and (exclusive) end of every run of digits
+    padded = np.concatenate(([False], is_digit, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    starts, ends = edges[::2], edges[1::2]
+    if len(starts) == 0:
+        return np.empty(0, dtype=np.int64)
+    lengths = ends - starts
+
+    if lengths.max() > MAX_DIGITS:
+        # too big for int64, python ints in an object array
+        numbers = np.array([int(bytes(buf[s:e])) for s, e in zip(starts, ends)], dtype=object)
+    else:
+        # every digit times 10 ** (its distance to the end of its number), summed per number
+        pow10 = 10 ** np.arange(MAX_DIGITS, dtype=np.int64)
+        positions = np.flatnonzero(is_digit)
+        values = (buf[positions] - 48).astype(np.int64) * pow10[np.repeat(ends, lengths) - positions - 1]
+        numbers = np.add.reduceat(values, np.concatenate(([0], np.cumsum(lengths)[:-1])))
+
+    if signed:
+        negative = np.zeros(len(starts), dtype=bool)
+        has_prev = starts > 0
+        negative[has_prev] = buf[starts[has_prev] - 1] == MINUS
+        numbers[negative] *= -1
+    return numbers
+
+
+def extract_ints(data, signed=False, block_size=BLOCK_SIZE):
+    """
+    All integers in data (str, bytes or a memory map, see general_util.map_input) as a numpy array in the order
+    they appear. With signed, a "-" right before a number makes it negative. Numbers with more than 18 digits
+    give an object array of python ints.
+    """
+    if isinstance(data, str):
+        data = data.encode()
+    buf = np.frombuffer(data, dtype=np.uint8)
+
+    parts = []
+    start = 0
+    while start < len(buf):
+        end = min(start + block_size, len(buf))
+        if end < len(buf):
+            # cut after the last byte that is not part of a number, so no number (or its sign) is split
+            block = buf[start:end]
+            separators = np.flatnonzero(((block - 48) >= 10) & (block != MINUS))
+            if len(separators) == 0:
+                raise ValueError(f"No separator in {block_size} bytes, increase the block size")
+            end = start + separators[-1] + 1
+        parts.append(ints_in_block(buf[start:end], signed))
+        start = end
+
+    if not parts:
+        return np.empty(0, dtype=np.int64)
+    return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+
+def extract_records(data, n, signed=False):
+    # all integers as an (records, n) array, e.g. n=2 for "x,y" lines or n=6 for the day 13 machines
+    numbers = extract_ints(data, signed)
+    if len(numbers) % n:
+        raise ValueError(f"Found {len(numbers)} integers, which is not a multiple of {n}")
+    return numbers.reshape(-1, n)
@@ -0,0 +1,137 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+cur_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(cur_dir))
+PROFILES_PATH = os.path.join(root_dir, "profiles")
+
+SAMPLE_INTERVAL = 0.001  # seconds between two samples of the sampling profiler
+MIN_COLLAPSED_US = 1  # paths with less time are dropped from the collapsed stacks of cProfile
+
+# set by enable_profiling, checked by the timer decorator
+_profile_dir = None
+_sampling = False
+
+
+def enable_profiling(day, sampling=False, output_dir=None):
+    global _profile_dir, _sampling
+    _profile_dir = output_dir or os.path.join(PROFILES_PATH, f"day_{int(day):02d}")
+    _sampling = sampling
+    os.makedirs(_profile_dir, exist_ok=True)
+    print(f"Profiling enabled ({'sampling' if sampling else 'cProfile'}), writing to {_profile_dir}")
+
+
+def disable_profiling():
+    global _profile_dir
+    _profile_dir = None
+
+
+def is_enabled():
+    return _profile_dir is not None
+
+
+def profile_call(func, *args, **kwargs):
+    """
+    Runs func under cProfile (or the sampling profiler) and writes <func>.pstats and/or <func>.collapsed
+    (flamegraph.pl / speedscope compatible) into the profile directory.
+    """
+    import cProfile
+    import pstats
+
+    name = func.__name__
+    if _sampling:
+        sampler = StackSampler(threading.get_ident())
+        sampler.start()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            sampler.stop()
+        write_collapsed(sampler.stacks, os.path.join(_profile_dir, f"{name}.collapsed"))
+        return result
+
+    profiler = cProfile.Profile()
+    result = profiler.runcall(func, *args, **kwargs)
+    stats = pstats.Stats(profiler)
+    stats.dump_stats(os.path.join(_profile_dir, f"{name}.pstats"))
+    write_collapsed(pstats_to_collapsed(stats), os.path.join(_profile_dir, f"{name}.collapsed"))
+    return result
+
+
+def frame_name(filename, lineno, funcname):
+    if filename == "~":
+        # builtins have no file, e.g. <built-in method builtins.sorted>
+        return funcname.replace(";", ":")
+    return f"{funcname} ({os.path.basename(filename)}:{lineno})".replace(";", ":")
+
+
+def pstats_to_collapsed(stats):
+    # cProfile only knows caller -> callee edges, so the time of a function is split over its callers
+    # proportional to the cumulative time of each edge. Recursive edges are cut.
+    callees = {}
+    for func, (_, _, _, _, callers) in stats.stats.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+
+    stacks = Counter()
+
+    def walk(func, fraction, stack, seen):
+        tt = stats.stats[func][2]
+        stack = stack + [frame_name(*func)]
+        self_us = round(tt * fraction * 1e6)
+        if self_us >= MIN_COLLAPSED_US:
+            stacks[";".join(stack)] += self_us
+        for callee, edge_ct in callees.get(func, []):
+            callee_ct = stats.stats[callee][3]
+            if callee in seen or callee_ct <= 0:
+                continue
+            child_fraction = fraction * edge_ct / callee_ct
+            if edge_ct * fraction * 1e6 < MIN_COLLAPSED_US:
+                continue
+            walk(callee, child_fraction, stack, seen | {callee})
+
+    # the profiler itself shows up as root ("<method 'disable' of '_lsprof.Profiler' objects>")
+    roots = [func for func, (*_, callers) in stats.stats.items() if not callers and "_lsprof" not in func[2]]
+    for root in roots:
+        walk(root, 1.0, [], {root})
+    return stacks
+
+
+class StackSampler:
+    def __init__(self, thread_id, interval=SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        own_frame_count = None
+        while not self._stop.is_set():
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(frame_name(code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            stack.reverse()
+            # drop the frames above (and including) profile_call, they are the same for every sample
+            if own_frame_count is None:
+                own_frame_count = next((i + 1 for i, name in enumerate(stack) if name.startswith("profile_call ")), 0)
+            if len(stack) > own_frame_count:
+                self.stacks[";".join(stack[own_frame_count:])] += 1
+            time.sleep(self.interval)
+
+
+def write_collapsed(stacks, path):
+    with open(path, "w") as file:
+        file.writelines(f"{stack} {value}\n" for stack, value in sorted(stacks.items()))
@@ -0,0 +1,150 @@
+import os
+import time
+
+cur_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.dirname(cur_dir)
+root_dir = os.path.dirname(src_dir)
+RESULT_CACHE_PATH = os.path.join(root_dir, ".cache", "results")
+
+# evicted after every store: the least recently used entries above the size limit and everything older
+# than the age limit (see evict)
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+MAX_CACHE_AGE = 30 * 24 * 3600
+
+# Every entry is one pickle {"result": ..., "time": seconds of the run that computed it} named
+# <function>_<key>.pkl. The key hashes the raw input, the source of the solution file, the source of every
+# util module it imports (directly or through other util modules) and the python version, so any change to
+# the code or the input is a miss.
+
+
+def module_path(name):
+    # "util.grid" -> src/util/grid.py (or the __init__.py of a package), None for names that are no module
+    base = os.path.join(src_dir, *name.split("."))
+    for path in (base + ".py", os.path.join(base, "__init__.py")):
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def util_dependencies(source_file):
+    # paths of all util modules source_file imports, also the ones imported by those util modules
+    import ast
+    import warnings
+
+    found = set()
+    stack = [source_file]
+    while stack:
+        with open(stack.pop(), "rb") as file, warnings.catch_warnings():
+            # e.g. invalid escape sequences in a solution are not our business here
+            warnings.simplefilter("ignore", SyntaxWarning)
+            tree = ast.parse(file.read())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+                # "from util import memory" imports the module util.memory
+                names = [node.module] + [f"{node.module}.{alias.name}" for alias in node.names]
+            else:
+                continue
+            for name in names:
+                if name != "util" and not name.startswith("util."):
+                    continue
+                path = module_path(name)
+                if path is not None and path not in found:
+                    found.add(path)
+                    stack.append(path)
+    return sorted(found)
+
+
+def result_key(func, input_data):
+    import hashlib
+    import inspect
+    import platform
+
+    source_file = inspect.getsourcefile(inspect.unwrap(func))
+    key = hashlib.sha256()
+    key.update(input_data.encode())
+    for path in [source_file] + util_dependencies(source_file):
+        with open(path, "rb") as file:
+            key.update(hashlib.sha256(file.read()).digest())
+    key.update(platform.python_version().encode())
+    return f"{func.__name__}_{key.hexdigest()[:32]}"
+
+
+def load_result(key, cache_dir=RESULT_CACHE_PATH):
+    # the cached {"result": ..., "time": ...} or None
+    import pickle
+
+    cache_path = os.path.join(cache_dir, f"{key}.pkl")
+    try:
+        with open(cache_path, "rb") as file:
+            entry = pickle.load(file)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        return None
+    # the modification time is the last use, evict drops the least recently used entries first
+    os.utime(cache_path)
+    return entry
+
+
+def store_result(key, result, seconds, cache_dir=RESULT_CACHE_PATH):
+    import pickle
+
+    cache_path = os.path.join(cache_dir, f"{key}.pkl")
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # write to a temporary file first, other processes could read the cache at the same time
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as file:
+            pickle.dump({"result": result, "time": seconds}, file, protocol=5)
+        os.replace(tmp_path, cache_path)
+    except (OSError, pickle.PicklingError, AttributeError, TypeError) as e:
+        print(f"Warning: Could not cache the result: {e}")
+        return
+    evict(cache_dir)
+
+
+def cached_call(func, day_input, input_data, cache_dir=RESULT_CACHE_PATH):
+    """
+    Like func(day_input) for a @timer(return_time=True) task, but the result is looked up in the result cache
+    first (key: input_data, the raw input, and the sources, see result_key). Returns (result, seconds, cached),
+    on a hit seconds is the time of the run that computed the result.
+    Don't use it for benchmarks (--timeit), a hit does not run anything.
+    """
+    key = result_key(func, input_data)
+    entry = load_result(key, cache_dir)
+    if entry is not None:
+        return entry["result"], entry["time"], True
+    result, seconds = func(day_input)
+    store_result(key, result, seconds, cache_dir)
+    return result, seconds, False
+
+
+def evict(cache_dir=RESULT_CACHE_PATH, max_bytes=MAX_CACHE_BYTES, max_age=MAX_CACHE_AGE):
+    # removes entries not used for max_age seconds, then the least recently used until max_bytes are left
+    # returns (removed files, removed bytes)
+    if not os.path.isdir(cache_dir):
+        return 0, 0
+    entries = []
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    entries.sort()
+
+    now = time.time()
+    total = sum(size for _, size, _ in entries)
+    removed = removed_bytes = 0
+    for mtime, size, path in entries:
+        if now - mtime <= max_age and total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+        removed_bytes += size
+    return removed, removed_bytes
@@ -0,0 +1,187 @@
+import heapq
+from collections import deque
+
+from util import counters
+
+# All searches work on integer node ids 0..n-1 (e.g. Grid indices or index * 4 + direction for states), so the
+# bookkeeping is done in flat lists instead of dicts/sets of tuples. Predecessors are stored instead of carrying the
+# path along with every queue entry, use path_to / dag_nodes to get the paths afterwards.
+# With util.counters enabled the searches count their queue pushes, pops and the peak queue size.
+
+INF = float("inf")
+
+
+def bfs(starts, neighbours, n, is_goal=None):
+    """
+    Breadth first search, neighbours(node) returns the node ids reachable in one step.
+    Returns (dist, pred, goal): dist[node] is the number of steps from the nearest start (-1 if not reached),
+    pred[node] the node it was reached from (-1 for starts and unreached nodes) and goal the first node with
+    is_goal(node) (the search stops there) or None.
+    """
+    dist = [-1] * n
+    pred = [-1] * n
+    queue = deque()
+    for start in starts:
+        if dist[start] == -1:
+            dist[start] = 0
+            queue.append(start)
+
+    counting = counters.is_enabled()
+    pops = max_queue = 0
+    goal = None
+    while queue:
+        if counting:
+            pops += 1
+            max_queue = max(max_queue, len(queue))
+        node = queue.popleft()
+        if is_goal is not None and is_goal(node):
+            goal = node
+            break
+        next_dist = dist[node] + 1
+        for next_node in neighbours(node):
+            if dist[next_node] == -1:
+                dist[next_node] = next_dist
+                pred[next_node] = node
+                queue.append(next_node)
+    if counting:
+        # every reached node was pushed exactly once
+        counters.record_search("bfs", n - dist.count(-1), pops, max_queue)
+    return dist, pred, goal
+
+
+def dijkstra(starts, neighbours, n, is_goal=None, all_paths=False):
+    """
+    Heap based Dijkstra, neighbours(node) returns (node, cost) pairs with cost >= 0.
+    Returns (dist, pred, goals): dist[node] is the lowest cost (INF if not reached) and goals the goal nodes
+    settled with the lowest cost. The search stops at the first goal, or with all_paths once every goal with
+    that cost is settled. Goals are not expanded.
+    pred[node] is the predecessor (-1 if none), with all_paths it is the list of all predecessors on a
+    lowest cost path (None if none), which forms a DAG of all optimal paths (see dag_nodes).
+    """
+    dist = [INF] * n
+    pred = [None] * n if all_paths else [-1] * n
+    heap = []
+    for start in starts:
+        dist[start] = 0
+        heap.append((0, start))
+    heapq.heapify(heap)
+
+    goals = []
+    best = INF
+    counting = counters.is_enabled()
+    pushes, pops, max_queue = len(heap), 0, 0
+    while heap:
+        if counting:
+            pops += 1
+            max_queue = max(max_queue, len(heap))
+        cost, node = heapq.heappop(heap)
+        if cost > dist[node]:
+            # stale entry, the node was reached cheaper in the meantime
+            continue
+        if cost > best:
+            break
+        if is_goal is not None and is_goal(node):
+            best = cost
+            goals.append(node)
+            if not all_paths:
+                break
+            continue
+
+        for next_node, step_cost in neighbours(node):
+            next_cost = cost + step_cost
+            if next_cost < dist[next_node]:
+                dist[next_node] = next_cost
+                pred[next_node] = [node] if all_paths else node
+                heapq.heappush(heap, (next_cost, next_node))
+                if counting:
+                    pushes += 1
+            elif all_paths and next_cost == dist[next_node]:
+                pred[next_node].append(node)
+    if counting:
+        counters.record_search("dijkstra", pushes, pops, max_queue)
+    return dist, pred, goals
+
+
+def astar(starts, neighbours, n, heuristic, is_goal):
+    """
+    A* search, like dijkstra (single predecessor) but the heap is ordered by cost + heuristic(node).
+    The heuristic has to be consistent (never overestimates, e.g. manhattan distance on a grid) to get the
+    lowest cost. Returns (dist, pred, goal) with goal the first goal node reached or None.
+    """
+    dist = [INF] * n
+    pred = [-1] * n
+    heap = []
+    for start in starts:
+        dist[start] = 0
+        heap.append((heuristic(start), 0, start))
+    heapq.heapify(heap)
+
+    counting = counters.is_enabled()
+    pushes, pops, max_queue = len(heap), 0, 0
+    goal = None
+    while heap:
+        if counting:
+            pops += 1
+            max_queue = max(max_queue, len(heap))
+        _, cost, node = heapq.heappop(heap)
+        if cost > dist[node]:
+            continue
+        if is_goal(node):
+            goal = node
+            break
+
+        for next_node, step_cost in neighbours(node):
+            next_cost = cost + step_cost
+            if next_cost < dist[next_node]:
+                dist[next_node] = next_cost
+                pred[next_node] = node
+                heapq.heappush(heap, (next_cost + heuristic(next_node), next_cost, next_node))
+                if counting:
+                    pushes += 1
+    if counting:
+        counters.record_search("astar", pushes, pops, max_queue)
+    return dist, pred, goal
+
+
+def path_to(pred, node):
+    # follow a single predecessor array back from node, returns the path from the start to node
+    path = []
+    while node != -1:
+        path.append(node)
+        node = pred[node]
+    return path[::-1]
+
+
+def dag_nodes(pred, ends):
+    # all nodes on any optimal path to one of the ends (pred of dijkstra(..., all_paths=True))
+    seen = set(ends)
+    stack = list(ends)
+    while stack:
+        for prev in pred[stack.pop()] or ():
+            if prev not in seen:
+                seen.add(prev)
+                stack.append(prev)
+    return seen
+
+
+def count_paths(starts, neighbours, is_goal):
+    """
+    Number of distinct paths from each start to any goal node, neighbours has to describe a DAG (no cycles).
+    Every node is counted once (memoized depth first search), returns {start: number of paths}.
+    """
+    counts = {}
+    for start in starts:
+        stack = [(start, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if node in counts:
+                continue
+            if is_goal(node):
+                counts[node] = 1
+            elif expanded:
+                counts[node] = sum(counts[next_node] for next_node in neighbours(node))
+            else:
+                # count the successors first and come back to this node afterwards
+                stack.append((node, True))
+                stack.extend((next_node, False) for next_node in neighbours(node) if next_node not in counts)
+    return {start: counts[start] for start in starts}
@@ -0,0 +1,96 @@
+import contextlib
+
+# Parsed inputs for worker processes (numpy arrays, e.g. Grid.to_array() or the result of util.parse) are copied
+# once into multiprocessing.shared_memory blocks. Only small descriptors (block name, shape, dtype) go to the
+# workers, which map the blocks and work on numpy views of them. Starting a worker or sending it a task costs
+# the same for any input size. The views are read only: a worker that changes cells works on its own copy.
+
+# {block name: (SharedMemory, view)} attached in this process
+attached = {}
+# {key: view} of the worker (set by init_worker)
+worker_arrays = {}
+
+
+def share_array(array):
+    # copies array into a new shared memory block, returns (SharedMemory, descriptor)
+    from multiprocessing import shared_memory
+
+    import numpy as np
+
+    array = np.ascontiguousarray(array)
+    # a block can not be empty
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+    return block, {"name": block.name, "shape": array.shape, "dtype": array.dtype.str}
+
+
+@contextlib.contextmanager
+def shared_arrays(arrays):
+    """
+    Puts the arrays ({key: numpy array}) into shared memory for the duration of the with block and yields
+    {key: descriptor} for attach / init_worker. The blocks are freed on exit, also after an error.
+    """
+    blocks = []
+    try:
+        descriptors = {}
+        for key, array in arrays.items():
+            block, descriptors[key] = share_array(array)
+            blocks.append(block)
+        yield descriptors
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+def attach(descriptor):
+    # read only numpy view on a shared block, mapped once per process
+    from multiprocessing import shared_memory
+
+    import numpy as np
+
+    name = descriptor["name"]
+    if name not in attached:
+        try:
+            # the creating process owns the block, the resource tracker must not free it when a worker exits
+            block = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # python < 3.13
+            block = shared_memory.SharedMemory(name=name)
+        view = np.ndarray(descriptor["shape"], dtype=np.dtype(descriptor["dtype"]), buffer=block.buf)
+        view.flags.writeable = False
+        attached[name] = (block, view)
+    return attached[name][1]
+
+
+def detach_all():
+    # drop the views first, a block with exported buffers can not be closed
+    worker_arrays.clear()
+    blocks = [block for block, _ in attached.values()]
+    attached.clear()
+    for block in blocks:
+        block.close()
+
+
+def init_worker(descriptors):
+    # initializer of a process pool: maps all blocks once per worker
+    worker_arrays.update({key: attach(descriptor) for key, descriptor in descriptors.items()})
+
+
+def call_with_arrays(func, item):
+    return func(worker_arrays, item)
+
+
+def pool_map(func, items, arrays, workers=None, mp_context=None):
+    """
+    [func(arrays, item) for item in items] in a process pool, with arrays ({key: numpy array}) shared and not
+    pickled: func gets {key: read only view}. func must be picklable (a module level function).
+    """
+    import functools
+    from concurrent.futures import ProcessPoolExecutor
+
+    with (
+        shared_arrays(arrays) as descriptors,
+        ProcessPoolExecutor(workers, mp_context=mp_context, initializer=init_worker, initargs=(descriptors,)) as pool,
+    ):
+        return list(pool.map(functools.partial(call_with_arrays, func), items))
@@ -0,0 +1,152 @@
+import argparse
+import os
+import re
+import sys
+import time
+from abc import ABC, abstractmethod
+
+from util import counters
+from util.general_util import load_input, preprocess_cached, timer
+
+
+def export(method, name):
+    """
+    method as a function called name with @timer(return_time=True), like preprocess_input / task1 / task2 of
+    the older days, which run.py, perf.py, batch.py and the daemon look up by name. __wrapped__ leads to the
+    method, so the input and result caches hash the solution file and not this one.
+    """
+
+    def call(*args):
+        return method(*args)
+
+    call.__name__ = call.__qualname__ = name
+    call.__module__ = method.__module__
+    call.__wrapped__ = method
+    return timer(return_time=True)(call)
+
+
+class Solution(ABC):
+    """
+    Base of a day (see template.py): implement part1 and part2 (a day without them can not be created), override
+    parse. An instance has the timed module level functions (preprocess_input, task1, task2) and the command line
+    of the solution (main) with the benchmark (--timeit), profiler, memory tracking, counters, input and result
+    caches and generated inputs (--gen).
+    """
+
+    # keyword arguments of util.bench.bench for --timeit, e.g. {"max_time": 60} for a slow day
+    bench_options = None
+    # parsed inputs are pickled into the input cache (--cache 1), set to False if they can not be pickled
+    cache_input = True
+
+    def __init__(self, script_path):
+        self.script_path = os.path.abspath(script_path)
+        self.day_dir = os.path.dirname(self.script_path)
+        day = re.findall(r"\d+", os.path.basename(self.day_dir))
+        self.day = int(day[0]) if day else time.localtime().tm_mday
+        self.preprocess_input = export(self.parse, "preprocess_input")
+        self.task1 = export(self.part1, "task1")
+        self.task2 = export(self.part2, "task2")
+
+    def parse(self, text):
+        return text.splitlines()
+
+    @abstractmethod
+    def part1(self, data):
+        pass
+
+    @abstractmethod
+    def part2(self, data):
+        pass
+
+    def input_path(self, example=False):
+        return os.path.join(self.day_dir, "example_input.txt" if example else "input.txt")
+
+    def generated_input(self, scale, seed=0):
+        # input of util/gen for this day, the constants it needs (e.g. a map size) are set on the module
+        from util.gen import generate, set_constants
+
+        text, constants = generate(self.day, scale, seed)
+        set_constants(sys.modules[type(self).__module__], constants)
+        return text
+
+    def add_arguments(self, parser):
+        # hook for arguments of the day, they end up in args of run
+        pass
+
+    def argument_parser(self):
+        parser = argparse.ArgumentParser(description=f"Day {self.day}")
+        parser.add_argument("--example", type=int, help="Use the example input", default=0)
+        parser.add_argument("--gen", type=int, help="Use a generated input of this scale (util/gen)", default=0)
+        parser.add_argument("--seed", type=int, help="Seed of the generated input", default=0)
+        parser.add_argument("--timeit", type=int, help="Benchmark the tasks (see util/bench.py)", default=0)
+        parser.add_argument("--profile", type=int, help="Profile the tasks (1: cProfile, 2: sampling)", default=0)
+        parser.add_argument("--memory", type=int, help="Track the memory usage of the tasks", default=0)
+        parser.add_argument("--counters", type=int, help="Count hot path operations (see util/counters.py)", default=0)
+        parser.add_argument("--cache", type=int, help="Load the preprocessed input from the cache", default=1)
+        parser.add_argument("--results", type=int, help="Reuse the cached answers (not with --timeit)", default=0)
+        self.add_arguments(parser)
+        return parser
+
+    def main(self, argv=None):
+        self.run(self.argument_parser().parse_args(argv))
+
+    def run(self, args):
+        from util.memory import enable_memory_tracking, print_memory_report
+        from util.profiling import enable_profiling
+
+        if args.profile:
+            enable_profiling(self.day, sampling=args.profile == 2)
+        if args.memory:
+            enable_memory_tracking()
+        if args.counters:
+            counters.enable_counters()
+
+        if args.gen:
+            try:
+                raw_input = self.generated_input(args.gen, args.seed)
+            except ValueError as e:
+                print(f"Error: {e}")
+                sys.exit(1)
+        else:
+            raw_input = load_input(self.input_path(args.example))
+
+        if args.cache and self.cache_input:
+            day_input, t = preprocess_cached(self.preprocess_input, raw_input)
+        else:
+            day_input, t = self.preprocess_input(raw_input)
+        if args.results and not (args.timeit or args.profile or args.memory or args.counters):
+            # answers of an unchanged input and solution come from the result cache (see util/results.py)
+            from util.results import cached_call
+
+            result_task1, time_task1, cached_task1 = cached_call(self.task1, day_input, raw_input)
+            result_task2, time_task2, cached_task2 = cached_call(self.task2, day_input, raw_input)
+        else:
+            result_task1, time_task1 = self.task1(day_input)
+            result_task2, time_task2 = self.task2(day_input)
+            cached_task1 = cached_task2 = False
+
+        print(f"\nDay {self.day}")
+        print("------------------")
+        print(f"Processing data: {t:.6f} seconds")
+        print(f"Task 1: {result_task1} ({time_task1:.6f} seconds{', cached' if cached_task1 else ''})")
+        print(f"Task 2: {result_task2} ({time_task2:.6f} seconds{', cached' if cached_task2 else ''})")
+
+        if args.memory:
+            print_memory_report()
+        if args.counters:
+            counters.print_counter_report()
+
+        if args.timeit:
+            from util.bench import bench
+            from util.history import save_bench_results
+
+            bench_task1 = bench(self.task1, day_input, **(self.bench_options or {}))
+            bench_task2 = bench(self.task2, day_input, **(self.bench_options or {}))
+            print("\nBenchmark:")
+            print(f"Task 1: {bench_task1}")
+            print(f"Task 2: {bench_task2}")
+            if args.gen:
+                # the history and the README are for the real input
+                print("\nGenerated input, the results are not saved.")
+            else:
+                save_bench_results(self.day, bench_task1, bench_task2, args.example, self.input_path(args.example))
@@ -0,0 +1,173 @@
+import gc
+import os
+import time
+
+from util.bench import BenchResult, percentile
+
+# Stable measurements: every sample runs in its own child process (forked from a parent that already imported
+# the solution and parsed the input), pinned to one core. No sample sees the caches (lru_cache of day 11, ...),
+# the heap or the allocator state another sample left behind. The CPU frequency and the load are recorded
+# around every sample and outliers (Tukey fences) are dropped before the statistics.
+
+# samples outside [q1 - k * iqr, q3 + k * iqr] are discarded
+OUTLIER_FENCE = 1.5
+SAMPLES = 20
+SAMPLE_TIMEOUT = 300.0
+
+# set in the parent before forking, the children use them as they are (copy on write)
+loaded = {}
+
+
+def default_cpu():
+    # the last core this process may run on, core 0 usually handles most of the interrupts
+    if not hasattr(os, "sched_getaffinity"):
+        return None
+    return max(os.sched_getaffinity(0))
+
+
+def cpu_frequency(cpu):
+    # current frequency of the core in MHz, None if the system does not tell
+    if cpu is None:
+        return None
+    try:
+        with open(f"/sys/devices/system/cpu/cpu{cpu}/cpufreq/scaling_cur_freq") as file:
+            return int(file.read()) / 1000
+    except (OSError, ValueError):
+        pass
+    # no cpufreq (e.g. containers and VMs), /proc/cpuinfo has the frequency of every processor as well
+    try:
+        with open("/proc/cpuinfo") as file:
+            processor = None
+            for line in file:
+                if line.startswith("processor"):
+                    processor = int(line.split(":")[1])
+                elif line.startswith("cpu MHz") and processor == cpu:
+                    return float(line.split(":")[1])
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def cpu_governor(cpu):
+    try:
+        with open(f"/sys/devices/system/cpu/cpu{cpu}/cpufreq/scaling_governor") as file:
+            return file.read().strip()
+    except (OSError, TypeError):
+        return None
+
+
+def load_average():
+    return os.getloadavg()[0] if hasattr(os, "getloadavg") else None
+
+
+def load_day(day, input_path, constants=None):
+    # imports the solution and preprocesses the input, {"module", "input", "tasks": {part: task function}}
+    from run import load_day_module
+    from util.gen import set_constants
+    from util.general_util import load_input
+
+    module = load_day_module(day)
+    set_constants(module, constants or {})
+    raw_input = load_input(input_path)
+    preprocess = getattr(module, "preprocess_input", None)
+    day_input = preprocess(raw_input)[0] if preprocess is not None else raw_input
+    if hasattr(module, "tasks"):
+        # both parts in one go (day 16), the same function is measured for both
+        tasks = {1: module.tasks, 2: module.tasks}
+    else:
+        tasks = {1: module.task1, 2: module.task2}
+    loaded.update(module=module, input=day_input, tasks=tasks, key=(day, input_path))
+    return loaded
+
+
+def sample_worker(day, part, input_path, constants, cpu, conn):
+    # one timed run in this (fresh) process, sends (nanoseconds, frequency before, frequency after)
+    try:
+        if cpu is not None and hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, {cpu})
+        if loaded.get("key") != (day, input_path):
+            # spawned instead of forked, load everything here (not part of the measurement)
+            load_day(day, input_path, constants)
+        task = getattr(loaded["tasks"][part], "__wrapped__", loaded["tasks"][part])
+        day_input = loaded["input"]
+
+        gc.collect()
+        gc.disable()
+        freq_before = cpu_frequency(cpu)
+        start = time.perf_counter_ns()
+        task(day_input)
+        elapsed = time.perf_counter_ns() - start
+        freq_after = cpu_frequency(cpu)
+        conn.send((elapsed, freq_before, freq_after))
+    except (Exception, SystemExit) as e:  # noqa: BLE001
+        # any error of the day (or sys.exit of a missing input) is raised again in the parent
+        conn.send(e)
+    finally:
+        conn.close()
+
+
+def discard_outliers(times_ns, fence=OUTLIER_FENCE):
+    # (kept, discarded) by Tukey fences on the sorted samples, nothing is dropped with less than 4 samples
+    values = sorted(times_ns)
+    if len(values) < 4:
+        return values, []
+    q1, q3 = percentile(values, 25), percentile(values, 75)
+    low, high = q1 - fence * (q3 - q1), q3 + fence * (q3 - q1)
+    kept = [v for v in values if low <= v <= high]
+    return kept, [v for v in values if v < low or v > high]
+
+
+def bench_isolated(day, part, input_path, samples=SAMPLES, cpu=None, constants=None, timeout=SAMPLE_TIMEOUT):
+    """
+    Runs task part of day on input_path samples times, every run in a new process pinned to cpu (default: see
+    default_cpu). Returns (BenchResult of the samples without outliers, context) with context the cpu, the
+    governor, the frequency range, the load average before and after and the discarded samples.
+    """
+    import multiprocessing
+
+    if cpu is None:
+        cpu = default_cpu()
+    # fork shares the imported module and the parsed input with every child, spawn has to load them per sample
+    method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+    context = multiprocessing.get_context(method)
+    if method == "fork":
+        load_day(day, input_path, constants)
+
+    load_before = load_average()
+    times_ns = []
+    frequencies = []
+    for _ in range(samples):
+        parent_conn, child_conn = context.Pipe(duplex=False)
+        process = context.Process(target=sample_worker, args=(day, part, input_path, constants, cpu, child_conn))
+        process.start()
+        child_conn.close()
+        if not parent_conn.poll(timeout):
+            process.terminate()
+            process.join()
+            raise TimeoutError(f"Day {day} part {part}: a sample took longer than {timeout} seconds")
+        try:
+            message = parent_conn.recv()
+        except EOFError:
+            # the child died without an answer (killed, out of memory, ...)
+            message = RuntimeError(f"Day {day} part {part}: a sample exited with code {process.exitcode}")
+        process.join()
+        if isinstance(message, BaseException):
+            raise message
+        elapsed, freq_before, freq_after = message
+        times_ns.append(elapsed)
+        frequencies += [f for f in (freq_before, freq_after) if f is not None]
+
+    kept, discarded = discard_outliers(times_ns)
+    info = {
+        "mode": "isolated",
+        "start_method": method,
+        "cpu": cpu,
+        "governor": cpu_governor(cpu),
+        "freq_mhz": [min(frequencies), max(frequencies)] if frequencies else None,
+        "load_before": load_before,
+        "load_after": load_average(),
+        "samples": len(times_ns),
+        "discarded_ns": discarded,
+    }
+    name = loaded["tasks"][part].__name__ if loaded else f"task{part}"
+    return BenchResult(name, kept), info
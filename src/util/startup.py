@@ -0,0 +1,56 @@
+import os
+import subprocess
+import sys
+
+# the child process prints this marker right before the solution is imported, everything before it is
+# interpreter startup and not part of the solution's import overhead
+MARKER = "--- solution import ---"
+
+IMPORT_SCRIPT = f"""
+import importlib.util, sys
+spec = importlib.util.spec_from_file_location("solution", sys.argv[1])
+module = importlib.util.module_from_spec(spec)
+print({MARKER!r}, file=sys.stderr, flush=True)
+spec.loader.exec_module(module)
+"""
+
+
+def parse_importtime(stderr):
+    # lines look like "import time:   self [us] | cumulative | [indent]package", top level imports have no indent
+    total_us = 0
+    modules = []
+    after_marker = False
+    for line in stderr.splitlines():
+        if line.strip() == MARKER:
+            after_marker = True
+            continue
+        if not after_marker or not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if name.startswith("  "):
+            continue
+        total_us += int(cumulative)
+        modules.append((name.strip(), int(cumulative)))
+    return total_us, sorted(modules, key=lambda m: m[1], reverse=True)
+
+
+def measure_import_time(script_path, repeat=5):
+    """
+    Imports the solution in a fresh interpreter with -X importtime (repeat times) and returns the fastest
+    total import time in seconds and the top level modules of that run.
+    """
+    best = None
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", IMPORT_SCRIPT, script_path],
+            capture_output=True,
+            text=True,
+            cwd=os.path.dirname(script_path),
+            check=False,
+        )
+        if completed.returncode != 0:
+            raise RuntimeError(f"Importing {script_path} failed:\n{completed.stderr}")
+        total_us, modules = parse_importtime(completed.stderr)
+        if best is None or total_us < best[0]:
+            best = (total_us, modules)
+    return best[0] / 1e6, best[1]
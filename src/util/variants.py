@@ -0,0 +1,125 @@
+import os
+import re
+
+cur_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.dirname(cur_dir)
+
+# A variant is one implementation of the tasks of a day. Every solution*.py in the day folder is one
+# (solution.py, solution_rec.py, ...), named by its VARIANT constant or else by the file name
+# ("solution" -> "default", "solution_rec" -> "rec"). solution.py is the one run.py and check use and the
+# baseline of perf.py ab. Every variant preprocesses its own input, so they may use different data structures.
+
+VARIANT_FILE_PATTERN = re.compile(r"^solution(?:_(\w+))?\.py$")
+
+
+def discover_variants(day):
+    # {name: script path} of all variants of a day, the one of solution.py first
+    day_dir = os.path.join(src_dir, f"day_{day:02d}")
+    if not os.path.isdir(day_dir):
+        return {}
+    variants = {}
+    for file_name in sorted(os.listdir(day_dir), key=lambda name: (name != "solution.py", name)):
+        match = VARIANT_FILE_PATTERN.match(file_name)
+        if not match:
+            continue
+        script_path = os.path.join(day_dir, file_name)
+        name = read_variant_name(script_path) or match.group(1) or "default"
+        if name in variants:
+            raise ValueError(f"Day {day}: variant {name} in {file_name} and {os.path.basename(variants[name])}")
+        variants[name] = script_path
+    return variants
+
+
+def read_variant_name(script_path):
+    # the VARIANT = "..." constant without importing the module (imports can be slow, see perf.py startup)
+    with open(script_path, encoding="utf-8") as file:
+        match = re.search(r"^VARIANT = [\"'](\w+)[\"']", file.read(), re.MULTILINE)
+    return match.group(1) if match else None
+
+
+def load_variants(day, names=None, constants=None):
+    """
+    {name: module} of the variants of day (all or the given names in that order), with constants set on every
+    module (see util.gen.set_constants).
+    """
+    from run import load_day_module
+    from util.gen import set_constants
+
+    found = discover_variants(day)
+    names = list(found) if not names else names
+    missing = [name for name in names if name not in found]
+    if missing:
+        raise ValueError(f"Day {day} has no variant {', '.join(missing)} (variants: {', '.join(found) or '-'})")
+    modules = {}
+    for name in names:
+        module = load_day_module(day, found[name])
+        set_constants(module, constants or {})
+        modules[name] = module
+    return modules
+
+
+def preprocess(module, raw_input):
+    preprocess_input = getattr(module, "preprocess_input", None)
+    return preprocess_input(raw_input)[0] if preprocess_input is not None else raw_input
+
+
+def task_function(module, part):
+    # (function to time, index of the answer of this part in its result or None)
+    if hasattr(module, "tasks"):
+        # both parts in one go (day 16)
+        return module.tasks, part - 1
+    return getattr(module, f"task{part}"), None
+
+
+def solve_part(module, part, day_input):
+    func, index = task_function(module, part)
+    answer = getattr(func, "__wrapped__", func)(day_input)
+    return answer if index is None else answer[index]
+
+
+def normalize_answer(answer):
+    # numpy scalars (day 1) as the python value, np.int64(11) and 11 are the same answer
+    if hasattr(answer, "item") and getattr(answer, "ndim", 0) == 0:
+        return answer.item()
+    return answer
+
+
+def same_answers(answers):
+    first, *others = answers
+    try:
+        return all(bool(answer == first) for answer in others)
+    except (TypeError, ValueError):
+        # no usable == (e.g. arrays), compare the representation
+        return len({repr(answer) for answer in answers}) == 1
+
+
+def verify_variants(modules, raw_input, parts=(1, 2)):
+    """
+    Solves raw_input with every variant. Returns ({part: {name: answer}}, [parts with different answers]).
+    """
+    answers = {part: {} for part in parts}
+    for name, module in modules.items():
+        day_input = preprocess(module, raw_input)
+        for part in parts:
+            answers[part][name] = normalize_answer(solve_part(module, part, day_input))
+    mismatches = [part for part in parts if not same_answers(list(answers[part].values()))]
+    return answers, mismatches
+
+
+def bench_variants(modules, raw_input, parts=(1, 2), **bench_kwargs):
+    """
+    {part: {name: BenchResult}} of every variant on raw_input (preprocessing not included).
+    """
+    from util.bench import bench
+
+    inputs = {name: preprocess(module, raw_input) for name, module in modules.items()}
+    results = {part: {} for part in parts}
+    for part in parts:
+        for name, module in modules.items():
+            func, index = task_function(module, part)
+            if index is not None and parts[0] != part:
+                # one function for both parts, measured once
+                results[part][name] = results[parts[0]][name]
+                continue
+            results[part][name] = bench(func, inputs[name], **bench_kwargs)
+    return results
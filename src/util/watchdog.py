@@ -0,0 +1,206 @@
+import math
+import os
+
+# Limits of one day (import, preprocessing and both tasks) when a solution does not declare its own
+# (TIME_LIMIT in seconds and MEMORY_LIMIT in bytes, module constants) and budgets.json has nothing for it
+DEFAULT_TIME_LIMIT = 120.0
+DEFAULT_MEMORY_LIMIT = 4 * 1024**3
+# limits derived from budgets.json (util/golden.py): factor * sum of the task budgets, with a floor, the
+# budgets are tracemalloc peaks and not the address space of the process
+BUDGET_TIME_FACTOR = 10
+BUDGET_MEMORY_FACTOR = 4
+MIN_TIME_LIMIT = 10.0
+MIN_MEMORY_LIMIT = 1024**3
+# seconds a child gets to send its partial report after the abort signal, then it is killed
+GRACE = 2.0
+
+# A watched run is a child process with an address space limit (RLIMIT_AS, an allocation above it raises
+# MemoryError) and a CPU time limit (RLIMIT_CPU, SIGXCPU). The parent waits for the wall clock limit and then
+# sends SIGUSR1. On both signals the child sends what it has (the counters so far and where it was) and exits.
+# A child that can not answer (stuck in C code) is killed after GRACE seconds.
+
+
+def eval_constant(node):
+    # value of a literal or of a numeric expression of literals (1024**3, 30 * 60), ValueError for anything else
+    import ast
+    import operator
+
+    operators = {ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul, ast.Pow: operator.pow}
+    if isinstance(node, ast.BinOp) and type(node.op) in operators:
+        left, right = eval_constant(node.left), eval_constant(node.right)
+        if not all(isinstance(value, (int, float)) for value in (left, right)):
+            raise ValueError("not a numeric expression")
+        return operators[type(node.op)](left, right)
+    return ast.literal_eval(node)
+
+
+def read_constants(script_path, names):
+    # {name: value} of the module level constants (literals or numeric expressions) of a solution, without
+    # importing it
+    import ast
+    import warnings
+
+    with open(script_path, encoding="utf-8") as file:
+        source = file.read()
+    with warnings.catch_warnings():
+        # invalid escape sequences in some solutions
+        warnings.simplefilter("ignore", SyntaxWarning)
+        tree = ast.parse(source)
+    constants = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            name = node.targets[0].id
+            if name in names:
+                try:
+                    constants[name] = eval_constant(node.value)
+                except ValueError:
+                    print(f"Warning: {name} in {script_path} is not a number, the default limit is used")
+    return constants
+
+
+def day_limits(day, script_path, budgets=None):
+    """
+    {"time": seconds, "memory": bytes} for one day: declared by the solution (TIME_LIMIT, MEMORY_LIMIT),
+    else derived from its budgets (budgets.json), else the defaults.
+    """
+    declared = read_constants(script_path, ("TIME_LIMIT", "MEMORY_LIMIT"))
+    day_budgets = (budgets or {}).get(str(day), {})
+    time_limit = declared.get("TIME_LIMIT")
+    if time_limit is None and day_budgets:
+        budget_time = sum(budget.get("time", 0) for budget in day_budgets.values())
+        time_limit = max(budget_time * BUDGET_TIME_FACTOR, MIN_TIME_LIMIT)
+    memory_limit = declared.get("MEMORY_LIMIT")
+    if memory_limit is None and any("peak_bytes" in budget for budget in day_budgets.values()):
+        budget_memory = max(budget.get("peak_bytes", 0) for budget in day_budgets.values())
+        memory_limit = max(budget_memory * BUDGET_MEMORY_FACTOR, MIN_MEMORY_LIMIT)
+    return {"time": time_limit or DEFAULT_TIME_LIMIT, "memory": memory_limit or DEFAULT_MEMORY_LIMIT}
+
+
+def set_limits(time_limit, memory_limit):
+    # resource only exists on unix, elsewhere the wall clock limit of the parent is all there is
+    try:
+        import resource
+    except ImportError:
+        return
+    for limit, soft in ((resource.RLIMIT_AS, memory_limit), (resource.RLIMIT_CPU, math.ceil(time_limit + GRACE))):
+        _, hard = resource.getrlimit(limit)
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+        # the hard CPU limit kills the process (SIGKILL) if it ignores SIGXCPU
+        if limit == resource.RLIMIT_CPU and hard == resource.RLIM_INFINITY:
+            hard = soft + math.ceil(GRACE)
+        resource.setrlimit(limit, (soft, hard))
+
+
+def partial_counters():
+    # counters of the finished tasks and of the running one (only if counting is enabled)
+    from util import counters
+
+    partial = {name: values for name, values in counters.last_results.items() if values}
+    if counters.values:
+        partial["running"] = counters.snapshot()
+    return partial
+
+
+def stuck_at(frame, depth=3):
+    # "file:line function" of the innermost frames that belong to the solutions (not the runner)
+    import traceback
+
+    src_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    frames = [f for f in traceback.extract_stack(frame) if f.filename.startswith(src_dir) and f.filename != __file__]
+    return [f"{os.path.relpath(f.filename, src_dir)}:{f.lineno} {f.name}" for f in frames[-depth:]]
+
+
+def watched_child(conn, func, args, time_limit, memory_limit):
+    import signal
+
+    def abort(signum, frame):
+        reason = "cpu" if signum == getattr(signal, "SIGXCPU", None) else "time"
+        conn.send(("aborted", {"reason": reason, "counters": partial_counters(), "stuck_at": stuck_at(frame)}))
+        conn.close()
+        os._exit(1)
+
+    for name in ("SIGUSR1", "SIGXCPU"):
+        if hasattr(signal, name):
+            signal.signal(getattr(signal, name), abort)
+    set_limits(time_limit, memory_limit)
+    try:
+        result = ("ok", func(*args))
+    except MemoryError:
+        result = ("out of memory", {"counters": partial_counters()})
+    conn.send(result)
+    conn.close()
+
+
+def start_watched(func, args, time_limit, memory_limit):
+    import multiprocessing
+    import time
+
+    # fork shares the imports of the parent, spawn where there is no fork
+    method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+    context = multiprocessing.get_context(method)
+    parent_conn, child_conn = context.Pipe(duplex=False)
+    process = context.Process(target=watched_child, args=(child_conn, func, args, time_limit, memory_limit))
+    process.start()
+    child_conn.close()
+    return {"process": process, "conn": parent_conn, "deadline": time.monotonic() + time_limit, "signalled": False}
+
+
+def finish_watched(watched):
+    # (status, payload) of a child that answered or is stopped, see watch_all
+    process, conn = watched["process"], watched["conn"]
+    try:
+        result = conn.recv() if conn.poll() else None
+    except EOFError:
+        result = None
+    if result is None and process.is_alive():
+        process.kill()
+    process.join()
+    conn.close()
+    return result or ("killed", {"exitcode": process.exitcode})
+
+
+def watch_all(jobs, workers=None):
+    """
+    Runs the jobs ({key: (func, args, time_limit, memory_limit)}) in watched child processes, at most workers
+    at a time, and yields (key, status, payload) as they finish: ("ok", return value), ("aborted", {"reason":
+    "time" | "cpu", "counters": ..., "stuck_at": [...]}), ("out of memory", {"counters": ...}) or ("killed", {"exitcode": ...}) if the child died
+    without an answer. All waiting happens in this one thread (no threads in the parent, so fork is safe).
+    """
+    import signal
+    import time
+    from multiprocessing.connection import wait
+
+    pending = list(jobs.items())
+    running = {}
+    workers = workers or os.cpu_count() or 1
+    while pending or running:
+        while pending and len(running) < workers:
+            key, (func, args, time_limit, memory_limit) = pending.pop(0)
+            watched = start_watched(func, args, time_limit, memory_limit)
+            watched["key"] = key
+            running[watched["conn"]] = watched
+
+        timeout = max(0.0, min(watched["deadline"] for watched in running.values()) - time.monotonic())
+        for conn in wait(list(running), timeout):
+            watched = running.pop(conn)
+            yield watched["key"], *finish_watched(watched)
+
+        now = time.monotonic()
+        for conn, watched in list(running.items()):
+            if now < watched["deadline"]:
+                continue
+            if not watched["signalled"] and hasattr(signal, "SIGUSR1"):
+                # over the time limit, ask for the partial report
+                os.kill(watched["process"].pid, signal.SIGUSR1)
+                watched["signalled"] = True
+                watched["deadline"] = now + GRACE
+                continue
+            del running[conn]
+            yield watched["key"], *finish_watched(watched)
+
+
+def run_watched(func, args, time_limit, memory_limit):
+    # one job of watch_all, returns (status, payload)
+    _, status, payload = next(watch_all({0: (func, args, time_limit, memory_limit)}, workers=1))
+    return status, payload
@@ -0,0 +1,26 @@
+import os
+import sys
+
+# the solutions and util are imported like src/run.py does, with src on the path
+src_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+sys.path.insert(0, src_dir)
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def golden():
+    from util import golden as g
+
+    if not os.path.exists(g.GOLDEN_PATH):
+        pytest.fail(f"No golden answers at {g.GOLDEN_PATH}, record them with src/perf.py check --record 1")
+    return g.load_json(g.GOLDEN_PATH)
+
+
+@pytest.fixture(scope="session")
+def budgets():
+    from util import golden as g
+
+    if not os.path.exists(g.BUDGETS_PATH):
+        pytest.fail(f"No budgets at {g.BUDGETS_PATH}, record them with src/perf.py check --record-budgets 3")
+    return g.load_json(g.BUDGETS_PATH)
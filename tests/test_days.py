@@ -0,0 +1,59 @@
+import os
+
+import pytest
+
+from run import discover_days, get_input_path
+from util import golden as g
+from util.general_util import load_input
+
+DAYS = discover_days()
+
+
+def run_watched(day, example=False, track_memory=False):
+    # report of src/run.py for one day, in its own process under the limits of the watchdog
+    from run import run_all
+    from util.watchdog import day_limits
+
+    limits = {day: day_limits(day, DAYS[day], g.load_json(g.BUDGETS_PATH))}
+    reports = run_all(
+        {day: DAYS[day]},
+        workers=1,
+        example=example,
+        track_memory=track_memory,
+        limits=limits,
+        constants=g.EXAMPLE_CONSTANTS if example else None,
+    )
+    assert reports[0]["status"] == "ok", reports[0]
+    return reports[0]
+
+
+def check_golden(day, kind, golden):
+    example = kind == "example"
+    input_path = get_input_path(day, example)
+    if not os.path.isfile(input_path):
+        pytest.skip(f"no {os.path.basename(input_path)} for day {day}")
+    report = run_watched(day, example)
+    assert g.check_answers(report, kind, g.hash_input(load_input(input_path)), golden) == []
+
+
+@pytest.mark.parametrize("day", sorted(DAYS))
+def test_example_answers(day, golden):
+    check_golden(day, "example", golden)
+
+
+@pytest.mark.parametrize("day", sorted(DAYS))
+def test_input_answers(day, golden):
+    # the real inputs are not in the repository, their answers are recorded on the machine that has them
+    check_golden(day, "input", golden)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("day", sorted(DAYS))
+def test_budgets(day, request):
+    if not os.path.isfile(get_input_path(day)):
+        pytest.skip(f"no input.txt for day {day}")
+    # only now, without a real input there is nothing to measure and no budgets.json needed
+    budgets = request.getfixturevalue("budgets")
+    assert str(day) in budgets, f"no budgets for day {day}, record them with src/perf.py check --record-budgets 3"
+    report = run_watched(day, track_memory=True)
+    assert g.check_budgets(report, budgets) == []
@@ -0,0 +1,129 @@
+import functools
+import hashlib
+import os
+import shutil
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from util.fetch import fetch_all
+
+YEAR = 2024
+DAYS = [1, 2, 3]
+
+
+def page(path):
+    # the stand-in pages: /<year>/day/<day> (description) and /<year>/day/<day>/input
+    parts = path.strip("/").split("/")
+    if len(parts) < 3 or parts[0] != str(YEAR) or parts[1] != "day" or int(parts[2]) not in DAYS:
+        return None
+    day = int(parts[2])
+    if parts[3:] == ["input"]:
+        return f"{day} {day}\n{day + 1} {day + 1}\n"
+    return (
+        f"<main><h2>--- Day {day}: Stand-in {day} ---</h2>"
+        f'<article class="day-desc"><p>Example:</p><pre><code>{day} {day}\n</code></pre></article></main>'
+    )
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = page(self.path)
+        if body is None:
+            status = 404
+        elif self.headers.get("If-None-Match") == etag(body):
+            status = 304
+        else:
+            status = 200
+        self.server.requests.append((self.path, status))
+        self.send_response(status)
+        if body is not None:
+            self.send_header("ETag", etag(body))
+        if status == 200:
+            data = body.encode()
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        else:
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def etag(body):
+    return '"' + hashlib.sha1(body.encode()).hexdigest()[:16] + '"'
+
+
+@pytest.fixture
+def server():
+    # local stand-in for the AoC server, server.requests lists (path, status) of every request
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    httpd.requests = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.base_url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def day_urls(base_url):
+    return [f"{base_url}/{YEAR}/day/{day}{suffix}" for day in DAYS for suffix in ("", "/input")]
+
+
+def test_fetch_all_revalidates_with_etag(server, tmp_path):
+    urls = day_urls(server.base_url)
+    results = fetch_all(urls, "session", workers=4, cache_dir=tmp_path)
+    assert {r["source"] for r in results.values()} == {"network"}
+    assert results[urls[1]]["text"] == page(urls[1].removeprefix(server.base_url))
+    assert sorted(status for _, status in server.requests) == [200] * len(urls)
+
+    # the second run sends If-None-Match and gets the text from the cache
+    server.requests.clear()
+    again = fetch_all(urls, "session", workers=4, cache_dir=tmp_path)
+    assert {r["source"] for r in again.values()} == {"not modified"}
+    assert {url: r["text"] for url, r in again.items()} == {url: r["text"] for url, r in results.items()}
+    assert sorted(status for _, status in server.requests) == [304] * len(urls)
+
+
+def test_offline_only_uses_the_cache(server, tmp_path):
+    urls = day_urls(server.base_url)
+    fetch_all(urls[:2], "session", cache_dir=tmp_path)
+    server.requests.clear()
+
+    results = fetch_all(urls, "session", offline=True, cache_dir=tmp_path)
+    assert [results[url]["source"] for url in urls[:2]] == ["cache", "cache"]
+    assert {results[url]["source"] for url in urls[2:]} == {"missing"}
+    assert server.requests == []
+    # the inputs are per account, another session has nothing cached
+    other = fetch_all(urls[:2], "other session", offline=True, cache_dir=tmp_path)
+    assert {r["source"] for r in other.values()} == {"missing"}
+
+
+def test_bulk_creates_and_updates_days(server, tmp_path, monkeypatch):
+    import main
+
+    src_dir = os.path.dirname(os.path.abspath(main.__file__))
+    shutil.copy(os.path.join(src_dir, "template.py"), tmp_path / "template.py")
+    monkeypatch.setattr(main, "cur_dir", str(tmp_path))
+    monkeypatch.setattr(main, "fetch_all", functools.partial(fetch_all, cache_dir=tmp_path / "http"))
+
+    main.main_bulk(DAYS, YEAR, base_url=server.base_url)
+    for day in DAYS:
+        day_dir = tmp_path / f"day_{day:02d}"
+        assert (day_dir / "input.txt").read_text() == f"{day} {day}\n{day + 1} {day + 1}"
+        assert (day_dir / "example_input.txt").read_text() == f"{day} {day}"
+        solution = (day_dir / "solution.py").read_text()
+        assert f"class Day{day:02d}(Solution)" in solution
+        # the link in the docstring points to the server the day came from
+        assert f"Day {day}: Stand-in {day}\n{server.base_url}/{YEAR}/day/{day}\n" in solution
+
+    # existing days: offline from the cache, only the input and the description are written again
+    (tmp_path / "day_01" / "solution.py").write_text("solved")
+    server.requests.clear()
+    main.main_bulk(DAYS, YEAR, offline=True, base_url=server.base_url)
+    assert server.requests == []
+    assert (tmp_path / "day_01" / "solution.py").read_text() == "solved"
@@ -0,0 +1,17 @@
+import pytest
+
+from util.general_util import InputStream, iter_chunks, iter_records
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 1 << 16])
+def test_windows_line_endings(tmp_path, chunk_size):
+    path = tmp_path / "input.txt"
+    path.write_bytes(b"1 2\r\n3 4\r\n\r\n5 6\r\n7 8\r\n")
+
+    assert list(iter_records(str(path), chunk_size=chunk_size)) == ["1 2", "3 4", "5 6", "7 8"]
+    assert list(iter_records(str(path), "\n\n", chunk_size)) == ["1 2\n3 4", "5 6\n7 8"]
+    assert b"".join(iter_chunks(str(path), chunk_size, b"\n\n")) == b"1 2\n3 4\n\n5 6\n7 8\n"
+    assert list(InputStream(str(path), parse=str.split, separator="\r\n\r\n", chunk_size=chunk_size)) == [
+        ["1", "2", "3", "4"],
+        ["5", "6", "7", "8"],
+    ]
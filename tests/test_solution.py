@@ -0,0 +1,35 @@
+import os
+
+import pytest
+
+from run import load_day_module, solve_day
+from util.solution import Solution
+
+
+def test_missing_part_fails_on_creation(tmp_path):
+    class Day(Solution):
+        def part1(self, data):
+            return len(data)
+
+    with pytest.raises(TypeError, match="part2"):
+        Day(str(tmp_path / "day_19" / "solution.py"))
+
+
+def test_rendered_template(tmp_path):
+    import main
+
+    src_dir = os.path.dirname(os.path.abspath(main.__file__))
+    with open(os.path.join(src_dir, "template.py")) as file:
+        source = main.render_template(file.read(), 19, 2024, "Day 19: Linen Layout")
+    source = source.replace("        # Day-specific code for Task 2\n        pass", "        return len(data)")
+    script_path = tmp_path / "day_19" / "solution.py"
+    script_path.parent.mkdir()
+    script_path.write_text(source)
+
+    module = load_day_module(19, str(script_path))
+    assert isinstance(module.solution, module.Day19)
+    assert module.solution.day == 19
+    # the exports run.py and the other tools use
+    report = solve_day(module, "a\nb\nc\n")
+    assert report["task1"]["answer"] is None
+    assert report["task2"]["answer"] == 3
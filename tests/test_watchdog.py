@@ -0,0 +1,23 @@
+import pytest
+
+from run import discover_days
+from util.watchdog import DEFAULT_MEMORY_LIMIT, day_limits, read_constants
+
+
+@pytest.mark.parametrize("day", [6, 16, 18])
+def test_declared_limits(day):
+    # TIME_LIMIT = 30 and MEMORY_LIMIT = 1024**3 in the solution
+    assert day_limits(day, discover_days()[day]) == {"time": 30, "memory": 1024**3}
+
+
+def test_numeric_expressions(tmp_path):
+    script = tmp_path / "solution.py"
+    script.write_text("TIME_LIMIT = 2 * 60 - 30\nMEMORY_LIMIT = 512 * 1024**2\nOTHER = 1\n")
+    assert read_constants(script, ("TIME_LIMIT", "MEMORY_LIMIT")) == {"TIME_LIMIT": 90, "MEMORY_LIMIT": 512 * 1024**2}
+
+
+def test_not_a_number_warns(tmp_path, capsys):
+    script = tmp_path / "solution.py"
+    script.write_text("GIB = 1024**3\nMEMORY_LIMIT = 2 * GIB\n")
+    assert day_limits(1, script)["memory"] == DEFAULT_MEMORY_LIMIT
+    assert "MEMORY_LIMIT" in capsys.readouterr().out